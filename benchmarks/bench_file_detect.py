@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Measures the cost of guessing the file type in mutagen.File().
+
+Compares scoring every format against the magic byte/extension dispatch
+over a mixed corpus (tests/data by default). Only the detection is timed,
+the header of each file is read beforehand.
+
+    ./benchmarks/bench_file_detect.py [directory...]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen import _default_options, _best_kind, _KINDS
+
+
+def corpus(dirs):
+    for top in dirs:
+        for dirpath, dirnames, filenames in os.walk(top):
+            for filename in sorted(filenames):
+                yield os.path.join(dirpath, filename)
+
+
+def main(argv):
+    dirs = argv[1:] or [os.path.join(os.path.dirname(__file__), "..",
+                                     "tests", "data")]
+    options = _default_options()
+    kinds = dict(zip(_KINDS, options))
+
+    files = []
+    for path in corpus(dirs):
+        fileobj = open(path, "rb")
+        files.append((path, fileobj, fileobj.read(128)))
+
+    def full():
+        for path, fileobj, header in files:
+            _best_kind(path, fileobj, header, options)
+
+    def dispatch():
+        for path, fileobj, header in files:
+            _best_kind(path, fileobj, header, options, kinds)
+
+    number = max(1, 20000 // len(files))
+    print("%d files, %d rounds" % (len(files), number))
+    for name, func in [("full scoring", full), ("dispatch", dispatch)]:
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        per_file = best / (number * len(files)) * 1e6
+        print("%-14s %8.2f us/file" % (name, per_file))
+
+    for path, fileobj, header in files:
+        fileobj.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
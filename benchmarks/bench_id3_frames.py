@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Shows how ID3 loading scales with the number of frames.
+
+Builds ID3v2.4 tags with 10, 1000 and 10000 small frames (TXXX and
+PRIV) in memory and times loading them. The time per frame should stay
+about the same. For comparison also times a header walk which slices
+off the rest of the tag after each frame, like the loader used to.
+
+    ./benchmarks/bench_id3_frames.py [count...]
+"""
+
+import os
+import sys
+import struct
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen.id3 import ID3, TXXX, PRIV, BitPaddedInt
+from mutagen._compat import cBytesIO
+
+
+def frame(name, payload):
+    return struct.pack(">4s4sH", name,
+                       BitPaddedInt.to_str(len(payload), width=4), 0) + payload
+
+
+def build_tag(count):
+    frames = []
+    for i in range(count):
+        if i % 2:
+            f = TXXX(encoding=3, desc=u"desc%d" % i, text=[u"x" * 50])
+            frames.append(frame(b"TXXX", f._writeData()))
+        else:
+            f = PRIV(owner=u"owner%d" % i, data=b"\x00" * 50)
+            frames.append(frame(b"PRIV", f._writeData()))
+    data = b"".join(frames)
+    header = struct.pack(">3sBBB4s", b"ID3", 4, 0, 0,
+                         BitPaddedInt.to_str(len(data), width=4))
+    return header + data
+
+
+def walk_copying(data):
+    # the old way: reslice the remaining data after every frame
+    data = data[10:]
+    while data:
+        name, size, flags = struct.unpack(">4sLH", data[:10])
+        size = BitPaddedInt(size)
+        framedata = data[10:10 + size]
+        data = data[10 + size:]
+
+
+def main(argv):
+    counts = [int(a) for a in argv[1:]] or [10, 1000, 10000]
+
+    print("%8s %12s %14s %16s" % (
+        "frames", "load (ms)", "us per frame", "reslicing (ms)"))
+    for count in counts:
+        tag = build_tag(count)
+        number = max(1, 10000 // count)
+        load = min(timeit.repeat(
+            lambda: ID3(cBytesIO(tag)), number=number, repeat=3)) / number
+        walk = min(timeit.repeat(
+            lambda: walk_copying(tag), number=number, repeat=3)) / number
+        print("%8d %12.2f %14.2f %16.2f" % (
+            count, load * 1000, load / count * 1e6, walk * 1000))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
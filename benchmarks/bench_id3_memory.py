@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Measures the memory used by loaded ID3 tags (Python 3.4+).
+
+Loads every ID3 tag in tests/data (or the given files) a number of times,
+plus copies of one tag with a 1 MB APIC frame, and reports what the
+loaded ID3 objects take up according to tracemalloc.
+
+    ./benchmarks/bench_id3_memory.py [file...]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen.id3 import ID3, APIC, error
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+COPIES = 200
+
+
+def measure(paths, copies, **kwargs):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tags = []
+        for i in range(copies):
+            for path in paths:
+                tags.append(ID3(path, **kwargs))
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    frames = sum(len(t) for t in tags)
+    return len(tags), frames, size
+
+
+def report(name, paths, copies, **kwargs):
+    count, frames, size = measure(paths, copies, **kwargs)
+    print("%-22s %6d tags %8d frames %10.1f KB %8d bytes/frame" % (
+        name, count, frames, size / 1024.0, size // max(frames, 1)))
+
+
+def main(argv):
+    paths = argv[1:]
+    if not paths:
+        for name in sorted(os.listdir(DATA)):
+            path = os.path.join(DATA, name)
+            try:
+                ID3(path)
+            except (error, EnvironmentError):
+                continue
+            paths.append(path)
+
+    dirname = tempfile.mkdtemp()
+    try:
+        cover = os.path.join(dirname, "cover.mp3")
+        shutil.copy(os.path.join(DATA, "silence-44-s.mp3"), cover)
+        tags = ID3(cover)
+        tags.add(APIC(encoding=0, mime="image/jpeg", type=3, desc=u"",
+                      data=os.urandom(1024 * 1024)))
+        tags.save()
+
+        report("test files", paths, COPIES)
+        report("test files, lazy", paths, COPIES, lazy=True)
+        report("1 MB APIC", [cover], 20)
+    finally:
+        shutil.rmtree(dirname)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Times bumping a play counter in a file with a large cover.
+
+Builds a copy of a test file with a big APIC and a PCNT frame, then
+times loading it, incrementing the counter and saving, with lazy=True
+and lazy=False. For comparison it also times writing the whole tag
+back, which is what saving used to do.
+
+    ./benchmarks/bench_id3_save.py [size in MB]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen.id3 import ID3, APIC, PCNT
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def bump(path, **kwargs):
+    tags = ID3(path, **kwargs)
+    tags["PCNT"].count += 1
+    tags.save()
+
+
+def write_tag(path, size):
+    with open(path, "rb+") as h:
+        data = h.read(size)
+        h.seek(0)
+        h.write(data)
+
+
+def main(argv):
+    size = int(float(argv[1]) * 1024 * 1024) if len(argv) > 1 \
+        else 10 * 1024 * 1024
+    dirname = tempfile.mkdtemp()
+    try:
+        path = os.path.join(dirname, "cover.mp3")
+        shutil.copy(os.path.join(DATA, "silence-44-s.mp3"), path)
+        tags = ID3(path)
+        tags.add(APIC(encoding=0, mime="image/jpeg", type=3, desc=u"",
+                      data=os.urandom(size)))
+        tags.add(PCNT(count=0))
+        tags.save()
+        tagsize = ID3(path).size
+
+        for name, func in [
+                ("bump, lazy", lambda: bump(path, lazy=True)),
+                ("bump", lambda: bump(path)),
+                ("write whole tag", lambda: write_tag(path, tagsize))]:
+            best = min(timeit.repeat(func, number=5, repeat=5))
+            print("%-16s %10.2f ms" % (name, best / 5 * 1000))
+    finally:
+        shutil.rmtree(dirname)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
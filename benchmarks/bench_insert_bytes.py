@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Times shifting the tail of a large file with insert_bytes/delete_bytes.
+
+Creates a file of the given size (1 GB by default) in the given
+directory (the system temp directory by default, which should be on
+the file system to test, tmpfs e.g. doesn't support fallocate) and
+times inserting and deleting a block aligned range, a large unaligned
+range and a small range near the start of it, once with the fallocate
+and in-kernel copy fast paths and once with mmap only.
+
+    ./benchmarks/bench_insert_bytes.py [size in MB] [directory]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen import _util
+from mutagen._util import insert_bytes, delete_bytes
+
+CASES = [
+    ("64 KiB aligned", 64 * 1024),
+    ("1 MiB + 1", 1024 * 1024 + 1),
+    ("1000 bytes", 1000),
+]
+
+
+def best_of(func, repeat=3):
+    times = []
+    for i in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(argv):
+    size = int(float(argv[1]) * 1024 * 1024) if len(argv) > 1 \
+        else 1024 * 1024 * 1024
+    dirname = argv[2] if len(argv) > 2 else None
+
+    fd, path = tempfile.mkstemp(dir=dirname)
+    try:
+        with os.fdopen(fd, "wb") as h:
+            chunk = os.urandom(1024 * 1024)
+            for i in range(size // len(chunk)):
+                h.write(chunk)
+
+        print("%-16s %14s %14s" % ("shift", "fast (ms)", "mmap (ms)"))
+        with open(path, "rb+") as h:
+            for name, shift in CASES:
+                def run():
+                    insert_bytes(h, shift, 1000)
+                    delete_bytes(h, shift, 1000)
+                    os.fsync(h.fileno())
+
+                fast = best_of(run)
+                func, minimum = _util._fallocate_func, _util._KERNEL_MOVE_MIN
+                _util._fallocate_func = False
+                _util._KERNEL_MOVE_MIN = float("inf")
+                try:
+                    slow = best_of(run)
+                finally:
+                    _util._fallocate_func = func
+                    _util._KERNEL_MOVE_MIN = minimum
+                print("%-16s %14.1f %14.1f" % (name, fast * 1000, slow * 1000))
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Measures what loading only the tags or only the stream info saves.
+
+Loads one sample file per format (from tests/data, or the given files)
+with everything, with info=False and with tags=False.
+
+    ./benchmarks/bench_load_parts.py [file...]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen import File
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+SAMPLES = [
+    "silence-44-s.mp3", "apev2-lyricsv2.mp3", "silence-44-s.flac",
+    "empty.ogg", "multipagecomment.ogg", "example.opus", "empty.spx",
+    "sample.oggtheora", "empty.oggflac", "has-tags.m4a", "no-tags.3g2",
+    "silence-1.wma", "with-id3.aif", "click.mpc", "silence-44-s.wv",
+    "mac-399.ape", "empty.tta", "empty.ofr",
+]
+
+MODES = [
+    ("all", {}),
+    ("tags only", {"info": False}),
+    ("info only", {"tags": False}),
+]
+
+
+def main(argv):
+    paths = argv[1:] or [os.path.join(DATA, name) for name in SAMPLES]
+
+    print("%-24s" % "file" + "".join("%12s" % m for m, k in MODES) +
+          "  (us)")
+    for path in paths:
+        times = []
+        for mode, kwargs in MODES:
+            number = 200
+            best = min(timeit.repeat(
+                lambda: File(path, **kwargs), number=number, repeat=5))
+            times.append(best / number * 1e6)
+        print("%-24s" % os.path.basename(path) +
+              "".join("%12.1f" % t for t in times))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
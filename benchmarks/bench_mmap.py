@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Compares loading through buffered reads with loading through mmap.
+
+Builds temporary copies of the test files with large tags: a big APIC
+frame in ID3, a big covr atom in MP4 and a tag with 2000 small ID3
+frames, then times loading each with mmap=False and mmap=True.
+
+    ./benchmarks/bench_mmap.py [size in MB]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen.mp3 import MP3
+from mutagen.mp4 import MP4, MP4Cover
+from mutagen.id3 import APIC, TXXX
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def make_copy(name, dirname):
+    path = os.path.join(dirname, name)
+    shutil.copy(os.path.join(DATA, name), path)
+    return path
+
+
+def setup(dirname, size):
+    cover = os.urandom(size)
+    files = []
+
+    path = make_copy("silence-44-s.mp3", dirname)
+    f = MP3(path)
+    f.tags.add(APIC(encoding=0, mime="image/jpeg", type=3, data=cover))
+    f.save()
+    files.append(("ID3 APIC", MP3, path))
+
+    path = make_copy("has-tags.m4a", dirname)
+    f = MP4(path)
+    f[b"covr"] = [MP4Cover(cover)]
+    f.save()
+    files.append(("MP4 covr", MP4, path))
+
+    path = os.path.join(dirname, "frames.mp3")
+    shutil.copy(os.path.join(DATA, "silence-44-s.mp3"), path)
+    f = MP3(path)
+    for i in range(2000):
+        f.tags.add(TXXX(encoding=3, desc=u"desc%d" % i, text=[u"x" * 100]))
+    f.save()
+    files.append(("ID3 2000 TXXX", MP3, path))
+
+    return files
+
+
+def main(argv):
+    size = int(float(argv[1]) * 1024 * 1024) if len(argv) > 1 \
+        else 20 * 1024 * 1024
+    dirname = tempfile.mkdtemp()
+    try:
+        files = setup(dirname, size)
+        print("%-16s %12s %12s" % ("file", "read (ms)", "mmap (ms)"))
+        for name, Kind, path in files:
+            times = []
+            for mmap in [False, True]:
+                best = min(timeit.repeat(
+                    lambda: Kind(path, mmap=mmap), number=3, repeat=5))
+                times.append(best / 3 * 1000)
+            print("%-16s %12.2f %12.2f" % (name, times[0], times[1]))
+    finally:
+        shutil.rmtree(dirname)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Times splitting large packets into Ogg pages.
+
+Times OggPage.from_packets() and writing the resulting pages for a
+header packet followed by a comment packet of the given sizes (10 MB
+and 50 MB by default), like a Vorbis comment with a large
+METADATA_BLOCK_PICTURE.
+
+    ./benchmarks/bench_ogg_from_packets.py [size in MB]...
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen.ogg import OggPage
+
+
+def main(argv):
+    sizes = [float(arg) for arg in argv[1:]] or [10, 50]
+    print("%-10s %8s %14s %14s" % (
+        "packet", "pages", "paging (ms)", "writing (ms)"))
+    for size in sizes:
+        packets = [b"\x01vorbis" + b"\x00" * 23,
+                   b"\x03vorbis" + os.urandom(int(size * 1024 * 1024))]
+        start = time.time()
+        pages = OggPage.from_packets(packets)
+        paging = time.time() - start
+        start = time.time()
+        for page in pages:
+            page.write()
+        writing = time.time() - start
+        print("%-10s %8d %14.1f %14.1f" % (
+            "%g MB" % size, len(pages), paging * 1000, writing * 1000))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Times renumbering the pages of a large Ogg stream.
+
+Writes a stream of the given size (100 MB by default) made of 4 KiB
+pages, then times OggPage.renumber() with the default window and with
+a window of one byte, which reads and writes one page at a time like
+it used to.
+
+    ./benchmarks/bench_ogg_renumber.py [size in MB]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen.ogg import OggPage
+
+
+def build(path, size):
+    packet = os.urandom(4096)
+    with open(path, "wb") as h:
+        for i in range(max(size // len(packet), 1)):
+            page = OggPage()
+            page.serial = 1
+            page.sequence = i
+            page.position = i * 1024
+            page.packets = [packet]
+            h.write(page.write())
+
+
+def main(argv):
+    size = int(float(argv[1]) * 1024 * 1024) if len(argv) > 1 \
+        else 100 * 1024 * 1024
+    fd, path = tempfile.mkstemp(suffix=".ogg")
+    os.close(fd)
+    try:
+        build(path, size)
+        print("%-16s %10s" % ("window", "time (ms)"))
+        for name, buffer_size in [("1 MiB", 2 ** 20), ("one page", 1)]:
+            with open(path, "rb+") as h:
+                start = time.time()
+                OggPage.renumber(h, 1, 10, BUFFER_SIZE=buffer_size)
+                duration = time.time() - start
+            print("%-16s %10.1f" % (name, duration * 1000))
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Counts the bytes moved when saving an Ogg Vorbis file with a cover.
+
+Builds an Ogg Vorbis file of the given size (500 MB by default) with a
+3 MB METADATA_BLOCK_PICTURE comment, then saves it with a change that
+fits into the padding, one that needs a bit more room and one that
+changes the number of header pages. Prints the time and the bytes moved
+by OggPage.replace() for each save, next to what replacing the pages
+with an insert plus one delete per old page (like it used to) would
+have moved.
+
+    ./benchmarks/bench_ogg_replace.py [size in MB]
+"""
+
+import os
+import sys
+import time
+import base64
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen import ogg
+from mutagen.ogg import OggPage
+from mutagen.oggvorbis import OggVorbis
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def build(path, size):
+    """Writes the header pages of empty.ogg followed by size bytes of
+    audio pages to path.
+    """
+
+    with open(os.path.join(DATA, "empty.ogg"), "rb") as h:
+        pages = [OggPage(h)]
+        while pages[-1].position <= 0:
+            pages.append(OggPage(h))
+    header = pages[:-1]
+    serial = header[0].serial
+    packet = os.urandom(60000)
+
+    with open(path, "wb") as h:
+        for page in header:
+            h.write(page.write())
+        sequence = header[-1].sequence + 1
+        count = max(size // len(packet), 1)
+        for i in range(count):
+            page = OggPage()
+            page.serial = serial
+            page.sequence = sequence + i
+            page.position = (i + 1) * 1024
+            page.last = i == count - 1
+            page.packets = [packet]
+            h.write(page.write())
+
+
+class Counter(object):
+    """Counts the bytes moved by insert_bytes and delete_bytes in
+    mutagen.ogg, and what the old OggPage.replace would have moved.
+    """
+
+    def __init__(self):
+        self.moved = 0
+        self.old_moved = 0
+        self._orig = (ogg.insert_bytes, ogg.delete_bytes,
+                      OggPage.__dict__["replace"])
+
+        def insert_bytes(fobj, size, offset, *args):
+            fobj.seek(0, 2)
+            self.moved += fobj.tell() - offset
+            return self._orig[0](fobj, size, offset, *args)
+
+        def delete_bytes(fobj, size, offset, *args):
+            fobj.seek(0, 2)
+            self.moved += fobj.tell() - offset - size
+            return self._orig[1](fobj, size, offset, *args)
+
+        def replace(cls, fileobj, old_pages, new_pages):
+            fileobj.seek(0, 2)
+            filesize = fileobj.tell()
+            new_size = sum(len(p.write()) for p in new_pages)
+            self.old_moved += old_bytes_moved(filesize, old_pages, new_size)
+            return self._orig[2].__func__(cls, fileobj, old_pages, new_pages)
+
+        ogg.insert_bytes = insert_bytes
+        ogg.delete_bytes = delete_bytes
+        OggPage.replace = classmethod(replace)
+
+    def restore(self):
+        ogg.insert_bytes, ogg.delete_bytes, OggPage.replace = self._orig
+
+
+def old_bytes_moved(filesize, old_pages, new_size):
+    """Bytes moved by inserting the new pages in front of the old ones,
+    then deleting the old pages one by one starting with the last.
+    """
+
+    start = old_pages[0].offset
+    moved = filesize - start
+    filesize += new_size
+    for page in reversed(old_pages):
+        moved += filesize - (page.offset + new_size + page.size)
+        filesize -= page.size
+    return moved
+
+
+def main(argv):
+    size = int(float(argv[1]) * 1024 * 1024) if len(argv) > 1 \
+        else 500 * 1024 * 1024
+    dirname = tempfile.mkdtemp()
+    try:
+        path = os.path.join(dirname, "cover.ogg")
+        build(path, size)
+        f = OggVorbis(path)
+        picture = base64.b64encode(os.urandom(3 * 1024 * 1024 // 4 * 3))
+        f["metadata_block_picture"] = [picture.decode("ascii")]
+        f.save()
+
+        print("%-16s %10s %14s %14s" % (
+            "save", "time (ms)", "moved (MB)", "old (MB)"))
+        for name, value, padding in [
+                ("fits padding", u"a" * 100, None),
+                ("small growth", u"b" * 200, lambda *args: 0),
+                ("more pages", u"c" * 50000, lambda *args: 0)]:
+            f["title"] = [value]
+            counter = Counter()
+            try:
+                start = time.time()
+                f.save(padding=padding)
+                duration = time.time() - start
+            finally:
+                counter.restore()
+            print("%-16s %10.1f %14.1f %14.1f" % (
+                name, duration * 1000, counter.moved / 2.0 ** 20,
+                counter.old_moved / 2.0 ** 20))
+    finally:
+        shutil.rmtree(dirname)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
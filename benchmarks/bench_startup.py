@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Measures the startup cost of a fresh interpreter loading one file.
+
+Times `python -c "import mutagen; mutagen.File(x)"` for one sample file
+per format, relative to a bare `python -c "pass"`, and lists how many
+mutagen modules got imported on the way.
+
+    ./benchmarks/bench_startup.py [rounds]
+"""
+
+import os
+import sys
+import subprocess
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DATA = os.path.join(ROOT, "tests", "data")
+
+SAMPLES = [
+    "silence-44-s.mp3", "silence-44-s.flac", "empty.ogg", "example.opus",
+    "empty.spx", "sample.oggtheora", "empty.oggflac", "has-tags.m4a",
+    "silence-1.wma", "with-id3.aif", "click.mpc", "silence-44-s.wv",
+    "mac-399.ape", "empty.tta", "empty.ofr",
+]
+
+CODE = ("import sys, mutagen; mutagen.File(sys.argv[1]); "
+        "print(len([m for m in sys.modules "
+        "if m.startswith('mutagen') and sys.modules[m]]))")
+
+
+def run(args, rounds):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = None
+    for i in range(rounds):
+        start = time.time()
+        out = subprocess.Popen(
+            [sys.executable] + args, stdout=subprocess.PIPE,
+            env=env).communicate()[0]
+        took = time.time() - start
+        best = took if best is None else min(best, took)
+    return best, out.decode("ascii").strip()
+
+
+def main(argv):
+    rounds = int(argv[1]) if len(argv) > 1 else 10
+
+    # warm up the bytecode cache
+    run(["-c", CODE, os.path.join(DATA, SAMPLES[0])], 1)
+
+    base, _ = run(["-c", "pass"], rounds)
+    print("interpreter startup: %6.1f ms" % (base * 1000))
+    print("%-20s %10s %8s" % ("file", "ms", "modules"))
+    for name in SAMPLES:
+        took, modules = run(["-c", CODE, os.path.join(DATA, name)], rounds)
+        print("%-20s %10.1f %8s" % (name, (took - base) * 1000, modules))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
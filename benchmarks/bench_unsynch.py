@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Compares the unsynch encoder/decoder with the old implementation.
+
+Times unsynch.encode() and unsynch.decode() on random payloads of
+100 KB, 1 MB and 20 MB (or the given sizes in KB) against the previous
+fragment based version, which is included here for reference.
+
+    ./benchmarks/bench_unsynch.py [size in KB...]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mutagen.id3 import unsynch
+
+
+class old_unsynch(object):
+
+    @staticmethod
+    def decode(value):
+        fragments = [bytearray(x) for x in value.split(b'\xff')]
+        if not fragments[-1]:
+            raise ValueError('string ended unsafe')
+
+        for f in (fragments[1:] if not fragments[0] else fragments):
+            if (not f) or (f[0] >= 0xE0):
+                raise ValueError('invalid sync-safe string')
+
+            if f[0] == 0:
+                del f[0]
+
+        return b'\xff'.join(map(bytes, fragments))
+
+    @staticmethod
+    def encode(value):
+        fragments = [bytearray(x) for x in value.split(b'\xff')]
+
+        for f in (fragments[1:] if not fragments[0] else fragments):
+            if (not f) or (f[0] >= 0xE0) or (f[0] == 0):
+                f[0:0] = b'\x00'
+
+        return b'\xff'.join(map(bytes, fragments))
+
+
+def best(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def main(argv):
+    sizes = [int(a) for a in argv[1:]] or [100, 1024, 20 * 1024]
+
+    print("%10s %12s %12s %12s %12s" % (
+        "size (KB)", "old enc", "new enc", "old dec", "new dec"))
+    for size in sizes:
+        data = os.urandom(size * 1024)
+        encoded = unsynch.encode(data)
+        assert encoded == old_unsynch.encode(data)
+        assert unsynch.decode(encoded) == old_unsynch.decode(encoded)
+
+        number = max(1, 2048 // size)
+        print("%10d %12.2f %12.2f %12.2f %12.2f  (ms)" % (
+            size,
+            best(lambda: old_unsynch.encode(data), number),
+            best(lambda: unsynch.encode(data), number),
+            best(lambda: old_unsynch.decode(encoded), number),
+            best(lambda: unsynch.decode(encoded), number)))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
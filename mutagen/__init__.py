@@ -30,7 +30,10 @@ version_string = u'.'.join(map(str, version))
 
 import warnings
 
-from mutagen._compat import PY2
+from mutagen._compat import PY2, text_type
+from mutagen._util import FileThing, openfile, mmapfile, is_fileobj, \
+    is_buffer, is_range_reader
+from mutagen._scan import scan, ScanResult
 
 from collections import MutableMapping
 
@@ -73,19 +76,51 @@ class FileType(MutableMapping):
     FileTypes implement an interface very similar to Metadata; the
     dict interface, save, load, and delete calls on a FileType call
     the appropriate methods on its tag data.
+
+    Instead of a filename, an open file object or an in-memory buffer
+    (bytes, bytearray, memoryview) can be passed. File objects need to
+    be opened in read/write mode for saving, and of the buffer types
+    only a bytearray can be saved to; it gets updated in place. Remote
+    files can be read (but not saved) through a range reader, see
+    :mod:`mutagen.rangeio`.
+
+    Passing tags=False or info=False skips parsing the tags or the
+    stream information, leaving that attribute None. A file loaded
+    without its tags can't be saved, as that would drop the existing
+    ones.
+
+    Passing mmap=True reads the file through a read-only memory map
+    instead of a file object, which saves a system call and a copy per
+    read for files with many or large tags. Files which can't be mapped
+    are read normally.
     """
 
     info = None
     tags = None
     filename = None
+    _tags_skipped = False
     _mimes = ["application/octet-stream"]
 
     def __init__(self, filename=None, *args, **kwargs):
+        mmap = kwargs.pop("mmap", False)
         if filename is None:
             warnings.warn("FileType constructor requires a filename",
                           DeprecationWarning)
+        elif mmap and not isinstance(filename, FileThing):
+            with openfile(filename) as fileobj:
+                with mmapfile(fileobj) as fileobj:
+                    self.__load(FileThing(fileobj, filename), args, kwargs)
         else:
-            self.load(filename, *args, **kwargs)
+            self.__load(filename, args, kwargs)
+
+    def __load(self, filename, args, kwargs):
+        self.load(filename, *args, **kwargs)
+        if isinstance(filename, FileThing):
+            # don't hold on to a file shared by File(), save()
+            # and delete() need what it was opened from
+            self.filename = filename.name
+            if getattr(self.tags, "filename", None) is filename:
+                self.tags.filename = filename.name
 
     def load(self, filename, *args, **kwargs):
         raise NotImplementedError
@@ -135,9 +170,14 @@ class FileType(MutableMapping):
         else:
             return len(list(self.tags.keys()))
 
+    def _check_tags_loaded(self):
+        if self._tags_skipped:
+            raise ValueError("tags weren't loaded, reload with tags=True")
+
     def delete(self, filename=None):
         """Remove tags from a file."""
 
+        self._check_tags_loaded()
         if self.tags is not None:
             if filename is None:
                 filename = self.filename
@@ -148,8 +188,33 @@ class FileType(MutableMapping):
             return self.tags.delete(filename)
 
     def save(self, filename=None, **kwargs):
-        """Save metadata tags."""
+        """Save metadata tags.
+
+        Keyword arguments get passed to the save() of the tags, like
+        ``padding`` (see :mod:`mutagen.padding`) and ``strategy``.
+
+        With the default ``strategy="inplace"`` the file gets changed
+        directly. If the tags grow beyond their padding that means
+        moving everything after them inside the file, and a crash while
+        doing so leaves it damaged. With ``strategy="rewrite"`` the tags
+        get written to a copy of the file in the same directory, which
+        is synced to disk and renamed over the file when done, so after
+        a crash the file is either unchanged or completely saved::
+
+            f.save(strategy="rewrite")
+
+        The copy shares the blocks of the file where the file system
+        supports it (btrfs, XFS, NFS 4.2) and is copied in the kernel
+        otherwise. Before choosing "rewrite" note that:
+
+        * it needs the file to be given by name, it raises ValueError
+          for files loaded from file objects or buffers
+        * the new file only gets the permission bits of the old one,
+          its owner, extended attributes and ACLs are not kept
+        * hard links to the file keep pointing to the old data
+        """
 
+        self._check_tags_loaded()
         if filename is None:
             filename = self.filename
         else:
@@ -164,7 +229,10 @@ class FileType(MutableMapping):
     def pprint(self):
         """Print stream information and comment key=value pairs."""
 
-        stream = "%s (%s)" % (self.info.pprint(), self.mime[0])
+        if self.info is None:
+            stream = self.mime[0]
+        else:
+            stream = "%s (%s)" % (self.info.pprint(), self.mime[0])
         try:
             tags = self.tags.pprint()
         except AttributeError:
@@ -210,7 +278,178 @@ class StreamInfo(object):
         raise NotImplementedError
 
 
-def File(filename, options=None, easy=False):
+# Leading header bytes mapped to the formats whose score() can be
+# positive for them. Keyed on the first four bytes and, for the shorter
+# magics, the first three.
+_MAGIC = {
+    b"ID3": ["MP3", "TrueAudio", "ID3FileType"],
+    b"fLaC": ["FLAC"],
+    b"MAC ": ["MonkeysAudio"],
+    b"wvpk": ["WavPack"],
+    b"MPCK": ["Musepack"],
+    b"MP+": ["Musepack"],
+    b"FORM": ["AIFF"],
+    b"\x30\x26\xb2\x75": ["ASF"],
+    b"TTA": ["TrueAudio"],
+    b"OFR": ["OptimFROG"],
+    b"APET": ["APEv2File"],
+}
+
+# Ogg: the ids the Ogg formats' score() look for anywhere in the header,
+# one of them has to be there for a positive score
+_OGG_CODECS = [
+    (b"\x01vorbis", "OggVorbis"),
+    (b"OpusHead", "OggOpus"),
+    (b"Speex   ", "OggSpeex"),
+    (b"\x80theora", "OggTheora"),
+    (b"\x81theora", "OggTheora"),
+    (b"FLAC", "OggFLAC"),
+    (b"fLaC", "OggFLAC"),
+]
+
+# File extensions some score() implementations take into account
+_EXTENSIONS = {
+    ".mp3": ["MP3"], ".mp2": ["MP3"], ".mpg": ["MP3"], ".mpeg": ["MP3"],
+    ".flac": ["FLAC"], ".ape": ["MonkeysAudio"], ".mpc": ["Musepack"],
+    ".ofr": ["OptimFROG"], ".ofs": ["OptimFROG"], ".tta": ["TrueAudio"],
+    ".aif": ["AIFF"], ".aiff": ["AIFF"], ".aifc": ["AIFF"],
+}
+
+# The order all formats get scored in by default
+_KINDS = ["MP3", "TrueAudio", "OggTheora", "OggSpeex", "OggVorbis", "OggFLAC",
+          "FLAC", "AIFF", "APEv2File", "MP4", "ID3FileType", "WavPack",
+          "Musepack", "MonkeysAudio", "OptimFROG", "ASF", "OggOpus"]
+
+# Where to find each format, and its easy variant if there is one.
+# Modules only get imported once a file needs them.
+_REGISTRY = {
+    "MP3": (("mutagen.mp3", "MP3"), ("mutagen.mp3", "EasyMP3")),
+    "TrueAudio": (("mutagen.trueaudio", "TrueAudio"),
+                  ("mutagen.trueaudio", "EasyTrueAudio")),
+    "OggTheora": (("mutagen.oggtheora", "OggTheora"), None),
+    "OggSpeex": (("mutagen.oggspeex", "OggSpeex"), None),
+    "OggVorbis": (("mutagen.oggvorbis", "OggVorbis"), None),
+    "OggFLAC": (("mutagen.oggflac", "OggFLAC"), None),
+    "FLAC": (("mutagen.flac", "FLAC"), None),
+    "AIFF": (("mutagen.aiff", "AIFF"), None),
+    "APEv2File": (("mutagen.apev2", "APEv2File"), None),
+    "MP4": (("mutagen.mp4", "MP4"), ("mutagen.easymp4", "EasyMP4")),
+    "ID3FileType": (("mutagen.id3", "ID3FileType"),
+                    ("mutagen.easyid3", "EasyID3FileType")),
+    "WavPack": (("mutagen.wavpack", "WavPack"), None),
+    "Musepack": (("mutagen.musepack", "Musepack"), None),
+    "MonkeysAudio": (("mutagen.monkeysaudio", "MonkeysAudio"), None),
+    "OptimFROG": (("mutagen.optimfrog", "OptimFROG"), None),
+    "ASF": (("mutagen.asf", "ASF"), None),
+    "OggOpus": (("mutagen.oggopus", "OggOpus"), None),
+}
+
+
+def _load_kind(name, easy=False):
+    """Imports and returns the FileType for a _KINDS name"""
+
+    module, attr = (easy and _REGISTRY[name][1]) or _REGISTRY[name][0]
+    return getattr(__import__(module, fromlist=[attr]), attr)
+
+
+class _LazyKinds(dict):
+    """Maps _KINDS names to FileTypes, importing them on first access"""
+
+    def __init__(self, easy):
+        super(_LazyKinds, self).__init__()
+        self.easy = easy
+
+    def __missing__(self, name):
+        Kind = self[name] = _load_kind(name, self.easy)
+        return Kind
+
+_lazy_kinds = {False: _LazyKinds(False), True: _LazyKinds(True)}
+
+
+def _default_options(easy=False):
+    """Returns the FileType implementations for all formats, in _KINDS
+    order.
+    """
+
+    return [_lazy_kinds[bool(easy)][name] for name in _KINDS]
+
+
+def _candidates(path, header):
+    """Returns the names of all default formats which could get a positive
+    score for the path and header. APEv2File, which looks at the end
+    of the file, is left out; see _best_kind().
+    """
+
+    names = []
+    names.extend(_MAGIC.get(header[:4], []))
+    names.extend(_MAGIC.get(header[:3], []))
+
+    if header.startswith(b"OggS"):
+        # a muxed stream can have more than one of them
+        for codec, name in _OGG_CODECS:
+            if codec in header and name not in names:
+                names.append(name)
+
+    # MP4 looks for these anywhere in the header
+    if b"ftyp" in header or b"mp4" in header:
+        names.append("MP4")
+
+    if path:
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", "replace")
+        path = path.lower()
+        index = path.rfind(".")
+        if index != -1:
+            names.extend(_EXTENSIONS.get(path[index:], []))
+
+    return names
+
+
+def _best_kind(path, fileobj, header, options, kinds=None):
+    """Returns ((score, name), Kind) for the best scoring FileType.
+
+    If kinds, a mapping of the _KINDS names to FileTypes, is given
+    instead of options, only the formats the header and extension hint
+    at get scored (and imported). That gives the same result as scoring
+    all of them.
+    """
+
+    # Sort by name after score. Otherwise import order affects
+    # Kind sort order, which affects treatment of things with
+    # equals scores.
+    if kinds is None:
+        results = [(Kind.score(path, fileobj, header), Kind.__name__)
+                   for Kind in options]
+        results = list(zip(results, options))
+        results.sort()
+        return results[-1]
+
+    candidates = []
+    for name in _candidates(path, header):
+        Kind = kinds[name]
+        if Kind not in candidates:
+            candidates.append(Kind)
+
+    results = [((Kind.score(path, fileobj, header), Kind.__name__), Kind)
+               for Kind in candidates]
+    results.sort()
+
+    # APEv2File scores at most 1, only import it and check the file
+    # end if that could still win.
+    if not results or results[-1][0] < (1, "APEv2File"):
+        APEv2File = kinds["APEv2File"]
+        if APEv2File not in candidates:
+            results.append(((APEv2File.score(path, fileobj, header),
+                             APEv2File.__name__), APEv2File))
+            results.sort()
+
+    if not results:
+        return (0, ""), None
+    return results[-1]
+
+
+def File(filename, options=None, easy=False, mmap=False, tags=True,
+         info=True):
     """Guess the type of the file and try to open it.
 
     The file type is decided by several things, such as the first 128
@@ -219,65 +458,65 @@ def File(filename, options=None, easy=False):
 
     If no appropriate type could be found, None is returned.
 
+    With the default options only the formats the magic bytes and the
+    extension point to get scored, instead of all of them.
+
+    :param filename: A filename, an open file object, a range reader or
+                     a bytes-like buffer, see :class:`FileType`.
+
     :param options: Sequence of :class:`FileType` implementations, defaults to
                     all included ones.
 
     :param easy: If the easy wrappers should be returnd if available.
                  For example :class:`EasyMP3 <mp3.EasyMP3>` instead
                  of :class:`MP3 <mp3.MP3>`.
+
+    :param mmap: If the file should be read through a memory map,
+                 see :class:`FileType`.
+
+    :param tags: If False the tags don't get parsed.
+
+    :param info: If False the stream information doesn't get parsed.
     """
 
     if options is None:
-        from mutagen.asf import ASF
-        from mutagen.apev2 import APEv2File
-        from mutagen.flac import FLAC
-        if easy:
-            from mutagen.easyid3 import EasyID3FileType as ID3FileType
-        else:
-            from mutagen.id3 import ID3FileType
-        if easy:
-            from mutagen.mp3 import EasyMP3 as MP3
-        else:
-            from mutagen.mp3 import MP3
-        from mutagen.oggflac import OggFLAC
-        from mutagen.oggspeex import OggSpeex
-        from mutagen.oggtheora import OggTheora
-        from mutagen.oggvorbis import OggVorbis
-        from mutagen.oggopus import OggOpus
-        if easy:
-            from mutagen.trueaudio import EasyTrueAudio as TrueAudio
-        else:
-            from mutagen.trueaudio import TrueAudio
-        from mutagen.wavpack import WavPack
-        if easy:
-            from mutagen.easymp4 import EasyMP4 as MP4
-        else:
-            from mutagen.mp4 import MP4
-        from mutagen.musepack import Musepack
-        from mutagen.monkeysaudio import MonkeysAudio
-        from mutagen.optimfrog import OptimFROG
-        from mutagen.aiff import AIFF
-        options = [MP3, TrueAudio, OggTheora, OggSpeex, OggVorbis, OggFLAC,
-                   FLAC, AIFF, APEv2File, MP4, ID3FileType, WavPack,
-                   Musepack, MonkeysAudio, OptimFROG, ASF, OggOpus]
-
-    if not options:
+        kinds = _lazy_kinds[bool(easy)]
+    elif not options:
         return None
-
-    fileobj = open(filename, "rb")
-    try:
-        header = fileobj.read(128)
-        # Sort by name after score. Otherwise import order affects
-        # Kind sort order, which affects treatment of things with
-        # equals scores.
-        results = [(Kind.score(filename, fileobj, header), Kind.__name__)
-                   for Kind in options]
-    finally:
-        fileobj.close()
-    results = list(zip(results, options))
-    results.sort()
-    (score, name), Kind = results[-1]
+    else:
+        kinds = None
+
+    # score() only looks at the name for the extension
+    if is_fileobj(filename) or is_range_reader(filename):
+        path = getattr(filename, "name", "")
+        if not isinstance(path, (bytes, text_type)):
+            path = ""
+    elif is_buffer(filename):
+        path = ""
+    else:
+        path = filename
+
+    # only pass them if needed, FileTypes from elsewhere might not
+    # support them
+    kwargs = {}
+    if not tags:
+        kwargs["tags"] = False
+    if not info:
+        kwargs["info"] = False
+
+    # the winner gets the already open file, so loading only opens once
+    with openfile(filename) as fileobj:
+        if mmap:
+            with mmapfile(fileobj) as fileobj:
+                return _load_best(
+                    filename, path, fileobj, options, kinds, kwargs)
+        return _load_best(filename, path, fileobj, options, kinds, kwargs)
+
+
+def _load_best(filename, path, fileobj, options, kinds, kwargs):
+    header = fileobj.read(128)
+    (score, name), Kind = _best_kind(path, fileobj, header, options, kinds)
     if score > 0:
-        return Kind(filename)
+        return Kind(FileThing(fileobj, filename), **kwargs)
     else:
         return None
@@ -88,3 +88,14 @@ elif PY3:
 
     def swap_to_string(cls):
         return cls
+
+
+def with_metaclass(meta, *bases):
+    """Base class creation for a class with a metaclass, for both
+    Python 2 and 3: ``class Foo(with_metaclass(Meta, Base)): ...``
+    """
+
+    class metaclass(meta):
+        def __new__(cls, name, this_bases, d):
+            return meta(name, bases, d)
+    return type.__new__(metaclass, "temporary_class", (), {})
@@ -20,21 +20,48 @@ from mutagen._id3specs import (
     VolumeAdjustmentsSpec, VolumePeakSpec, VolumeAdjustmentSpec,
     ChannelSpec, MultiSpec, SynchronizedTextSpec, KeyEventSpec, TimeStampSpec,
     EncodedNumericPartTextSpec, EncodedNumericTextSpec)
-from ._compat import text_type, string_types, swap_to_string, ord_
+from ._compat import text_type, string_types, swap_to_string, ord_, \
+    with_metaclass
 
 
 def is_valid_frame_id(frame_id):
     return frame_id.isalnum() and frame_id.isupper()
 
 
+class _FrameType(type):
+    """Gives frame classes __slots__ for the attributes their specs set.
+
+    Frame has a __dict__ slot, so other attributes can still be set, but
+    the dict only gets created when that happens.
+    """
+
+    def __new__(cls, name, bases, namespace):
+        if "__slots__" not in namespace:
+            taken = set()
+            for base in bases:
+                for klass in base.__mro__:
+                    taken.update(vars(klass).get("__slots__", ()))
+            slots = []
+            specs = (namespace.get("_framespec", []) +
+                     namespace.get("_optionalspec", []))
+            for spec in specs:
+                if spec.name not in taken and spec.name not in namespace \
+                        and spec.name not in slots:
+                    slots.append(spec.name)
+            namespace["__slots__"] = tuple(slots)
+        return super(_FrameType, cls).__new__(cls, name, bases, namespace)
+
+
 @swap_to_string
-class Frame(object):
+class Frame(with_metaclass(_FrameType, object)):
     """Fundamental unit of ID3 data.
 
     ID3 tags are split into frames. Each frame has a potentially
     different structure, and so this base class is not very featureful.
     """
 
+    __slots__ = ["_flags", "__dict__"]
+
     FLAG23_ALTERTAG = 0x8000
     FLAG23_ALTERFILE = 0x4000
     FLAG23_READONLY = 0x2000
@@ -110,17 +137,41 @@ class Frame(object):
             kw.append('%s=%r' % (attr.name, getattr(self, attr.name)))
         return '%s(%s)' % (type(self).__name__, ', '.join(kw))
 
+    @classmethod
+    def _get_specs(cls):
+        """Returns (skip_init, readers, writers) for this frame class.
+
+        readers and writers are the bound read/write methods of the
+        specs in _framespec paired with their attribute names. skip_init
+        tells if __init__ can be skipped when reading a frame, which is
+        the case if it would only set defaults _readData overwrites.
+
+        Built the first time the class gets read or written and cached
+        on the class.
+        """
+
+        specs = cls.__dict__.get("_specs")
+        if specs is None:
+            for klass in cls.__mro__:
+                if "__init__" in vars(klass):
+                    break
+            skip_init = klass in (Frame, FrameOpt)
+            readers = tuple((s.name, s.read) for s in cls._framespec)
+            writers = tuple((s.name, s.write) for s in cls._framespec)
+            specs = cls._specs = (skip_init, readers, writers)
+        return specs
+
     def _readData(self, data):
         odata = data
-        for reader in self._framespec:
+        for name, read in self._get_specs()[1]:
             if len(data):
                 try:
-                    value, data = reader.read(self, data)
+                    value, data = read(self, data)
                 except UnicodeDecodeError:
                     raise ID3JunkFrameError
             else:
                 raise ID3JunkFrameError
-            setattr(self, reader.name, value)
+            setattr(self, name, value)
         if data.strip(b'\x00'):
             warn('Leftover data: %s: %r (from %r)' % (
                  type(self).__name__, data, odata),
@@ -128,8 +179,8 @@ class Frame(object):
 
     def _writeData(self):
         data = []
-        for writer in self._framespec:
-            data.append(writer.write(self, getattr(self, writer.name)))
+        for name, write in self._get_specs()[2]:
+            data.append(write(self, getattr(self, name)))
         return b''.join(data)
 
     def pprint(self):
@@ -185,12 +236,27 @@ class Frame(object):
                     if id3.PEDANTIC:
                         raise ID3BadCompressedData('%s: %r' % (err, data))
 
-        frame = cls()
-        frame._rawdata = data
+        if cls._get_specs()[0]:
+            frame = cls.__new__(cls)
+        else:
+            frame = cls()
         frame._flags = tflags
         frame._readData(data)
         return frame
 
+    def __getstate__(self):
+        state = {}
+        for klass in type(self).__mro__:
+            for name in vars(klass).get("__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state.update(self.__dict__)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __hash__(self):
         raise TypeError("Frame objects are unhashable")
         
@@ -222,12 +288,12 @@ class FrameOpt(Frame):
 
     def _readData(self, data):
         odata = data
-        for reader in self._framespec:
+        for name, read in self._get_specs()[1]:
             if len(data):
-                value, data = reader.read(self, data)
+                value, data = read(self, data)
             else:
                 raise ID3JunkFrameError
-            setattr(self, reader.name, value)
+            setattr(self, name, value)
         if data:
             for reader in self._optionalspec:
                 if len(data):
@@ -242,8 +308,8 @@ class FrameOpt(Frame):
 
     def _writeData(self):
         data = []
-        for writer in self._framespec:
-            data.append(writer.write(self, getattr(self, writer.name)))
+        for name, write in self._get_specs()[2]:
+            data.append(write(self, getattr(self, name)))
         for writer in self._optionalspec:
             try:
                 data.append(writer.write(self, getattr(self, writer.name)))
@@ -48,7 +48,7 @@ class ByteSpec(Spec):
 
 class IntegerSpec(Spec):
     def read(self, frame, data):
-        return int(BitPaddedInt(data, bits=8)), b''
+        return BitPaddedInt.to_int(data, bits=8), b''
 
     def write(self, frame, value):
         return BitPaddedInt.to_str(value, bits=8, width=-1)
@@ -62,7 +62,7 @@ class SizedIntegerSpec(Spec):
         self.name, self.__sz = name, size
 
     def read(self, frame, data):
-        return int(BitPaddedInt(data[:self.__sz], bits=8)), data[self.__sz:]
+        return BitPaddedInt.to_int(data[:self.__sz], bits=8), data[self.__sz:]
 
     def write(self, frame, value):
         return BitPaddedInt.to_str(value, bits=8, width=self.__sz)
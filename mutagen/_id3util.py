@@ -8,6 +8,9 @@
 # it under the terms of version 2 of the GNU General Public License as
 # published by the Free Software Foundation.
 
+import re
+from struct import pack, unpack
+
 from ._compat import long_, integer_types
 
 
@@ -48,38 +51,98 @@ class ID3Warning(error, UserWarning):
 
 
 class unsynch(object):
+    # The first byte is checked (and escaped) like the byte after a 0xFF,
+    # unless the data starts with 0xFF.
+
+    # a 0xFF followed by 0xE0 or more, a false sync
+    _invalid = re.compile(b'\xff[\xe0-\xff]')
+    # a 0xFF which needs a 0x00 after it
+    _unsafe = re.compile(b'\xff(?=[\x00\xe0-\xff]|\\Z)')
+
     @staticmethod
     def decode(value):
-        fragments = [bytearray(x) for x in value.split(b'\xff')]
-        if not fragments[-1]:
+        value = bytes(value)
+        if not value or value.endswith(b'\xff'):
             raise ValueError('string ended unsafe')
-                
-        for f in (fragments[1:] if not fragments[0] else fragments):
-            if (not f) or (f[0] >= 0xE0):
+
+        first = value[:1]
+        if first != b'\xff' and first >= b'\xe0':
+            raise ValueError('invalid sync-safe string')
+
+        if b'\xff' in value:
+            if unsynch._invalid.search(value):
                 raise ValueError('invalid sync-safe string')
-            
-            if f[0] == 0:
-                del f[0]
-        
-        return b'\xff'.join(map(bytes, fragments))
-    
+            # split/join is faster than replace() here
+            value = b'\xff'.join(value.split(b'\xff\x00'))
+        if first == b'\x00':
+            value = value[1:]
+        return value
+
     @staticmethod
     def encode(value):
-        fragments = [bytearray(x) for x in value.split(b'\xff')]
-                
-        for f in (fragments[1:] if not fragments[0] else fragments):
-            if (not f) or (f[0] >= 0xE0) or (f[0] == 0):
-                f[0:0] = b'\x00'
-            
-        return b'\xff'.join(map(bytes, fragments))
+        value = bytes(value)
+        if b'\xff' in value:
+            value = unsynch._unsafe.sub(b'\xff\x00', value)
+
+        first = value[:1]
+        if first == b'\x00' or b'\xe0' <= first < b'\xff':
+            value = b'\x00' + value
+        return value
+
 
 class _BitPaddedMixin(object):
 
     def as_str(self, width=4, minwidth=4):
         return self.to_str(self, self.bits, self.bigendian, width, minwidth)
 
+    @staticmethod
+    def to_int(value, bits=7, bigendian=True):
+        """Decodes value like BitPaddedInt(value, bits, bigendian),
+        but returns a plain int.
+        """
+
+        # fast paths for 4 byte sizes, like ID3 header and frame sizes
+        if isinstance(value, bytes) and len(value) == 4:
+            value, = unpack('>I' if bigendian else '<I', value)
+            if bits == 8:
+                return value
+        if isinstance(value, integer_types) and 0 <= value <= 0xffffffff:
+            if bits == 7:
+                return ((value & 0x7f) | (value >> 1 & 0x3f80) |
+                        (value >> 2 & 0x1fc000) | (value >> 3 & 0xfe00000))
+            elif bits == 8:
+                return value
+
+        mask = (1 << (bits)) - 1
+        numeric_value = 0
+        shift = 0
+
+        if isinstance(value, integer_types):
+            if value < 0:
+                raise ValueError("negative value: %d" % value)
+            while value:
+                numeric_value += (value & mask) << shift
+                value >>= 8
+                shift += bits
+        elif isinstance(value, bytes):
+            if bigendian:
+                value = reversed(value)
+            for byte in bytearray(value):
+                numeric_value += (byte & mask) << shift
+                shift += bits
+        else:
+            raise TypeError
+
+        return numeric_value
+
     @staticmethod
     def to_str(value, bits=7, bigendian=True, width=4, minwidth=4):
+        if width == 4 and bits in (7, 8) and 0 <= value < 1 << (4 * bits):
+            if bits == 7:
+                value = ((value & 0x7f) | (value << 1 & 0x7f00) |
+                         (value << 2 & 0x7f0000) | (value << 3 & 0x7f000000))
+            return pack('>I' if bigendian else '<I', value)
+
         mask = (1 << bits) - 1
 
         if width != -1:
@@ -114,6 +177,10 @@ class _BitPaddedMixin(object):
 
         mask = (((1 << (8 - bits)) - 1) << bits)
 
+        if isinstance(value, bytes) and len(value) == 4:
+            value, = unpack('>I', value)
+            return not value & (mask * 0x01010101)
+
         if isinstance(value, integer_types):
             while value:
                 if value & mask:
@@ -132,24 +199,7 @@ class _BitPaddedMixin(object):
 class BitPaddedInt(int, _BitPaddedMixin):
 
     def __new__(cls, value, bits=7, bigendian=True):
-
-        mask = (1 << (bits)) - 1
-        numeric_value = 0
-        shift = 0
-
-        if isinstance(value, integer_types):
-            while value:
-                numeric_value += (value & mask) << shift
-                value >>= 8
-                shift += bits
-        elif isinstance(value, bytes):
-            if bigendian:
-                value = reversed(value)
-            for byte in bytearray(value):
-                numeric_value += (byte & mask) << shift
-                shift += bits
-        else:
-            raise TypeError
+        numeric_value = cls.to_int(value, bits, bigendian)
 
         if isinstance(numeric_value, int):
             self = int.__new__(BitPaddedInt, numeric_value)
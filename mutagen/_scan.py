@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Batch loading of many files in parallel, see scan()."""
+
+import os
+import sys
+import functools
+import traceback
+
+from mutagen._compat import text_type, string_types, integer_types
+
+
+class ScanResult(object):
+    """The outcome of loading one file in :func:`mutagen.scan`.
+
+    Only contains plain Python types, so it's cheap to pickle.
+
+    Attributes:
+
+    * path -- the path of the file
+    * kind -- the name of the FileType used, or None if the format
+      wasn't recognized or loading failed
+    * info -- dict of the stream information attributes (length,
+      bitrate, ...) or None
+    * tags -- dict mapping tag keys to lists of values (text, bytes or
+      numbers) or None if the file has no tags
+    * error -- None, or a (exception type name, message, formatted
+      traceback) tuple if loading the file failed
+    """
+
+    __slots__ = ("path", "kind", "info", "tags", "error")
+
+    def __init__(self, path, kind=None, info=None, tags=None, error=None):
+        self.path = path
+        self.kind = kind
+        self.info = info
+        self.tags = tags
+        self.error = error
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return "<%s path=%r kind=%r error=%r>" % (
+            type(self).__name__, self.path, self.kind,
+            self.error and self.error[0])
+
+
+_PLAIN = (bool, float, text_type, bytes) + integer_types
+
+
+def _plain_value(value):
+    """Converts a tag value to a plain Python type"""
+
+    for type_ in _PLAIN:
+        if isinstance(value, type_):
+            return type_(value)
+
+    # ID3 frames
+    text = getattr(value, "text", None)
+    if isinstance(text, list):
+        return [_plain_value(v) for v in text]
+    data = getattr(value, "data", None)
+    if isinstance(data, bytes):
+        return bytes(data)
+
+    try:
+        return text_type(value)
+    except (UnicodeError, TypeError, ValueError):
+        return repr(value)
+
+
+def _plain_info(info):
+    """Returns the public non-method attributes of a StreamInfo"""
+
+    result = {}
+    for name in dir(info):
+        if name.startswith("_"):
+            continue
+        value = getattr(info, name, None)
+        if isinstance(value, _PLAIN) or value is None:
+            result[name] = value
+    return result
+
+
+def _plain_tags(tags):
+    result = {}
+    for key in tags.keys():
+        value = tags[key]
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        values = []
+        for v in value:
+            v = _plain_value(v)
+            if isinstance(v, list):
+                values.extend(v)
+            else:
+                values.append(v)
+        result[key] = values
+    return result
+
+
+def load_plain(path, **kwargs):
+    """Loads a file with mutagen.File() and returns its (kind, info, tags)
+    as plain Python types. Keyword arguments get passed to File().
+    """
+
+    from mutagen import File
+
+    f = File(path, **kwargs)
+    if f is None:
+        return None, None, None
+    info = f.info and _plain_info(f.info)
+    tags = f.tags is not None and _plain_tags(f.tags) or None
+    return type(f).__name__, info, tags
+
+
+def _scan_one(loader, path):
+    try:
+        kind, info, tags = loader(path)
+    except KeyboardInterrupt:
+        raise
+    except Exception:
+        Ex, value, trace = sys.exc_info()
+        text = "".join(traceback.format_exception(Ex, value, trace))
+        return ScanResult(path, error=(Ex.__name__, text_type(value), text))
+    return ScanResult(path, kind, info, tags)
+
+
+def _iter_paths(paths):
+    """Yields all files in paths, walking directories"""
+
+    if isinstance(paths, string_types + (bytes,)):
+        paths = [paths]
+
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    yield os.path.join(dirpath, filename)
+        else:
+            yield path
+
+
+def scan(paths, workers=None, threads=False, chunksize=16, ordered=True,
+         loader=None, **kwargs):
+    """Loads many files in parallel, yielding a :class:`ScanResult` for
+    each.
+
+    paths is a path or an iterable of paths; directories are walked
+    recursively. The files get loaded by a pool of worker processes, or
+    threads if threads is True, handing them out chunksize paths at a
+    time. With workers=None a worker per CPU is used, with workers=1
+    everything runs in the calling process.
+
+    Errors while loading a file don't stop the scan but end up in
+    ScanResult.error. If ordered is False results are yielded as they
+    complete instead of in input order.
+
+    Keyword arguments (e.g. options, easy) get passed to
+    :func:`mutagen.File`. Alternatively loader can be a function which
+    takes a path and returns a (kind, info, tags) tuple. It has to be
+    picklable for process pools, so defined at module level.
+    """
+
+    if loader is None:
+        loader = load_plain
+    if kwargs:
+        loader = functools.partial(loader, **kwargs)
+    func = functools.partial(_scan_one, loader)
+    paths = _iter_paths(paths)
+
+    if workers == 1:
+        for path in paths:
+            yield func(path)
+        return
+
+    if threads:
+        from multiprocessing.pool import ThreadPool as Pool
+    else:
+        from multiprocessing import Pool
+
+    pool = Pool(workers)
+    try:
+        if ordered:
+            results = pool.imap(func, paths, chunksize)
+        else:
+            results = pool.imap_unordered(func, paths, chunksize)
+        for result in results:
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
@@ -13,12 +13,17 @@ You should not rely on the interfaces here being stable. They are
 intended for internal use in Mutagen only.
 """
 
+import os
+import sys
+import stat
 import struct
+import tempfile
 import codecs
+import errno
 
-from fnmatch import fnmatchcase
+from contextlib import contextmanager
 
-from ._compat import chr_, text_type, PY2, iteritems, iterbytes
+from ._compat import chr_, text_type, PY2, iteritems, iterbytes, BytesIO
 
 from collections import OrderedDict, MutableMapping
 
@@ -123,7 +128,8 @@ def lock(fileobj):
     else:
         try:
             fcntl.lockf(fileobj, fcntl.LOCK_EX)
-        except IOError:
+        except (IOError, TypeError):
+            # TypeError for file objects without a file descriptor
             # FIXME: There's possibly a lot of complicated
             # logic that needs to go here in case the IOError
             # is EACCES or EAGAIN.
@@ -145,12 +151,399 @@ def unlock(fileobj):
     fcntl.lockf(fileobj, fcntl.LOCK_UN)
 
 
+def is_fileobj(target):
+    """Whether target is a file-like object and not a filename/buffer."""
+
+    return hasattr(target, "read") and hasattr(target, "seek")
+
+
+def is_range_reader(target):
+    """Whether target is a range reader, see mutagen.rangeio."""
+
+    return hasattr(target, "read_at") and hasattr(target, "size")
+
+
+def is_buffer(target):
+    """Whether target holds file data instead of naming a file.
+
+    bytearray and memoryview are always data. bytes are taken as a
+    filename unless they contain a null byte, which no path can.
+    """
+
+    if isinstance(target, (bytearray, memoryview)):
+        return True
+    return isinstance(target, bytes) and b"\x00" in target
+
+
+class FileThing(object):
+    """An open file object together with what it was opened from.
+
+    Lets one open file be shared between the parsers of a single load
+    (e.g. File() scoring, tag and stream info parsing), while the
+    FileType remembers the original target to save to later.
+    openfile() passes the file object through and doesn't close it.
+    """
+
+    def __init__(self, fileobj, name):
+        self.fileobj = fileobj
+        self.name = name
+
+    def __fspath__(self):
+        # for FileType implementations outside of mutagen which open
+        # the given filename themselves
+        return self.name
+
+    def __repr__(self):
+        return "<%s name=%r>" % (type(self).__name__, self.name)
+
+
+class _FileProxy(object):
+    """Wraps a file-like object so that seeking before its start raises
+    IOError like it does for real files, instead of silently ending up
+    at position zero like BytesIO and friends do.
+
+    The format parsers depend on that to detect files too small to
+    contain a trailing tag.
+    """
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+    def seek(self, offset, whence=0):
+        fileobj = self._fileobj
+        if offset < 0 and whence != 0:
+            if whence == 1:
+                base = fileobj.tell()
+            else:
+                pos = fileobj.tell()
+                fileobj.seek(0, 2)
+                base = fileobj.tell()
+                fileobj.seek(pos, 0)
+            if base + offset < 0:
+                raise IOError(errno.EINVAL, "Invalid argument")
+        return fileobj.seek(offset, whence)
+
+
+def _is_real_file(fileobj):
+    try:
+        fileobj.fileno()
+    except (AttributeError, EnvironmentError, ValueError):
+        return False
+    return True
+
+
+@contextmanager
+def openfile(target, writable=False, create=False):
+    """Context manager yielding a file object for target.
+
+    target can be a filename, an already opened file object, a
+    FileThing, a range reader or an in-memory buffer (bytes, bytearray,
+    memoryview).
+    Only files opened here get closed again, file objects passed in are
+    rewound but left open. Changes to a bytearray get copied back into
+    it on success, bytes and memoryview buffers are read-only and raise
+    TypeError if opened writable.
+
+    If create is True and target is a filename, a missing file gets
+    created.
+    """
+
+    if isinstance(target, FileThing):
+        target.fileobj.seek(0)
+        yield target.fileobj
+    elif is_fileobj(target):
+        target.seek(0)
+        if _is_real_file(target):
+            yield target
+        else:
+            yield _FileProxy(target)
+    elif is_range_reader(target):
+        if writable:
+            raise TypeError("can't write to a range reader")
+        from mutagen.rangeio import RangeFile
+        yield RangeFile(target)
+    elif is_buffer(target):
+        if writable and not isinstance(target, bytearray):
+            raise TypeError(
+                "can't write to a %s buffer, use a bytearray or a "
+                "file object instead" % type(target).__name__)
+        if isinstance(target, memoryview):
+            data = target.tobytes()
+        else:
+            data = bytes(target)
+        fileobj = BytesIO(data)
+        yield _FileProxy(fileobj)
+        if writable:
+            target[:] = fileobj.getvalue()
+    else:
+        if writable:
+            try:
+                fileobj = open(target, "rb+")
+            except IOError as err:
+                if not create or err.errno != errno.ENOENT:
+                    raise
+                fileobj = open(target, "wb+")
+        else:
+            fileobj = open(target, "rb")
+        try:
+            yield fileobj
+        finally:
+            fileobj.close()
+
+
+class _MmapFile(object):
+    """Read-only file object reading from a memory map.
+
+    Reads are slices of the mapping, so they don't need a system call
+    and skip the buffer of a regular file object.
+    """
+
+    def __init__(self, mapping, name=None):
+        self._map = mapping
+        self._size = len(mapping)
+        self._pos = 0
+        if name is not None:
+            self.name = name
+
+    def read(self, size=-1):
+        start = self._pos
+        if size is None or size < 0:
+            end = self._size
+        else:
+            end = min(start + size, self._size)
+        if end <= start:
+            return b""
+        self._pos = end
+        return self._map[start:end]
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._size
+        if offset < 0:
+            raise IOError(errno.EINVAL, "Invalid argument")
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+
+@contextmanager
+def mmapfile(fileobj):
+    """Context manager yielding a read-only memory mapped version of
+    fileobj.
+
+    Falls back to yielding fileobj itself if it can't be mapped, like
+    pipes, in-memory files, empty files or platforms without mmap.
+    """
+
+    mapping = None
+    try:
+        import mmap
+        mapping = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        mapped = _MmapFile(mapping, getattr(fileobj, "name", None))
+    except Exception:
+        # anything going wrong here only means reading the file normally
+        if mapping is not None and hasattr(mapping, "close"):
+            mapping.close()
+        yield fileobj
+    else:
+        try:
+            yield mapped
+        finally:
+            mapping.close()
+
+
+FALLOC_FL_COLLAPSE_RANGE = 0x08
+FALLOC_FL_INSERT_RANGE = 0x20
+
+# shifts smaller than this are left to mmap, as the kernel copies
+# can't be larger than the shift
+_KERNEL_MOVE_MIN = 2**16
+
+_fallocate_func = None
+
+
+def _fileno(fobj):
+    try:
+        return fobj.fileno()
+    except (AttributeError, EnvironmentError, ValueError):
+        return None
+
+
+def _fallocate(fobj, mode, offset, length):
+    """Calls the Linux fallocate() on the file with the given mode.
+
+    Returns False if that failed or isn't possible, e.g. on other
+    platforms or file systems, or for file objects without a file
+    descriptor.
+    """
+
+    global _fallocate_func
+
+    if _fallocate_func is None:
+        _fallocate_func = False
+        if sys.platform.startswith("linux"):
+            try:
+                import ctypes
+                import ctypes.util
+                libc = ctypes.CDLL(
+                    ctypes.util.find_library("c"), use_errno=True)
+                func = libc.fallocate64
+            except (ImportError, EnvironmentError, AttributeError):
+                pass
+            else:
+                func.argtypes = [ctypes.c_int, ctypes.c_int,
+                                 ctypes.c_int64, ctypes.c_int64]
+                func.restype = ctypes.c_int
+                _fallocate_func = func
+
+    fd = _fileno(fobj)
+    if not _fallocate_func or fd is None:
+        return False
+    fobj.flush()
+    return _fallocate_func(fd, mode, offset, length) == 0
+
+
+def _block_size(fobj):
+    try:
+        return os.fstatvfs(fobj.fileno()).f_bsize
+    except (AttributeError, EnvironmentError, ValueError):
+        return 0
+
+
+def _insert_range(fobj, size, offset):
+    """Inserts size bytes at offset using FALLOC_FL_INSERT_RANGE, which
+    shifts the file extents instead of the data.
+
+    Only works for sizes which are a multiple of the file system block
+    size and offsets inside the file. Returns False if it didn't work,
+    in which case the file is unchanged.
+    """
+
+    block = _block_size(fobj)
+    if not block or size % block:
+        return False
+    # the range has to start at a block boundary, so the start of the
+    # block containing offset gets moved too and has to be put back
+    start = offset - offset % block
+    if not _fallocate(fobj, FALLOC_FL_INSERT_RANGE, start, size):
+        return False
+    if start != offset:
+        fobj.seek(start + size)
+        head = fobj.read(offset - start)
+        fobj.seek(start)
+        fobj.write(head)
+    fobj.seek(0, 2)
+    return True
+
+
+def _collapse_range(fobj, size, offset):
+    """Removes size bytes at offset using FALLOC_FL_COLLAPSE_RANGE.
+
+    Like _insert_range() for sizes which are a multiple of the file
+    system block size, and the removed range can't reach the end of
+    the file. Returns False if it didn't work, in which case the file
+    might have changed in the range to be removed, but nowhere else.
+    """
+
+    block = _block_size(fobj)
+    if not block or size % block:
+        return False
+    start = offset - offset % block
+    if start != offset:
+        # keep the start of the first block by moving it to the end of
+        # the removed range and removing the range starting at start
+        fobj.seek(start)
+        head = fobj.read(offset - start)
+        fobj.seek(start + size)
+        fobj.write(head)
+    if not _fallocate(fobj, FALLOC_FL_COLLAPSE_RANGE, start, size):
+        return False
+    fobj.seek(0, 2)
+    return True
+
+
+def _can_kernel_copy():
+    return sys.platform.startswith("linux") and (
+        hasattr(os, "copy_file_range") or hasattr(os, "sendfile"))
+
+
+# errors meaning the kernel can't copy between the files
+_KERNEL_COPY_ERRORS = (errno.ENOSYS, errno.EXDEV, errno.EINVAL,
+                       errno.EOPNOTSUPP, errno.EBADF)
+
+
+def _kernel_copy(src_fd, dest_fd, src, dest, count):
+    """Copies count bytes at src in src_fd to dest in dest_fd with
+    os.copy_file_range(), or os.sendfile() where that's missing.
+    The ranges must not overlap if both are the same file.
+    """
+
+    copy_file_range = getattr(os, "copy_file_range", None)
+    while count:
+        if copy_file_range is not None:
+            done = copy_file_range(src_fd, dest_fd, count, src, dest)
+        else:
+            os.lseek(dest_fd, dest, 0)
+            done = os.sendfile(dest_fd, src_fd, src, count)
+        if done <= 0:
+            raise IOError("unexpected end of file")
+        src += done
+        dest += done
+        count -= done
+
+
+def _move_range(fobj, dest, src, count, CHUNK_SIZE=2**24):
+    """Moves count bytes in the file from src to dest with
+    os.copy_file_range() or os.sendfile(), so the data doesn't have to
+    pass through Python (and might not even get copied if the file
+    system can share the blocks).
+
+    Returns False if neither is available or usable for the file, in
+    which case nothing was moved.
+    """
+
+    fd = _fileno(fobj)
+    if fd is None or not _can_kernel_copy():
+        return False
+
+    # source and destination of a single copy can't overlap, so the
+    # chunks are at most as large as the shift, and when moving towards
+    # the end of the file they get copied starting from the end
+    chunk = min(abs(dest - src), CHUNK_SIZE)
+    if dest > src:
+        spans = ((max(end - chunk, 0), end)
+                 for end in range(count, 0, -chunk))
+    else:
+        spans = ((start, min(start + chunk, count))
+                 for start in range(0, count, chunk))
+    fobj.flush()
+    for i, (start, end) in enumerate(spans):
+        try:
+            _kernel_copy(fd, fd, src + start, dest + start, end - start)
+        except EnvironmentError as err:
+            # not supported for this file, nothing moved yet
+            if i == 0 and err.errno in _KERNEL_COPY_ERRORS:
+                return False
+            raise
+    fobj.seek(0, 2)
+    return True
+
+
 def insert_bytes(fobj, size, offset, BUFFER_SIZE=2**16):
     """Insert size bytes of empty space starting at offset.
 
     fobj must be an open file object, open rb+ or
-    equivalent. Mutagen tries to use mmap to resize the file, but
-    falls back to a significantly slower method if mmap fails.
+    equivalent. On Linux block aligned sizes are inserted by the file
+    system without moving any data, and larger shifts are done with
+    in-kernel copies. Otherwise Mutagen tries to use mmap to resize the
+    file, but falls back to a significantly slower method if mmap fails.
     """
 
     assert 0 < size
@@ -159,8 +552,13 @@ def insert_bytes(fobj, size, offset, BUFFER_SIZE=2**16):
     fobj.seek(0, 2)
     filesize = fobj.tell()
     movesize = filesize - offset
+    if movesize > 0 and _insert_range(fobj, size, offset):
+        return
     fobj.write(b'\x00' * size)
     fobj.flush()
+    if movesize > 0 and size >= _KERNEL_MOVE_MIN and \
+            _move_range(fobj, offset + size, offset, movesize):
+        return
     try:
         try:
             import mmap
@@ -169,8 +567,8 @@ def insert_bytes(fobj, size, offset, BUFFER_SIZE=2**16):
                 file_map.move(offset + size, offset, movesize)
             finally:
                 file_map.close()
-        except (ValueError, EnvironmentError, ImportError):
-            # handle broken mmap scenarios
+        except (ValueError, EnvironmentError, ImportError, AttributeError):
+            # handle broken mmap scenarios and in-memory files
             locked = lock(fobj)
             fobj.truncate(filesize)
 
@@ -211,8 +609,9 @@ def delete_bytes(fobj, size, offset, BUFFER_SIZE=2**16):
     """Delete size bytes of empty space starting at offset.
 
     fobj must be an open file object, open rb+ or
-    equivalent. Mutagen tries to use mmap to resize the file, but
-    falls back to a significantly slower method if mmap fails.
+    equivalent. Like insert_bytes() this uses the file system or
+    in-kernel copies on Linux where possible, then mmap and then a
+    significantly slower method if mmap fails.
     """
 
     locked = False
@@ -222,8 +621,12 @@ def delete_bytes(fobj, size, offset, BUFFER_SIZE=2**16):
     filesize = fobj.tell()
     movesize = filesize - offset - size
     assert 0 <= movesize
+    if movesize > 0 and _collapse_range(fobj, size, offset):
+        return
     try:
-        if movesize > 0:
+        moved = movesize > 0 and size >= _KERNEL_MOVE_MIN and \
+            _move_range(fobj, offset, offset + size, movesize)
+        if movesize > 0 and not moved:
             fobj.flush()
             try:
                 import mmap
@@ -232,8 +635,9 @@ def delete_bytes(fobj, size, offset, BUFFER_SIZE=2**16):
                     file_map.move(offset, offset + size, movesize)
                 finally:
                     file_map.close()
-            except (ValueError, EnvironmentError, ImportError):
-                # handle broken mmap scenarios
+            except (ValueError, EnvironmentError, ImportError,
+                    AttributeError):
+                # handle broken mmap scenarios and in-memory files
                 locked = lock(fobj)
                 fobj.seek(offset + size)
                 buf = fobj.read(BUFFER_SIZE)
@@ -250,6 +654,172 @@ def delete_bytes(fobj, size, offset, BUFFER_SIZE=2**16):
             unlock(fobj)
 
 
+def _common_prefix(a, b):
+    """Returns the length of the common prefix of two byte strings"""
+
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def write_changed(fobj, data, offset, BUFFER_SIZE=2**16):
+    """Write data at offset, leaving the bytes already there alone.
+
+    fobj must be an open file object, open rb+ or equivalent. Compares
+    data with the file contents block by block and only writes the
+    differing range of each block. Returns the number of bytes written.
+    """
+
+    written = 0
+    for start in range(0, len(data), BUFFER_SIZE):
+        block = data[start:start + BUFFER_SIZE]
+        fobj.seek(offset + start)
+        old = fobj.read(len(block))
+        if old == block:
+            continue
+        first = _common_prefix(old, block)
+        end = len(block)
+        if len(old) == end:
+            end -= _common_prefix(old[::-1], block[::-1])
+        fobj.seek(offset + start + first)
+        fobj.write(block[first:end])
+        written += end - first
+    return written
+
+
+# ioctl sharing all blocks of the source file with the destination
+FICLONE = 0x40049409
+
+
+def _clone_file(src, dest, BUFFER_SIZE=2**20):
+    """Copies the content of the file object src into the empty file
+    object dest.
+
+    Tries to make the file system share the blocks first (reflinks on
+    btrfs, XFS or NFS 4.2), then copying in the kernel and finally a
+    plain read/write loop.
+    """
+
+    src_fd = _fileno(src)
+    dest_fd = _fileno(dest)
+    if src_fd is not None and dest_fd is not None and \
+            sys.platform.startswith("linux"):
+        dest.flush()
+        try:
+            import fcntl
+            fcntl.ioctl(dest_fd, FICLONE, src_fd)
+        except (ImportError, EnvironmentError):
+            pass
+        else:
+            return
+
+        if _can_kernel_copy():
+            size = os.fstat(src_fd).st_size
+            try:
+                _kernel_copy(src_fd, dest_fd, 0, 0, size)
+            except EnvironmentError as err:
+                if err.errno not in _KERNEL_COPY_ERRORS:
+                    raise
+                dest.seek(0)
+                dest.truncate()
+            else:
+                dest.seek(0, 2)
+                return
+
+    src.seek(0)
+    while True:
+        data = src.read(BUFFER_SIZE)
+        if not data:
+            break
+        dest.write(data)
+
+
+def _fsync_dir(dirname):
+    """Makes a rename in dirname durable, where that is possible"""
+
+    try:
+        fd = os.open(dirname, os.O_RDONLY)
+    except EnvironmentError:
+        # e.g. on Windows, where directories can't be opened
+        return
+    try:
+        os.fsync(fd)
+    except EnvironmentError:
+        pass
+    finally:
+        os.close(fd)
+
+
+SAVE_STRATEGIES = ("inplace", "rewrite")
+
+
+@contextmanager
+def save_target(target, strategy="inplace"):
+    """Context manager yielding what a save() should write to.
+
+    With strategy "inplace" that's target itself. With "rewrite" it's
+    the name of a copy of the file in the same directory, which gets
+    synced to disk and renamed over the file once the with block
+    finishes without an error (or removed if it doesn't). Whatever
+    happens in between, the file is then either unchanged or
+    completely saved.
+
+    "rewrite" needs target to name an existing file, it raises
+    ValueError for file objects and buffers. The copy gets the
+    permission bits of the file, but not its owner, extended attributes
+    or ACLs, and hard links to it keep the old data.
+    """
+
+    if strategy == "inplace":
+        yield target
+        return
+    elif strategy != "rewrite":
+        raise ValueError("unknown save strategy %r, expected one of %r" % (
+            strategy, SAVE_STRATEGIES))
+
+    if isinstance(target, FileThing):
+        target = target.name
+    if target is None or is_fileobj(target) or is_buffer(target) or \
+            is_range_reader(target):
+        raise ValueError("strategy='rewrite' needs a filename")
+    if hasattr(os, "fspath"):
+        target = os.fspath(target)
+
+    # replace the file a symlink points to, not the link
+    target = os.path.realpath(target)
+    dirname, basename = os.path.split(target)
+    if isinstance(target, bytes):
+        prefix, suffix = b"." + basename + b".", b".tmp"
+    else:
+        prefix, suffix = u"." + basename + u".", u".tmp"
+    fd, tempname = tempfile.mkstemp(suffix, prefix, dirname)
+    try:
+        with os.fdopen(fd, "wb") as dest:
+            with open(target, "rb") as src:
+                _clone_file(src, dest)
+                mode = stat.S_IMODE(os.fstat(src.fileno()).st_mode)
+        os.chmod(tempname, mode)
+
+        yield tempname
+
+        with open(tempname, "rb+") as h:
+            os.fsync(h.fileno())
+        replace = getattr(os, "replace", os.rename)
+        replace(tempname, target)
+    except BaseException:
+        try:
+            os.unlink(tempname)
+        except EnvironmentError:
+            pass
+        raise
+    _fsync_dir(dirname)
+
+
 def utf8(data):
     """Convert a basestring to a valid UTF-8 str."""
 
@@ -265,6 +835,9 @@ def dict_match(d, key, default=None):
     try:
         return d[key]
     except KeyError:
+        # fnmatch pulls in re, only import it when needed
+        from fnmatch import fnmatchcase
+
         for pattern, value in iteritems(d):
             if fnmatchcase(key, pattern):
                 return value
@@ -287,9 +860,23 @@ def decode_terminated(data, encoding, strict=True):
     # normalize encoding name so we can compare by name
     encoding = codec_info.name
 
-    # fast path
+    # fast paths: find the terminator and decode everything before it
     if encoding in ("utf-8", "iso8859-1"):
         index = data.find(b"\x00")
+        term_size = 1
+    elif encoding in ("utf-16-be", "utf-16-le") or (
+            encoding == "utf-16" and data[:2] in (b"\xff\xfe", b"\xfe\xff")):
+        # the first NULL code unit, so it has to start at an even offset.
+        # utf-16 without a BOM is left to the decoder, which rejects it
+        # instead of guessing the byte order.
+        index = data.find(b"\x00\x00")
+        while index != -1 and index % 2:
+            index = data.find(b"\x00\x00", index + 1)
+        term_size = 2
+    else:
+        term_size = 0
+
+    if term_size:
         if index == -1:
             # make sure we raise UnicodeError first, like in the slow path
             res = data.decode(encoding), b""
@@ -297,7 +884,7 @@ def decode_terminated(data, encoding, strict=True):
                 raise ValueError("not null terminated")
             else:
                 return res
-        return data[:index].decode(encoding), data[index + 1:]
+        return data[:index].decode(encoding), data[index + term_size:]
 
     # slow path
     decoder = codec_info.incrementaldecoder()
@@ -20,7 +20,9 @@ from mutagen import StreamInfo, FileType
 
 from mutagen.id3 import ID3
 from mutagen._id3util import error as ID3Error
-from mutagen._util import insert_bytes, delete_bytes
+from mutagen._util import insert_bytes, delete_bytes, openfile, FileThing
+from mutagen._util import save_target
+from mutagen.padding import stats as _save_stats
 
 __all__ = ["AIFF", "Open", "delete"]
 
@@ -174,7 +176,8 @@ class IFFFile(object):
             return self.__chunks[id_]
         except KeyError:
             raise KeyError(
-                "%r has no %r chunk" % (self.__fileobj.name, id_))
+                "%r has no %r chunk" % (
+                    getattr(self.__fileobj, "name", self.__fileobj), id_))
 
     def __delitem__(self, id_):
         """Remove a chunk from the IFF file"""
@@ -258,9 +261,12 @@ class _IFFID3(ID3):
             raise ID3Error()
         super(_IFFID3, self)._load_header()
 
-    def save(self, filename=None, v2_version=4, v23_sep='/'):
+    def save(self, filename=None, v2_version=4, v23_sep='/', padding=None,
+             strategy="inplace"):
         """Save ID3v2 data to the AIFF file"""
 
+        self._check_filtered()
+
         framedata = self._prepare_framedata(v2_version, v23_sep)
         framesize = len(framedata)
 
@@ -269,10 +275,10 @@ class _IFFID3(ID3):
 
         # Unlike the parent ID3.save method, we won't save to a blank file
         # since we would have to construct a empty AIFF file
-        fileobj = open(filename, 'rb+')
-        iff_file = IFFFile(fileobj)
+        with save_target(filename, strategy) as target, \
+                openfile(target, writable=True) as fileobj:
+            iff_file = IFFFile(fileobj)
 
-        try:
             if u'ID3' not in iff_file:
                 iff_file.insert_chunk(u'ID3')
 
@@ -280,25 +286,34 @@ class _IFFID3(ID3):
             fileobj.seek(chunk.data_offset)
 
             header = fileobj.read(10)
-            header = self._prepare_id3_header(header, framesize, v2_version)
+            fileobj.seek(0, 2)
+            header = self._prepare_id3_header(
+                header, framesize, v2_version, fileobj.tell(), padding)
             header, new_size, _ = header
 
-            data = header + framedata + (b'\x00' * (new_size - framesize))
-
             # Include ID3 header size in 'new_size' calculation
             new_size += 10
-
-            # Expand the chunk if necessary, including pad byte
-            if new_size > chunk.size:
-                insert_at = chunk.offset + chunk.size
-                insert_size = new_size - chunk.size + new_size % 2
-                insert_bytes(fileobj, insert_size, insert_at)
+            data = header + framedata + (b'\x00' * (new_size - 10 - framesize))
+
+            # Grow or shrink the chunk to the new size, including pad byte
+            old_pad = (chunk.data_offset + chunk.data_size) % 2
+            new_pad = (chunk.data_offset + new_size) % 2
+            delta = (new_size + new_pad) - (chunk.data_size + old_pad)
+            if delta > 0:
+                insert_bytes(fileobj, delta,
+                             chunk.data_offset + chunk.data_size + old_pad)
+            elif delta < 0:
+                delete_bytes(fileobj, -delta, chunk.data_offset + new_size +
+                             new_pad)
+            if new_size != chunk.data_size:
                 chunk.resize(new_size)
+                if new_pad != old_pad:
+                    form = iff_file[u'FORM']
+                    form.resize(form.data_size + new_pad - old_pad)
+            _save_stats.record(delta != 0)
 
             fileobj.seek(chunk.data_offset)
-            fileobj.write(data)
-        finally:
-            fileobj.close()
+            fileobj.write(data + b'\x00' * new_pad)
 
     def delete(self, filename=None):
         """Completely removes the ID3 chunk from the AIFF file"""
@@ -312,7 +327,7 @@ class _IFFID3(ID3):
 def delete(filename):
     """Completely removes the ID3 chunk from the AIFF file"""
 
-    with open(filename, "rb+") as file_:
+    with openfile(filename, writable=True) as file_:
         try:
             del IFFFile(file_)[u'ID3']
         except KeyError:
@@ -342,20 +357,27 @@ class AIFF(FileType):
         else:
             raise error("an ID3 tag already exists")
 
-    def load(self, filename, **kwargs):
-        """Load stream and tag information from a file."""
-        self.filename = filename
+    def load(self, filename, tags=True, info=True, **kwargs):
+        """Load stream and tag information from a file.
 
-        try:
-            self.tags = _IFFID3(filename, **kwargs)
-        except ID3Error:
-            self.tags = None
-
-        try:
-            fileobj = open(filename, "rb")
-            self.info = AIFFInfo(fileobj)
-        finally:
-            fileobj.close()
+        If tags or info is False that part doesn't get parsed.
+        """
+        self.filename = filename
+        self.tags = self.info = None
+        self._tags_skipped = not tags
+
+        with openfile(filename) as fileobj:
+            if tags:
+                try:
+                    self.tags = _IFFID3(
+                        FileThing(fileobj, filename), **kwargs)
+                except ID3Error:
+                    pass
+                else:
+                    self.tags.filename = filename
+
+            if info:
+                self.info = AIFFInfo(fileobj)
 
 
 Open = AIFF
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""asyncio front-end for loading and saving files.
+
+Mutagen does blocking file I/O, so the functions here run it on a bounded
+thread pool and hand back asyncio futures for use with ``await`` (Python
+3.4+, ``async for`` needs 3.5+)::
+
+    f = await mutagen.aio.load("song.mp3")
+    f["title"] = u"Title"
+    await mutagen.aio.save(f)
+
+    async for result in mutagen.aio.scan(["music/"]):
+        print(result.path, result.tags)
+
+Cancelling a future before its job started means the job never runs.
+A job already running in a worker thread can't be interrupted and runs to
+completion, so a cancelled save() never leaves a half written file.
+"""
+
+import asyncio
+import functools
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from mutagen._scan import _scan_one, _iter_paths, load_plain
+
+
+DEFAULT_WORKERS = 4
+"""Number of threads in the executor used if none is passed"""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(executor=None):
+    global _executor
+
+    if executor is not None:
+        return executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(DEFAULT_WORKERS)
+        return _executor
+
+
+def _run(executor, func, *args, **kwargs):
+    loop = asyncio.get_event_loop()
+    if kwargs:
+        func = functools.partial(func, **kwargs)
+    return loop.run_in_executor(_get_executor(executor), func, *args)
+
+
+def _chain(src, dest):
+    """Resolves the future dest like src once src is done"""
+
+    def on_done(src):
+        if dest.done():
+            return
+        if src.cancelled():
+            dest.cancel()
+        elif src.exception() is not None:
+            dest.set_exception(src.exception())
+        else:
+            dest.set_result(src.result())
+
+    src.add_done_callback(on_done)
+
+
+def load(filething, kind=None, executor=None, **kwargs):
+    """Returns a future resolving to the loaded file.
+
+    With kind=None :func:`mutagen.File` is used for guessing the type
+    (and the result can be None), otherwise kind gets called, e.g.
+    ``await load(path, MP3)``. Keyword arguments get passed on.
+    """
+
+    if kind is None:
+        from mutagen import File as kind
+    return _run(executor, kind, filething, **kwargs)
+
+
+def save(obj, executor=None, **kwargs):
+    """Returns a future which resolves once obj.save(**kwargs) is done"""
+
+    return _run(executor, obj.save, **kwargs)
+
+
+def delete(obj, executor=None, **kwargs):
+    """Returns a future which resolves once obj.delete(**kwargs) is done"""
+
+    return _run(executor, obj.delete, **kwargs)
+
+
+class scan(object):
+    """Asynchronous iterator loading many files, yielding a
+    :class:`mutagen.ScanResult` for each.
+
+    Takes the same paths, loader and File() keyword arguments as
+    :func:`mutagen.scan`. At most limit files are queued on the executor
+    at a time and the next paths are only taken when the consumer catches
+    up. If ordered is False results are yielded as they complete.
+
+    Directories get walked on the executor as well, a batch of up to
+    limit paths at a time, so the event loop doesn't block on the file
+    system.
+
+    Call close() when stopping the iteration early, to cancel the files
+    which haven't been started yet.
+    """
+
+    def __init__(self, paths, limit=DEFAULT_WORKERS * 2, ordered=True,
+                 loader=None, executor=None, **kwargs):
+        if limit < 1:
+            raise ValueError("limit has to be at least 1")
+
+        if loader is None:
+            loader = load_plain
+        if kwargs:
+            loader = functools.partial(loader, **kwargs)
+        self._func = functools.partial(_scan_one, loader)
+        self._paths = _iter_paths(paths)
+        self._limit = limit
+        self._ordered = ordered
+        self._executor = executor
+        self._pending = deque()
+        # paths taken from _paths but not queued yet, the job taking
+        # the next ones and an error it ran into
+        self._next_paths = deque()
+        self._fetching = None
+        self._error = None
+
+    def __aiter__(self):
+        return self
+
+    def _fill(self):
+        while self._next_paths and len(self._pending) < self._limit:
+            self._pending.append(
+                _run(self._executor, self._func, self._next_paths.popleft()))
+
+        # take the next paths ahead of time, so loading doesn't wait
+        if (self._paths is not None and self._fetching is None and
+                len(self._next_paths) < self._limit):
+            self._fetching = _run(self._executor, list,
+                                  itertools.islice(self._paths, self._limit))
+            self._fetching.add_done_callback(self._fetched)
+
+    def _fetched(self, fut):
+        self._fetching = None
+        if self._paths is None:
+            # closed in the meantime
+            return
+        if fut.cancelled():
+            self._paths = None
+        elif fut.exception() is not None:
+            self._paths = None
+            self._error = fut.exception()
+        else:
+            paths = fut.result()
+            if len(paths) < self._limit:
+                self._paths = None
+            self._next_paths.extend(paths)
+            self._fill()
+
+    def __anext__(self):
+        self._fill()
+        if self._pending:
+            if self._ordered:
+                return self._pending.popleft()
+            return self._next_done()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+        if self._fetching is None:
+            raise StopAsyncIteration
+
+        # wait for the next paths, then try again
+        result = asyncio.Future(loop=asyncio.get_event_loop())
+
+        def retry(fetching):
+            if result.done():
+                return
+            try:
+                _chain(self.__anext__(), result)
+            except Exception as e:
+                result.set_exception(e)
+
+        self._fetching.add_done_callback(retry)
+        return result
+
+    def _next_done(self):
+        """Returns a future resolving to the first pending result"""
+
+        pending = self._pending
+        for fut in pending:
+            if fut.done():
+                pending.remove(fut)
+                return fut
+
+        result = asyncio.Future(loop=asyncio.get_event_loop())
+
+        def on_done(fut):
+            # others might have finished in the same loop iteration
+            if result.done():
+                return
+            for other in pending:
+                other.remove_done_callback(on_done)
+            pending.remove(fut)
+            if fut.cancelled():
+                result.cancel()
+            elif fut.exception() is not None:
+                result.set_exception(fut.exception())
+            else:
+                result.set_result(fut.result())
+
+        def on_cancel(result):
+            if result.cancelled():
+                for other in pending:
+                    other.remove_done_callback(on_done)
+
+        for fut in pending:
+            fut.add_done_callback(on_done)
+        result.add_done_callback(on_cancel)
+        return result
+
+    def close(self):
+        """Stops the scan, cancelling all files not started yet"""
+
+        self._paths = None
+        self._next_paths.clear()
+        if self._fetching is not None:
+            self._fetching.cancel()
+        while self._pending:
+            self._pending.popleft().cancel()
+
+    def aclose(self):
+        """Like close(), but returns a future for ``await``"""
+
+        self.close()
+        fut = asyncio.Future(loop=asyncio.get_event_loop())
+        fut.set_result(None)
+        return fut
@@ -36,7 +36,8 @@ import struct
 
 from ._compat import cBytesIO, PY3, text_type, PY2, reraise, swap_to_string, long_
 from mutagen import Metadata, FileType, StreamInfo
-from mutagen._util import cdata, delete_bytes, total_ordering
+from mutagen._util import cdata, delete_bytes, total_ordering, openfile
+from mutagen._util import FileThing, save_target
 
 import collections
 
@@ -249,14 +250,11 @@ class APEv2(collections.MutableMapping, Metadata):
         return u"\n".join(u"%s=%s" % (k, v.pprint()) for k, v in items)
 
     def load(self, filename):
-        """Load tags from a filename."""
+        """Load tags from a filename, file object or buffer."""
 
         self.filename = filename
-        fileobj = open(filename, "rb")
-        try:
+        with openfile(filename) as fileobj:
             data = _APEv2Data(fileobj)
-        finally:
-            fileobj.close()
         if data.tag:
             self.clear()
             self.__casemap.clear()
@@ -383,65 +381,62 @@ class APEv2(collections.MutableMapping, Metadata):
     def __len__(self):
         return len(self.__dict.keys())
 
-    def save(self, filename=None):
+    def save(self, filename=None, strategy="inplace"):
         """Save changes to a file.
 
         If no filename is given, the one most recently loaded is used.
+        strategy is "inplace" or "rewrite", see mutagen.FileType.save.
 
         Tags are always written at the end of the file, and include
         a header and a footer.
         """
 
-        filename = filename or self.filename
-        try:
-            fileobj = open(filename, "r+b")
-        except IOError:
-            fileobj = open(filename, "w+b")
-        data = _APEv2Data(fileobj)
-
-        if data.is_at_start:
-            delete_bytes(fileobj, data.end - data.start, data.start)
-        elif data.start is not None:
-            fileobj.seek(data.start)
-            # Delete an ID3v1 tag if present, too.
-            fileobj.truncate()
-        fileobj.seek(0, 2)
-
-        # "APE tags items should be sorted ascending by size... This is
-        # not a MUST, but STRONGLY recommended. Actually the items should
-        # be sorted by importance/byte, but this is not feasible."
-        tags = sorted((v._internal(k) for k, v in self.items()), key=len)
-        num_tags = len(tags)
-        tags = b"".join(tags)
-
-        header = bytearray(b"APETAGEX")
-        # version, tag size, item count, flags
-        header += struct.pack("<4I", 2000, len(tags) + 32, num_tags,
-                              HAS_HEADER | IS_HEADER)
-        header += b"\0" * 8
-        fileobj.write(header)
-
-        fileobj.write(tags)
-
-        footer = bytearray(b"APETAGEX")
-        footer += struct.pack("<4I", 2000, len(tags) + 32, num_tags,
-                              HAS_HEADER)
-        footer += b"\0" * 8
-
-        fileobj.write(footer)
-        fileobj.close()
+        if filename is None:
+            filename = self.filename
+        with save_target(filename, strategy) as target, \
+                openfile(target, writable=True, create=True) as fileobj:
+            data = _APEv2Data(fileobj)
+
+            if data.is_at_start:
+                delete_bytes(fileobj, data.end - data.start, data.start)
+            elif data.start is not None:
+                fileobj.seek(data.start)
+                # Delete an ID3v1 tag if present, too.
+                fileobj.truncate()
+            fileobj.seek(0, 2)
+
+            # "APE tags items should be sorted ascending by size... This is
+            # not a MUST, but STRONGLY recommended. Actually the items should
+            # be sorted by importance/byte, but this is not feasible."
+            tags = sorted((v._internal(k) for k, v in self.items()), key=len)
+            num_tags = len(tags)
+            tags = b"".join(tags)
+
+            header = bytearray(b"APETAGEX")
+            # version, tag size, item count, flags
+            header += struct.pack("<4I", 2000, len(tags) + 32, num_tags,
+                                  HAS_HEADER | IS_HEADER)
+            header += b"\0" * 8
+            fileobj.write(header)
+
+            fileobj.write(tags)
+
+            footer = bytearray(b"APETAGEX")
+            footer += struct.pack("<4I", 2000, len(tags) + 32, num_tags,
+                                  HAS_HEADER)
+            footer += b"\0" * 8
+
+            fileobj.write(footer)
 
     def delete(self, filename=None):
         """Remove tags from a file."""
 
-        filename = filename or self.filename
-        fileobj = open(filename, "r+b")
-        try:
+        if filename is None:
+            filename = self.filename
+        with openfile(filename, writable=True) as fileobj:
             data = _APEv2Data(fileobj)
             if data.start is not None and data.size is not None:
                 delete_bytes(fileobj, data.end - data.start, data.start)
-        finally:
-            fileobj.close()
         self.clear()
 
 
@@ -600,13 +595,25 @@ class APEv2File(FileType):
         def pprint():
             return u"Unknown format with APEv2 tag."
 
-    def load(self, filename):
+    def load(self, filename, tags=True, info=True):
+        """Load stream and tag information from a file.
+
+        If tags or info is False that part doesn't get parsed.
+        """
+
         self.filename = filename
-        self.info = self._Info(open(filename, "rb"))
-        try:
-            self.tags = APEv2(filename)
-        except error:
-            self.tags = None
+        self.tags = self.info = None
+        self._tags_skipped = not tags
+        with openfile(filename) as fileobj:
+            if info:
+                self.info = self._Info(fileobj)
+            if tags:
+                try:
+                    self.tags = APEv2(FileThing(fileobj, filename))
+                except error:
+                    pass
+                else:
+                    self.tags.filename = filename
 
     def add_tags(self):
         if self.tags is None:
@@ -19,7 +19,9 @@ import struct
 from collections import MutableMapping
 
 from mutagen import FileType, Metadata, StreamInfo
-from mutagen._util import insert_bytes, delete_bytes, total_ordering
+from mutagen._util import insert_bytes, delete_bytes, total_ordering, openfile
+from mutagen._util import save_target
+from mutagen.padding import _get_padding, stats as _save_stats
 
 
 
@@ -562,10 +564,7 @@ class HeaderExtensionObject(BaseObject):
         self.objects = []
         while datapos < datasize:
             guid, size = struct.unpack("<16sQ", data[22+datapos:22+datapos+24])
-            if guid in _object_types:
-                obj = _object_types[guid]()
-            else:
-                obj = UnknownObject(guid)
+            obj = asf._create_object(guid)
             obj.parse(asf, data[22+datapos+24:22+datapos+size], fileobj, size)
             self.objects.append(obj)
             datapos += size
@@ -638,6 +637,11 @@ class MetadataLibraryObject(BaseObject):
                 data)
 
 
+class PaddingObject(BaseObject):
+    """Padding, unused space in the header."""
+    GUID = b"\x74\xD4\x06\x18\xDF\xCA\x09\x45\xA4\xBA\x9A\xAB\xCB\x96\xAA\xE8"
+
+
 _object_types = {
     ExtendedContentDescriptionObject.GUID: ExtendedContentDescriptionObject,
     ContentDescriptionObject.GUID: ContentDescriptionObject,
@@ -646,8 +650,18 @@ _object_types = {
     HeaderExtensionObject.GUID: HeaderExtensionObject,
     MetadataLibraryObject.GUID: MetadataLibraryObject,
     MetadataObject.GUID: MetadataObject,
+    PaddingObject.GUID: PaddingObject,
 }
 
+_tag_object_guids = [
+    ContentDescriptionObject.GUID, ExtendedContentDescriptionObject.GUID,
+    MetadataObject.GUID, MetadataLibraryObject.GUID,
+]
+
+_info_object_guids = [
+    FilePropertiesObject.GUID, StreamPropertiesObject.GUID,
+]
+
 
 class ASF(FileType):
     """An ASF file, probably containing WMA or WMV."""
@@ -655,10 +669,21 @@ class ASF(FileType):
     _mimes = ["audio/x-ms-wma", "audio/x-ms-wmv", "video/x-ms-asf",
               "audio/x-wma", "video/x-wmv"]
 
-    def load(self, filename):
+    def load(self, filename, tags=True, info=True):
+        """Load stream and tag information from a file.
+
+        If tags or info is False the objects holding them don't get
+        parsed.
+        """
+
         self.filename = filename
-        fileobj = open(filename, "rb")
-        try:
+        self._tags_skipped = not tags
+        self._skipped_objects = set()
+        if not tags:
+            self._skipped_objects.update(_tag_object_guids)
+        if not info:
+            self._skipped_objects.update(_info_object_guids)
+        with openfile(filename) as fileobj:
             self.size = 0
             self.size1 = 0
             self.size2 = 0
@@ -668,10 +693,20 @@ class ASF(FileType):
             self.info = ASFInfo()
             self.tags = ASFTags()
             self.__read_file(fileobj)
-        finally:
-            fileobj.close()
+        if not tags:
+            self.tags = None
+        if not info:
+            self.info = None
+
+    def save(self, padding=None, strategy="inplace"):
+        """Save the tags to the file.
 
-    def save(self):
+        padding is a padding function deciding how much padding to
+        write, see mutagen.padding. strategy is "inplace" or "rewrite",
+        see mutagen.FileType.save.
+        """
+
+        self._check_tags_loaded()
         # Move attributes to the right objects
         self.to_extended_content_description = {}
         self.to_metadata = {}
@@ -712,23 +747,33 @@ class ASF(FileType):
                 MetadataLibraryObject()
             self.header_extension_obj.objects.append(self.metadata_library_obj)
 
-        # Render the header
+        # Render the header, with a single padding object at the end
+        self.objects = [obj for obj in self.objects
+                        if not isinstance(obj, PaddingObject)]
         data = b"".join([obj.render(self) for obj in self.objects])
-        data = (HeaderObject.GUID +
-                struct.pack("<QL", len(data) + 30, len(self.objects)) +
-                b"\x01\x02" + data)
 
-        fileobj = open(self.filename, "rb+")
-        try:
+        with save_target(self.filename, strategy) as target, \
+                openfile(target, writable=True) as fileobj:
+            fileobj.seek(0, 2)
+            pad = _get_padding(
+                padding, self.size, len(data) + 30, fileobj.tell())
+            if pad:
+                padding_obj = PaddingObject()
+                padding_obj.data = b"\x00" * max(pad - 24, 0)
+                self.objects.append(padding_obj)
+                data += padding_obj.render(self)
+            data = (HeaderObject.GUID +
+                    struct.pack("<QL", len(data) + 30, len(self.objects)) +
+                    b"\x01\x02" + data)
+
             size = len(data)
             if size > self.size:
                 insert_bytes(fileobj, size - self.size, self.size)
             if size < self.size:
                 delete_bytes(fileobj, self.size - size, 0)
+            _save_stats.record(size != self.size)
             fileobj.seek(0)
             fileobj.write(data)
-        finally:
-            fileobj.close()
 
         self.size = size
         self.num_objects = len(self.objects)
@@ -749,12 +794,15 @@ class ASF(FileType):
         for i in range(self.num_objects):
             self.__read_object(fileobj)
 
+    def _create_object(self, guid):
+        if guid in _object_types and guid not in self._skipped_objects:
+            return _object_types[guid]()
+        else:
+            return UnknownObject(guid)
+
     def __read_object(self, fileobj):
         guid, size = struct.unpack("<16sQ", fileobj.read(24))
-        if guid in _object_types:
-            obj = _object_types[guid]()
-        else:
-            obj = UnknownObject(guid)
+        obj = self._create_object(guid)
         data = fileobj.read(size - 24)
         obj.parse(self, data, fileobj, size)
         self.objects.append(obj)
@@ -173,10 +173,10 @@ class EasyID3(MutableMapping, mutagen.Metadata):
 
         cls.RegisterKey(key, getter, setter, deleter)
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, **kwargs):
         self.__id3 = ID3()
         if filename is not None:
-            self.load(filename)
+            self.load(filename, **kwargs)
 
     load = property(lambda s: s.__id3.load,
                     lambda s, v: setattr(s.__id3, 'load', v))
@@ -29,8 +29,9 @@ from mutagen import FileType
 import mutagen
 
 from ._compat import cBytesIO, endswith, chr_
-from mutagen._util import insert_bytes
-from mutagen.id3 import BitPaddedInt
+from mutagen._util import insert_bytes, delete_bytes, openfile, save_target
+from mutagen.padding import _get_padding, stats as _save_stats
+from mutagen._id3util import BitPaddedInt
 from functools import reduce
 
 
@@ -688,6 +689,7 @@ class FLAC(mutagen.FileType):
 
         If no filename is given, the one most recently loaded is used.
         """
+        self._check_tags_loaded()
         if filename is None:
             filename = self.filename
         for s in list(self.metadata_blocks):
@@ -699,29 +701,41 @@ class FLAC(mutagen.FileType):
 
     vc = property(lambda s: s.tags, doc="Alias for tags; don't use this.")
 
-    def load(self, filename):
-        """Load file information from a filename."""
+    def load(self, filename, tags=True, info=True):
+        """Load file information from a filename, file object or buffer.
+
+        If tags or info is False the tags or stream information are left
+        out. All metadata blocks get read regardless, as the size of the
+        Vorbis comment and picture blocks can't be trusted to skip them.
+        """
 
         self.metadata_blocks = []
         self.tags = None
         self.cuesheet = None
         self.seektable = None
         self.filename = filename
-        fileobj = StrictFileObject(open(filename, "rb"))
-        try:
+        self._tags_skipped = not tags
+        self._info_skipped = not info
+        with openfile(filename) as fileobj:
+            fileobj = StrictFileObject(fileobj)
             self.__check_header(fileobj)
             while self.__read_metadata_block(fileobj):
                 pass
-        finally:
-            fileobj.close()
 
         try:
             self.metadata_blocks[0].length
         except (AttributeError, IndexError):
             raise FLACNoHeaderError("Stream info block not found")
 
+        if not tags:
+            self.tags = None
+
+    _info_skipped = False
+
     @property
     def info(self):
+        if self._info_skipped:
+            return None
         return self.metadata_blocks[0]
 
     def add_picture(self, picture):
@@ -740,51 +754,51 @@ class FLAC(mutagen.FileType):
 
         return [b for b in self.metadata_blocks if b.code == Picture.code]
 
-    def save(self, filename=None, deleteid3=False):
+    def save(self, filename=None, deleteid3=False, padding=None,
+             strategy="inplace"):
         """Save metadata blocks to a file.
 
         If no filename is given, the one most recently loaded is used.
+        padding is a padding function deciding how much padding to
+        write, see mutagen.padding. strategy is "inplace" or "rewrite",
+        see mutagen.FileType.save.
         """
 
+        self._check_tags_loaded()
         if filename is None:
             filename = self.filename
-        f = open(filename, 'rb+')
-
-        try:
-            # Ensure we've got padding at the end, and only at the end.
-            # If adding makes it too large, we'll scale it down later.
-            self.metadata_blocks.append(Padding(b'\x00' * 1020))
-            MetadataBlock.group_padding(self.metadata_blocks)
-
+        with save_target(filename, strategy) as target, \
+                openfile(target, writable=True) as f:
             header = self.__check_header(f)
             # "fLaC" and maybe ID3
             available = self.__find_audio_offset(f) - header
-            data = MetadataBlock.writeblocks(self.metadata_blocks)
+            f.seek(0, 2)
+            filesize = f.tell()
 
             # Delete ID3v2
             if deleteid3 and header > 4:
                 available += header - 4
                 header = 4
 
-            if len(data) > available:
-                # If we have too much data, see if we can reduce padding.
-                padding = self.metadata_blocks[-1]
-                newlength = padding.length - (len(data) - available)
-                if newlength > 0:
-                    padding.length = newlength
-                    data = MetadataBlock.writeblocks(self.metadata_blocks)
-                    assert len(data) == available
-
-            elif len(data) < available:
-                # If we have too little data, increase padding.
-                self.metadata_blocks[-1].length += (available - len(data))
-                data = MetadataBlock.writeblocks(self.metadata_blocks)
-                assert len(data) == available
-
-            if len(data) != available:
-                # We couldn't reduce the padding enough.
-                diff = (len(data) - available)
+            # Padding goes at the end, in a single block of the size
+            # the padding function asks for
+            blocks = [b for b in self.metadata_blocks
+                      if not isinstance(b, Padding)]
+            data = MetadataBlock.writeblocks(blocks)
+            pad = _get_padding(padding, available, len(data), filesize)
+            if pad:
+                block = Padding()
+                block.length = min(max(pad - 4, 0), 2**24 - 1)
+                blocks.append(block)
+                data = MetadataBlock.writeblocks(blocks)
+            self.metadata_blocks[:] = blocks
+
+            diff = len(data) - available
+            if diff > 0:
                 insert_bytes(f, diff, header)
+            elif diff < 0:
+                delete_bytes(f, -diff, header)
+            _save_stats.record(diff != 0)
 
             f.seek(header - 4)
             f.write(b"fLaC" + data)
@@ -799,8 +813,6 @@ class FLAC(mutagen.FileType):
                     if f.read(3) == b"TAG":
                         f.seek(-128, 2)
                         f.truncate()
-        finally:
-            f.close()
 
     def __find_audio_offset(self, fileobj):
         byte = 0x00
@@ -826,13 +838,14 @@ class FLAC(mutagen.FileType):
         if header != b"fLaC":
             size = None
             if header[:3] == b"ID3":
-                size = 14 + BitPaddedInt(fileobj.read(6)[2:])
+                size = 14 + BitPaddedInt.to_int(fileobj.read(6)[2:])
                 fileobj.seek(size - 4)
                 if fileobj.read(4) != b"fLaC":
                     size = None
         if size is None:
             raise FLACNoHeaderError(
-                "%r is not a valid FLAC file" % fileobj.name)
+                "%r is not a valid FLAC file" % getattr(
+                    fileobj, "name", fileobj))
         return size
 
 
@@ -35,10 +35,13 @@ __all__ = ['ID3', 'ID3FileType', 'Frames', 'Open', 'delete']
 
 import struct
 
-from struct import unpack, pack, error as StructError
+from struct import unpack, unpack_from, pack, error as StructError
 
 import mutagen
-from mutagen._util import insert_bytes, delete_bytes, DictProxy
+from mutagen._util import insert_bytes, delete_bytes, write_changed
+from mutagen._util import DictProxy, openfile
+from mutagen._util import FileThing, save_target
+from mutagen.padding import _get_padding, stats as _save_stats
 from ._compat import reraise, chr_
 
 from mutagen._id3util import *
@@ -46,6 +49,77 @@ from mutagen._id3frames import *
 from mutagen._id3specs import *
 
 
+class _LazyFrame(object):
+    """Stands in for a frame loaded with lazy=True until it gets accessed.
+
+    Holds the frame class, the frame flags and the undecoded frame
+    payload, plus the major version of the tag it was read from.
+    """
+
+    __slots__ = ["cls", "flags", "data", "major", "HashKey"]
+
+    def __init__(self, cls, flags, data, major, key):
+        self.cls = cls
+        self.flags = flags
+        self.data = data
+        self.major = major
+        self.HashKey = key
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+def _lazy_hashkey(cls, data, PREFIX=1024):
+    """Returns the HashKey a frame of type cls decoded from data would
+    have, reading only the leading specs the key depends on.
+
+    Returns None if that can't be done without decoding the whole
+    frame.
+    """
+
+    if cls.HashKey is Frame.HashKey:
+        return cls.__name__
+    if getattr(cls, "_optionalspec", None):
+        return None
+
+    if len(data) > PREFIX:
+        # the key specs are short, so try with the start of the frame
+        # first instead of slicing up large payloads; the key is right
+        # if none of the specs ran into the cut
+        key, rest = _read_hashkey(cls, data[:PREFIX])
+        if key is not None and rest:
+            return key
+    return _read_hashkey(cls, data)[0]
+
+
+def _read_hashkey(cls, data):
+    """Returns the HashKey and the data left after the specs read for
+    it, or (None, b'') on failure.
+    """
+
+    # without __init__ the attributes not read yet are missing, so
+    # HashKey raises AttributeError until it has all it needs
+    frame = cls.__new__(cls)
+    for reader in cls._framespec[:-1]:
+        if not data:
+            break
+        try:
+            value, data = reader.read(frame, data)
+        except Exception:
+            # broken frame, let the normal loading code deal with it
+            break
+        setattr(frame, reader.name, value)
+        try:
+            return frame.HashKey, data
+        except AttributeError:
+            pass
+    return None, b''
+
+
 class ID3(DictProxy, mutagen.Metadata):
     """A file with an ID3v2 tag.
 
@@ -61,6 +135,8 @@ class ID3(DictProxy, mutagen.Metadata):
 
     filename = None
     size = 0
+    _filtered = False
+    __lazy = False
     __flags = 0
     __readbytes = 0
     __crc = None
@@ -92,17 +168,40 @@ class ID3(DictProxy, mutagen.Metadata):
         self.__readbytes += size
         return data
 
-    def load(self, filename, known_frames=None, translate=True, v2_version=4):
+    def load(self, filename, known_frames=None, translate=True, v2_version=4,
+             only=None, skip=None, lazy=False):
         """Load tags from a filename.
 
         Keyword arguments:
 
-        * filename -- filename to load tag data from
+        * filename -- filename, file object or bytes-like buffer to
+                      load tag data from
         * known_frames -- dict mapping frame IDs to Frame objects
         * translate -- Update all tags to ID3v2.3/4 internally. If you
                        intend to save, this must be true or you have to
                        call update_to_v23() / update_to_v24() manually.
         * v2_version -- if update_to_v23 or update_to_v24 get called (3 or 4)
+        * only -- if given, a set of frame IDs to load, e.g.
+                  ``{"TIT2", "TPE1"}``
+        * skip -- set of frame IDs not to load, e.g. ``{"APIC", "PRIV"}``
+        * lazy -- if True, frames get decoded on first access instead
+                  of when loading
+
+        Frames filtered out by only or skip are stepped over without
+        being decoded or kept around (also not in unknown_frames). The
+        IDs are the ones found in the file; ID3v2.2 frames also match
+        their ID3v2.3/4 equivalent ("APIC" matches "PIC"). A tag loaded
+        with a filter can't be saved, as that would drop the filtered
+        frames.
+
+        With lazy, ID3v2.3/4 frames only get split up and keyed when
+        loading, and decoded the first time they are looked up (through
+        ``tags[key]``, getall(), values() etc.). Frames never accessed
+        get written back unchanged by save(). Compressed, encrypted and
+        unsynchronised frames and ID3v2.2 tags are always decoded right
+        away. A lazy frame which turns out to be broken gets dropped when
+        it's first accessed, like loading drops it, so its key is listed
+        by keys() until then.
 
         Example of loading a custom frame::
 
@@ -115,58 +214,66 @@ class ID3(DictProxy, mutagen.Metadata):
         if not v2_version in (3, 4):
             raise ValueError("Only 3 and 4 possible for v2_version")
 
-        from os.path import getsize
-
         self.filename = filename
         self.__known_frames = known_frames
-        self._fileobj = open(filename, 'rb')
-        self.__filesize = getsize(filename)
-        try:
+        self.__only = only
+        self.__skip = skip
+        self._filtered = only is not None or bool(skip)
+        self.__lazy = lazy
+        with openfile(filename) as fileobj:
+            self._fileobj = fileobj
+            fileobj.seek(0, 2)
+            self.__filesize = fileobj.tell()
+            fileobj.seek(0)
             try:
-                self._load_header()
-            except EOFError:
-                self.size = 0
-                raise ID3NoHeaderError("%s: too small (%d bytes)" % (
-                    filename, self.__filesize))
-            except (ID3NoHeaderError, ID3UnsupportedVersionError) as err:
-                self.size = 0
-                import sys
-                stack = sys.exc_info()[2]
                 try:
-                    self._fileobj.seek(-128, 2)
-                except EnvironmentError:
-                    reraise(err, None, stack)
-                else:
-                    frames = ParseID3v1(self._fileobj.read(128))
-                    if frames is not None:
-                        self.version = self._V11
-                        for v in frames.values():
-                            self.add(v)
-                    else:
+                    self._load_header()
+                except EOFError:
+                    self.size = 0
+                    raise ID3NoHeaderError("%s: too small (%d bytes)" % (
+                        filename, self.__filesize))
+                except (ID3NoHeaderError, ID3UnsupportedVersionError) as err:
+                    self.size = 0
+                    import sys
+                    stack = sys.exc_info()[2]
+                    try:
+                        self._fileobj.seek(-128, 2)
+                    except EnvironmentError:
                         reraise(err, None, stack)
-            else:
-                frames = self.__known_frames
-                if frames is None:
-                    if self._V23 <= self.version:
-                        frames = Frames
-                    elif self._V22 <= self.version:
-                        frames = Frames_2_2
-                data = self.__fullread(self.size - 10)
-                for frame in self.__read_frames(data, frames=frames):
-                    if isinstance(frame, Frame):
-                        self.add(frame)
                     else:
-                        self.unknown_frames.append(frame)
-                self.__unknown_version = self.version
-        finally:
-            self._fileobj.close()
-            del self._fileobj
-            del self.__filesize
-            if translate:
-                if v2_version == 3:
-                    self.update_to_v23()
+                        frames = ParseID3v1(self._fileobj.read(128))
+                        if frames is not None:
+                            self.version = self._V11
+                            for v in frames.values():
+                                if (not self._filtered or
+                                        self.__wanted(v.FrameID, Frames)):
+                                    self.add(v)
+                        else:
+                            reraise(err, None, stack)
                 else:
-                    self.update_to_v24()
+                    frames = self.__known_frames
+                    if frames is None:
+                        if self._V23 <= self.version:
+                            frames = Frames
+                        elif self._V22 <= self.version:
+                            frames = Frames_2_2
+                    data = self.__fullread(self.size - 10)
+                    for frame in self.__read_frames(data, frames=frames):
+                        if isinstance(frame, Frame):
+                            self.add(frame)
+                        elif isinstance(frame, _LazyFrame):
+                            self.__add_lazy(frame)
+                        else:
+                            self.unknown_frames.append(frame)
+                    self.__unknown_version = self.version
+            finally:
+                del self._fileobj
+                del self.__filesize
+                if translate:
+                    if v2_version == 3:
+                        self.update_to_v23()
+                    else:
+                        self.update_to_v24()
 
     def getall(self, key):
         """Return all frames with a given name (the list may be empty).
@@ -186,7 +293,15 @@ class ID3(DictProxy, mutagen.Metadata):
             return [self[key]]
         else:
             key = key + ':'
-            return [v for s, v in self.items() if s.startswith(key)]
+            frames = []
+            for s in list(self.keys()):
+                if s.startswith(key):
+                    try:
+                        frames.append(self[s])
+                    except KeyError:
+                        # a broken lazy frame, dropped on decoding
+                        pass
+            return frames
 
     def delall(self, key):
         """Delete all tags of a given kind; see getall."""
@@ -219,6 +334,52 @@ class ID3(DictProxy, mutagen.Metadata):
         frames = sorted(Frame.pprint(s) for s in self.values())
         return '\n'.join(frames)
 
+    def __getitem__(self, key):
+        frame = super(ID3, self).__getitem__(key)
+        if isinstance(frame, _LazyFrame):
+            try:
+                frame = frame.cls.fromData(self, frame.flags, frame.data)
+            except ID3JunkFrameError:
+                # dropped, like loading without lazy would have
+                super(ID3, self).__delitem__(key)
+                raise KeyError(key)
+            super(ID3, self).__setitem__(key, frame)
+        return frame
+
+    def __add_lazy(self, frame):
+        """Adds a lazy frame while loading"""
+
+        key = frame.HashKey
+        try:
+            super(ID3, self).__getitem__(key)
+        except KeyError:
+            super(ID3, self).__setitem__(key, frame)
+            return
+        # a later frame with the same key replaces the earlier one, but
+        # a broken one gets dropped without lazy, so find out now
+        try:
+            frame = frame.cls.fromData(self, frame.flags, frame.data)
+        except ID3JunkFrameError:
+            return
+        super(ID3, self).__setitem__(key, frame)
+
+    def __decode_lazy(self):
+        """Decodes all lazy frames, dropping the broken ones"""
+
+        for key in list(self.keys()):
+            try:
+                self[key]
+            except KeyError:
+                pass
+
+    def values(self):
+        self.__decode_lazy()
+        return super(ID3, self).values()
+
+    def items(self):
+        self.__decode_lazy()
+        return super(ID3, self).items()
+
     def loaded_frame(self, tag):
         """Deprecated; use the add method."""
         # turn 2.2 into 2.3/2.4 tags
@@ -238,7 +399,7 @@ class ID3(DictProxy, mutagen.Metadata):
         data = self.__fullread(10)
         id3, vmaj, vrev, flags, size = unpack('>3sBBB4s', data)
         self.__flags = flags
-        self.size = BitPaddedInt(size) + 10
+        self.size = BitPaddedInt.to_int(size) + 10
         self.version = (2, vmaj, vrev)
 
         if id3 != b'ID3':
@@ -274,7 +435,7 @@ class ID3(DictProxy, mutagen.Metadata):
             elif self.version >= self._V24:
                 # "Where the 'Extended header size' is the size of the whole
                 # extended header, stored as a 32 bit synchsafe integer."
-                self.__extsize = BitPaddedInt(extsize) - 4
+                self.__extsize = BitPaddedInt.to_int(extsize) - 4
                 if self.PEDANTIC:
                     if not BitPaddedInt.has_valid_padding(extsize):
                         raise ValueError("Extended header size not synchsafe")
@@ -297,12 +458,11 @@ class ID3(DictProxy, mutagen.Metadata):
         o = 0
         asbpi = 0
         while o < len(data) - 10:
-            part = data[o:o + 10]
-            if part == EMPTY:
+            if data[o:o + 10] == EMPTY:
                 bpioff = -((len(data) - o) % 10)
                 break
-            name, size, flags = unpack('>4sLH', part)
-            size = BitPaddedInt(size)
+            name, size, flags = unpack_from('>4sLH', data, o)
+            size = BitPaddedInt.to_int(size)
             o += 10 + size
             if name in frames:
                 asbpi += 1
@@ -313,11 +473,10 @@ class ID3(DictProxy, mutagen.Metadata):
         o = 0
         asint = 0
         while o < len(data) - 10:
-            part = data[o:o + 10]
-            if part == EMPTY:
+            if data[o:o + 10] == EMPTY:
                 intoff = -((len(data) - o) % 10)
                 break
-            name, size, flags = unpack('>4sLH', part)
+            name, size, flags = unpack_from('>4sLH', data, o)
             o += 10 + size
             if name in frames:
                 asint += 1
@@ -327,7 +486,24 @@ class ID3(DictProxy, mutagen.Metadata):
         # if more tags as int, or equal and bpi is past and int is not
         if asint > asbpi or (asint == asbpi and (bpioff >= 1 and intoff <= 1)):
             return int
-        return BitPaddedInt
+        return BitPaddedInt.to_int
+
+    def __wanted(self, name, frames):
+        """Whether the frame name passes the only/skip filters"""
+
+        only = self.__only
+        skip = self.__skip
+        names = [name]
+        if len(name) == 3:
+            # match ID3v2.2 frames by the frame they get upgraded to
+            tag = frames.get(name)
+            if tag is not None:
+                names.append(tag.__base__.__name__)
+        if only is not None and not any(n in only for n in names):
+            return False
+        if skip and any(n in skip for n in names):
+            return False
+        return True
 
     def __read_frames(self, data, frames):
         if self.version < self._V24 and self.f_unsynch:
@@ -336,12 +512,26 @@ class ID3(DictProxy, mutagen.Metadata):
             except ValueError:
                 pass
 
+        filtered = self._filtered
         if self._V23 <= self.version:
             bpi = self.__determine_bpi(data, frames)
-            while data:
-                header = data[:10]
+            lazy = self.__lazy
+            if self._V24 <= self.version:
+                # frames which need more than spec reading to decode
+                lazy = lazy and not self.f_unsynch
+                lazy_mask = (Frame.FLAG24_GROUPID | Frame.FLAG24_COMPRESS |
+                             Frame.FLAG24_ENCRYPT | Frame.FLAG24_UNSYNCH |
+                             Frame.FLAG24_DATALEN)
+            else:
+                lazy_mask = (Frame.FLAG23_COMPRESS | Frame.FLAG23_ENCRYPT |
+                             Frame.FLAG23_GROUP)
+            # walk the frames by offset, only the payload of each
+            # frame gets copied out
+            o = 0
+            end = len(data)
+            while o < end:
                 try:
-                    name, size, flags = unpack('>4sLH', header)
+                    name, size, flags = unpack_from('>4sLH', data, o)
                 except struct.error:
                     return  # not enough header
                 if name.strip(b'\x00') == b'':
@@ -350,28 +540,39 @@ class ID3(DictProxy, mutagen.Metadata):
                 name = name.decode('latin1')
 
                 size = bpi(size)
-                framedata = data[10:10+size]
-                data = data[10+size:]
+                head = o
+                start = o + 10
+                o = start + size
                 if size == 0:
                     continue  # drop empty frames
+                if filtered and not self.__wanted(name, frames):
+                    continue
+                framedata = data[start:o]
                 try:
                     tag = frames[name]
                 except KeyError:
                     if is_valid_frame_id(name):
-                        yield header + framedata
+                        yield data[head:o]
                 else:
+                    if lazy and not flags & lazy_mask:
+                        key = _lazy_hashkey(tag, framedata)
+                        if key is not None:
+                            yield _LazyFrame(tag, flags, framedata,
+                                             self.version[1], key)
+                            continue
                     try:
                         yield self.__load_framedata(tag, flags, framedata)
                     except NotImplementedError:
-                        yield header + framedata
+                        yield data[head:o]
                     except ID3JunkFrameError:
                         pass
 
         elif self._V22 <= self.version:
-            while data:
-                header = data[0:6]
+            o = 0
+            end = len(data)
+            while o < end:
                 try:
-                    name, size = unpack('>3s3s', header)
+                    name, size = unpack_from('>3s3s', data, o)
                 except struct.error:
                     return  # not enough header
                 size, = struct.unpack('>L', b'\x00'+size)
@@ -380,20 +581,24 @@ class ID3(DictProxy, mutagen.Metadata):
 
                 name = name.decode('latin1')
 
-                framedata = data[6:6+size]
-                data = data[6+size:]
+                head = o
+                start = o + 6
+                o = start + size
                 if size == 0:
                     continue  # drop empty frames
+                if filtered and not self.__wanted(name, frames):
+                    continue
+                framedata = data[start:o]
                 try:
                     tag = frames[name]
                 except KeyError:
                     if is_valid_frame_id(name):
-                        yield header + framedata
+                        yield data[head:o]
                 else:
                     try:
                         yield self.__load_framedata(tag, 0, framedata)
                     except NotImplementedError:
-                        yield header + framedata
+                        yield data[head:o]
                     except ID3JunkFrameError:
                         pass
 
@@ -408,6 +613,15 @@ class ID3(DictProxy, mutagen.Metadata):
     #f_crc = property(lambda s: bool(s.__extflags & 0x8000))
 
     def _prepare_framedata(self, v2_version, v23_sep):
+        return b''.join(b''.join(entry[1:]) for entry in
+                         self._prepare_frames(v2_version, v23_sep))
+
+    def _prepare_frames(self, v2_version, v23_sep):
+        """Returns a list of (frame, header, data) tuples with the frames
+        to save and their encoded header and data. frame is None for
+        unknown frames, which have it all in data.
+        """
+
         if v2_version == 3:
             version = self._V23
         elif v2_version == 4:
@@ -420,39 +634,57 @@ class ID3(DictProxy, mutagen.Metadata):
         #PY26 - Change this to dictionary comprehension
         order = dict((b, a) for a, b in enumerate(order))
         last = len(order)
-        frames = sorted(self.items(), key=lambda a: (order.get(a[0][:4], last), a[0]))
-
-        framedata = [self.__save_frame(frame, version=version, v23_sep=v23_sep)
-                     for (key, frame) in frames]
+        keys = sorted(self.keys(), key=lambda k: (order.get(k[:4], last), k))
+
+        framedata = []
+        for key in keys:
+            frame = super(ID3, self).__getitem__(key)
+            # untouched lazy frames can be written as loaded, as long as
+            # the payload is valid in the target version
+            if isinstance(frame, _LazyFrame) and frame.major > v2_version:
+                try:
+                    frame = self[key]
+                except KeyError:
+                    # broken, dropped like when loading without lazy
+                    continue
+            framedata.append((frame,) + self.__encode_frame(
+                frame, version=version, v23_sep=v23_sep))
 
         # only write unknown frames if they were loaded from the version
         # we are saving with or upgraded to it
         if self.__unknown_version == version:
-            framedata.extend(data for data in self.unknown_frames
-                             if len(data) > 10)
+            framedata.extend((None, b'', data)
+                             for data in self.unknown_frames if len(data) > 10)
 
-        return b''.join(framedata)
+        return framedata
 
-    def _prepare_id3_header(self, original_header, framesize, v2_version):
+    def _check_filtered(self):
+        """Raises ValueError if the tag was loaded with only/skip"""
+
+        if self._filtered:
+            raise ValueError("can't save a tag loaded with only/skip, "
+                             "the filtered frames would get lost")
+
+    def _prepare_id3_header(self, original_header, framesize, v2_version,
+                            filesize=0, padding=None):
         try:
             id3, vmaj, vrev, flags, insize = unpack('>3sBBB4s', original_header)
         except struct.error:
             id3, insize = b'', 0
-        insize = BitPaddedInt(insize)
+        insize = BitPaddedInt.to_int(insize)
         if id3 != b'ID3':
             insize = -10
 
-        if insize >= framesize:
-            outsize = insize
-        else:
-            outsize = (framesize + 1023) & ~0x3FF
+        outsize = framesize + _get_padding(
+            padding, insize + 10, framesize + 10, filesize)
 
         framesize = BitPaddedInt.to_str(outsize, width=4)
         header = pack('>3sBBB4s', b'ID3', v2_version, 0, 0, framesize)
 
         return (header, outsize, insize)
 
-    def save(self, filename=None, v1=1, v2_version=4, v23_sep='/'):
+    def save(self, filename=None, v1=1, v2_version=4, v23_sep='/',
+             padding=None, strategy="inplace"):
         """Save changes to a file.
 
         If no filename is given, the one most recently loaded is used.
@@ -469,14 +701,19 @@ class ID3(DictProxy, mutagen.Metadata):
         v23_sep -- the separator used to join multiple text values
                    if v2_version == 3. Defaults to '/' but if it's None
                    will be the ID3v2v2.4 null separator.
+        padding -- padding function deciding how much padding to write,
+                   see mutagen.padding
+        strategy -- "inplace" or "rewrite", see mutagen.FileType.save
 
         The lack of a way to update only an ID3v1 tag is intentional.
         """
 
-        framedata = self._prepare_framedata(v2_version, v23_sep)
-        framesize = len(framedata)
+        self._check_filtered()
 
-        if not framedata:
+        frames = self._prepare_frames(v2_version, v23_sep)
+        framesize = sum(len(h) + len(data) for frame, h, data in frames)
+
+        if not framesize:
             try:
                 self.delete(filename)
             except EnvironmentError as err:
@@ -487,26 +724,40 @@ class ID3(DictProxy, mutagen.Metadata):
 
         if filename is None:
             filename = self.filename
-        try:
-            f = open(filename, 'rb+')
-        except IOError as err:
-            from errno import ENOENT
-            if err.errno != ENOENT:
-                raise
-            f = open(filename, 'ab')  # create, then reopen
-            f = open(filename, 'rb+')
-        try:
+        with save_target(filename, strategy) as target, \
+                openfile(target, writable=True, create=True) as f:
+            f.seek(0, 2)
+            filesize = f.tell()
+            f.seek(0)
             idata = f.read(10)
 
-            header = self._prepare_id3_header(idata, framesize, v2_version)
+            header = self._prepare_id3_header(
+                idata, framesize, v2_version, filesize, padding)
             header, outsize, insize = header
-
-            data = header + framedata + (b'\x00' * (outsize - framesize))
-
-            if (insize < outsize):
-                insert_bytes(f, outsize-insize, insize+10)
-            f.seek(0)
-            f.write(data)
+            fill = b'\x00' * (outsize - framesize)
+
+            if insize == outsize:
+                # the tag still fits, only write what changed
+                write_changed(f, header, 0)
+                offset = 10
+                for frame, fheader, data in frames:
+                    write_changed(f, fheader, offset)
+                    offset += len(fheader)
+                    write_changed(f, data, offset)
+                    offset += len(data)
+                write_changed(f, fill, offset)
+            else:
+                if insize < outsize:
+                    insert_bytes(f, outsize-insize, insize+10)
+                else:
+                    delete_bytes(f, insize-outsize, outsize+10)
+                f.seek(0)
+                f.write(header)
+                for frame, fheader, data in frames:
+                    f.write(fheader)
+                    f.write(data)
+                f.write(fill)
+            _save_stats.record(insize != outsize)
 
             try:
                 f.seek(-128, 2)
@@ -532,13 +783,10 @@ class ID3(DictProxy, mutagen.Metadata):
 
             f.seek(offset, 2)
             if v1 == 1 and has_v1 or v1 == 2:
-                f.write(MakeID3v1(self))
+                write_changed(f, MakeID3v1(self), f.tell())
             else:
                 f.truncate()
 
-        finally:
-            f.close()
-
     def delete(self, filename=None, delete_v1=True, delete_v2=True):
         """Remove tags from a file.
 
@@ -555,16 +803,27 @@ class ID3(DictProxy, mutagen.Metadata):
         self.clear()
 
     def __save_frame(self, frame, name=None, version=_V24, v23_sep=None):
-        flags = 0
-        if self.PEDANTIC and isinstance(frame, TextFrame):
-            if len(str(frame)) == 0:
-                return b''
+        return b''.join(self.__encode_frame(frame, name, version, v23_sep))
+
+    def __encode_frame(self, frame, name=None, version=_V24, v23_sep=None):
+        """Returns the frame header and data, kept apart so lazy frame
+        payloads don't get copied.
+        """
 
-        if version == self._V23:
-            framev23 = frame._get_v23_frame(sep=v23_sep)
-            framedata = framev23._writeData()
+        flags = 0
+        if isinstance(frame, _LazyFrame):
+            framedata = frame.data
+            name = name or frame.cls.__name__
         else:
-            framedata = frame._writeData()
+            if self.PEDANTIC and isinstance(frame, TextFrame):
+                if len(str(frame)) == 0:
+                    return b'', b''
+
+            if version == self._V23:
+                framev23 = frame._get_v23_frame(sep=v23_sep)
+                framedata = framev23._writeData()
+            else:
+                framedata = frame._writeData()
 
         usize = len(framedata)
         if usize > 2048:
@@ -585,7 +844,7 @@ class ID3(DictProxy, mutagen.Metadata):
         datasize = BitPaddedInt.to_str(len(framedata), width=4, bits=bits)
         n = (name or type(frame).__name__).encode("ascii")
         header = pack('>4s4sH', n, datasize, flags)
-        return header + framedata
+        return header, framedata
 
     def __update_common(self):
         """Updates done by both v23 and v24 update"""
@@ -745,30 +1004,30 @@ def delete(filename, delete_v1=True, delete_v2=True):
     * delete_v2 -- delete any ID3v2 tag
     """
 
-    f = open(filename, 'rb+')
-
-    if delete_v1:
-        try:
-            f.seek(-128, 2)
-        except IOError:
-            pass
-        else:
-            if f.read(3) == b'TAG':
+    with openfile(filename, writable=True) as f:
+        if delete_v1:
+            try:
                 f.seek(-128, 2)
-                f.truncate()
-
-    # technically an insize=0 tag is invalid, but we delete it anyway
-    # (primarily because we used to write it)
-    if delete_v2:
-        f.seek(0, 0)
-        idata = f.read(10)
-        try:
-            id3, vmaj, vrev, flags, insize = unpack('>3sBBB4s', idata)
-        except struct.error:
-            id3, insize = b'', -1
-        insize = BitPaddedInt(insize)
-        if id3 == b'ID3' and insize >= 0:
-            delete_bytes(f, insize + 10, 0)
+            except IOError:
+                pass
+            else:
+                if f.read(3) == b'TAG':
+                    f.seek(-128, 2)
+                    f.truncate()
+
+        # technically an insize=0 tag is invalid, but we delete it anyway
+        # (primarily because we used to write it)
+        if delete_v2:
+            f.seek(0, 0)
+            idata = f.read(10)
+            try:
+                id3, vmaj, vrev, flags, insize = unpack('>3sBBB4s', idata)
+            except struct.error:
+                pass
+            else:
+                insize = BitPaddedInt.to_int(insize)
+                if id3 == b'ID3' and insize >= 0:
+                    delete_bytes(f, insize + 10, 0)
 
 
 # support open(filename) as interface
@@ -920,11 +1179,13 @@ class ID3FileType(mutagen.FileType):
         else:
             raise error("an ID3 tag already exists")
 
-    def load(self, filename, ID3=None, **kwargs):
+    def load(self, filename, ID3=None, tags=True, info=True, **kwargs):
         """Load stream and tag information from a file.
 
         A custom tag reader may be used in instead of the default
         mutagen.id3.ID3 object, e.g. an EasyID3 reader.
+
+        If tags or info is False that part doesn't get parsed.
         """
 
         if ID3 is None:
@@ -934,19 +1195,24 @@ class ID3FileType(mutagen.FileType):
             # when tags are auto-instantiated in add_tags.
             self.ID3 = ID3
         self.filename = filename
-        try:
-            self.tags = ID3(filename, **kwargs)
-        except error:
-            self.tags = None
-        if self.tags is not None:
-            try:
-                offset = self.tags.size
-            except AttributeError:
-                offset = None
-        else:
+        self.tags = self.info = None
+        self._tags_skipped = not tags
+        with openfile(filename) as fileobj:
+            # parse tags and stream info from the same open file
             offset = None
-        try:
-            fileobj = open(filename, "rb")
-            self.info = self._Info(fileobj, offset)
-        finally:
-            fileobj.close()
+            if tags:
+                try:
+                    self.tags = ID3(FileThing(fileobj, filename), **kwargs)
+                except error:
+                    pass
+                else:
+                    self.tags.filename = filename
+                    offset = getattr(self.tags, "size", None)
+            elif info:
+                # just skip the tag
+                fileobj.seek(0)
+                header = fileobj.read(10)
+                if len(header) == 10 and header.startswith(b"ID3"):
+                    offset = BitPaddedInt.to_int(header[6:]) + 10
+            if info:
+                self.info = self._Info(fileobj, offset)
@@ -9,7 +9,6 @@
 
 """MPEG audio stream information and tags."""
 
-import os
 import struct
 
 from ._compat import endswith
@@ -91,11 +90,8 @@ class MPEGInfo(StreamInfo):
         loading files significantly faster.
         """
 
-        try:
-            size = os.path.getsize(fileobj.name)
-        except (IOError, OSError, AttributeError):
-            fileobj.seek(0, 2)
-            size = fileobj.tell()
+        fileobj.seek(0, 2)
+        size = fileobj.tell()
 
         # If we don't get an offset, try to skip an ID3v2 tag.
         if offset is None:
@@ -105,7 +101,7 @@ class MPEGInfo(StreamInfo):
                 id3, insize = struct.unpack('>3sxxx4s', idata)
             except struct.error:
                 id3, insize = '', 0
-            insize = BitPaddedInt(insize)
+            insize = BitPaddedInt.to_int(insize)
             if id3 == b'ID3' and insize > 0:
                 offset = insize + 10
             else:
@@ -255,6 +251,8 @@ class MP3(ID3FileType):
 
     @property
     def mime(self):
+        if self.info is None:
+            return super(MP3, self).mime
         l = self.info.layer
         return ["audio/mp%d" % l, "audio/x-mp%d" % l] + super(MP3, self).mime
 
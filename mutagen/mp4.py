@@ -30,6 +30,8 @@ import sys
 from mutagen import FileType, Metadata, StreamInfo
 from mutagen._constants import GENRES
 from mutagen._util import cdata, insert_bytes, delete_bytes, DictProxy, utf8
+from mutagen._util import openfile, save_target
+from mutagen.padding import _get_padding, stats as _save_stats
 from mutagen._compat import reraise, PY2, string_types, text_type, chr_, iteritems
 
 
@@ -359,8 +361,13 @@ class MP4Tags(DictProxy, Metadata):
         return (order.get(key[:4], last), length, v)
 
 
-    def save(self, filename):
-        """Save the metadata to the given filename."""
+    def save(self, filename, padding=None, strategy="inplace"):
+        """Save the metadata to the given filename.
+
+        padding is a padding function deciding how much padding to
+        write, see mutagen.padding. strategy is "inplace" or "rewrite",
+        see mutagen.FileType.save.
+        """
 
         values = []
         items = sorted(self.items(), key=MP4Tags.__get_sort_stats )
@@ -373,27 +380,34 @@ class MP4Tags(DictProxy, Metadata):
         data = Atom.render(b"ilst", b"".join(values))
 
         # Find the old atoms.
-        fileobj = open(filename, "rb+")
-        try:
+        with save_target(filename, strategy) as target, \
+                openfile(target, writable=True) as fileobj:
             atoms = Atoms(fileobj)
+            fileobj.seek(0, 2)
+            filesize = fileobj.tell()
             try:
                 path = atoms.path(b"moov", b"udta", b"meta", b"ilst")
             except KeyError:
-                self.__save_new(fileobj, atoms, data)
+                self.__save_new(fileobj, atoms, data, filesize, padding)
             else:
-                self.__save_existing(fileobj, atoms, path, data)
-        finally:
-            fileobj.close()
+                self.__save_existing(
+                    fileobj, atoms, path, data, filesize, padding)
 
-    def __pad_ilst(self, data, length=None):
-        if length is None:
-            length = ((len(data) + 1023) & ~1023) - len(data)
-        return Atom.render(b"free", b"\x00" * length)
+    def __pad_ilst(self, data, available, filesize, padding):
+        """Returns a free atom to follow the ilst data, with the size
+        the padding function asks for.
+        """
 
-    def __save_new(self, fileobj, atoms, ilst):
+        pad = _get_padding(padding, available, len(data), filesize)
+        if not pad:
+            return b""
+        return Atom.render(b"free", b"\x00" * max(pad - 8, 0))
+
+    def __save_new(self, fileobj, atoms, ilst, filesize, padding):
         hdlr = Atom.render(b"hdlr", b"\x00" * 8 + b"mdirappl" + b"\x00" * 9)
         meta = Atom.render(
-            b"meta", b"\x00\x00\x00\x00" + hdlr + ilst + self.__pad_ilst(ilst))
+            b"meta", b"\x00\x00\x00\x00" + hdlr + ilst +
+            self.__pad_ilst(ilst, 0, filesize, padding))
         try:
             path = atoms.path(b"moov", b"udta")
         except KeyError:
@@ -402,12 +416,13 @@ class MP4Tags(DictProxy, Metadata):
             meta = Atom.render(b"udta", meta)
         offset = path[-1].offset + 8
         insert_bytes(fileobj, len(meta), offset)
+        _save_stats.record(True)
         fileobj.seek(offset)
         fileobj.write(meta)
         self.__update_parents(fileobj, path, len(meta))
         self.__update_offsets(fileobj, atoms, len(meta), offset)
 
-    def __save_existing(self, fileobj, atoms, path, data):
+    def __save_existing(self, fileobj, atoms, path, data, filesize, padding):
         # Replace the old ilst atom.
         ilst = path.pop()
         offset = ilst.offset
@@ -430,14 +445,13 @@ class MP4Tags(DictProxy, Metadata):
         except IndexError:
             pass
 
+        data += self.__pad_ilst(data, length, filesize, padding)
         delta = len(data) - length
-        if delta > 0 or (delta < 0 and delta > -8):
-            data += self.__pad_ilst(data)
-            delta = len(data) - length
+        if delta > 0:
             insert_bytes(fileobj, delta, offset)
         elif delta < 0:
-            data += self.__pad_ilst(data, -delta - 8)
-            delta = 0
+            delete_bytes(fileobj, -delta, offset)
+        _save_stats.record(delta != 0)
 
         fileobj.seek(offset)
         fileobj.write(data)
@@ -790,34 +804,37 @@ class MP4(FileType):
 
     _mimes = ["audio/mp4", "audio/x-m4a", "audio/mpeg4", "audio/aac"]
 
-    def load(self, filename):
+    def load(self, filename, tags=True, info=True):
+        """Load stream and tag information from a file.
+
+        If tags or info is False that part doesn't get parsed.
+        """
+
         self.filename = filename
-        fileobj = open(filename, "rb")
-        try:
+        self.tags = self.info = None
+        self._tags_skipped = not tags
+        with openfile(filename) as fileobj:
             atoms = Atoms(fileobj)
 
             # ftyp is always the first atom in a valid MP4 file
             if not atoms.atoms or atoms.atoms[0].name != b"ftyp":
                 raise error("Not a MP4 file")
 
-            try:
-                self.info = MP4Info(atoms, fileobj)
-            except error:
-                raise
-            except Exception as err:
-                reraise(MP4StreamInfoError, err, sys.exc_info()[2])
-
-            if not MP4Tags._can_load(atoms):
-                self.tags = None
-            else:
+            if info:
+                try:
+                    self.info = MP4Info(atoms, fileobj)
+                except error:
+                    raise
+                except Exception as err:
+                    reraise(MP4StreamInfoError, err, sys.exc_info()[2])
+
+            if tags and MP4Tags._can_load(atoms):
                 try:
                     self.tags = self.MP4Tags(atoms, fileobj)
                 except error:
                     raise
                 except Exception as err:
                     reraise(MP4MetadataError, err, sys.exc_info()[2])
-        finally:
-            fileobj.close()
 
     def add_tags(self):
         if self.tags is None:
@@ -23,7 +23,7 @@ import struct
 from ._compat import endswith, xrange, ord_
 from mutagen import StreamInfo
 from mutagen.apev2 import APEv2File, error, delete
-from mutagen.id3 import BitPaddedInt
+from mutagen._id3util import BitPaddedInt
 from mutagen._util import cdata
 
 
@@ -98,7 +98,7 @@ class MusepackInfo(StreamInfo):
             header = fileobj.read(6)
             if len(header) != 6:
                 raise MusepackHeaderError("not a Musepack file")
-            size = 10 + BitPaddedInt(header[2:6])
+            size = 10 + BitPaddedInt.to_int(header[2:6])
             fileobj.seek(size)
             header = fileobj.read(4)
             if len(header) != 4:
@@ -22,8 +22,10 @@ import sys
 import zlib
 
 from mutagen import FileType
-from mutagen._util import cdata, insert_bytes, delete_bytes
-from ._compat import cBytesIO, reraise, chr_
+from mutagen._util import cdata, insert_bytes, delete_bytes, openfile
+from mutagen._util import save_target
+from mutagen.padding import stats as _save_stats
+from ._compat import cBytesIO, reraise, chr_, PY3
 
 
 class error(IOError):
@@ -32,6 +34,74 @@ class error(IOError):
     pass
 
 
+def _crc_finish(crc):
+    # crc32 returns uint prior to py2.6 on some platforms, so force uint.
+    # Although we're using to_uint_be, this actually makes the CRC
+    # a proper le integer, since Python's CRC is byteswapped.
+    return cdata.to_uint_be((~crc) & 0xffffffff).translate(cdata.bitswap)
+
+
+def _crc(data):
+    """The Ogg CRC of a page (with its CRC field zeroed), as stored in
+    the page header.
+
+    Python's CRC is swapped relative to Ogg's needs, so it gets the
+    data with the bits of each byte swapped and the result is swapped
+    back.
+    """
+
+    return _crc_finish(zlib.crc32(data.translate(cdata.bitswap), -1))
+
+
+def _crc_pages(data, spans):
+    """The Ogg CRCs of many pages in data, a bytes or bytearray.
+
+    spans is a list of (offset, size) of the pages in data. The CRC
+    fields in data get skipped, so they don't need to be zeroed. The
+    bits of all data get swapped at once instead of page by page.
+    """
+
+    swapped = data.translate(cdata.bitswap)
+    if PY3:
+        swapped = memoryview(swapped)
+    else:
+        # Python 2's crc32 takes neither memoryviews nor bytearrays
+        swapped = bytes(swapped)
+    crcs = []
+    for offset, size in spans:
+        crc = zlib.crc32(swapped[offset:offset + 22], -1)
+        crc = zlib.crc32(b"\x00" * 4, crc)
+        crc = zlib.crc32(swapped[offset + 26:offset + size], crc)
+        crcs.append(_crc_finish(crc))
+    return crcs
+
+
+def _find_pages(data):
+    """Finds the pages at the start of data, a bytes or bytearray.
+
+    Returns a list of (offset, size) of the complete pages and the
+    offset after the last one, which is where the first incomplete or
+    invalid page starts.
+    """
+
+    spans = []
+    pos = 0
+    length = len(data)
+    while length - pos >= 27:
+        if data[pos:pos + 5] != b"OggS\x00":
+            break
+        segments = struct.unpack_from("<B", data, pos + 26)[0]
+        lacing = data[pos + 27:pos + 27 + segments]
+        if len(lacing) != segments:
+            break
+        size = 27 + segments + sum(bytearray(lacing))
+        if length - pos < size:
+            break
+        spans.append((pos, size))
+        pos += size
+    return spans, pos
+
+
 class OggPage(object):
     """A single Ogg page (not necessarily a single encoded packet).
 
@@ -61,6 +131,7 @@ class OggPage(object):
 
     version = 0
     __type_flags = 0
+    __crc = None
     position = 0
     serial = 0
     sequence = 0
@@ -81,8 +152,8 @@ class OggPage(object):
 
         try:
             (oggs, self.version, self.__type_flags, self.position,
-             self.serial, self.sequence, crc, segments) = struct.unpack(
-                 "<4sBBqIIiB", header)
+             self.serial, self.sequence, segments) = struct.unpack(
+                 "<4sBBqII4xB", header)
         except struct.error:
             raise error("unable to read full header; got %r" % header)
 
@@ -93,6 +164,8 @@ class OggPage(object):
         if self.version != 0:
             raise error("version %r unsupported" % self.version)
 
+        self.__crc = header[22:26]
+
         total = 0
         lacings = []
         lacing_bytes = fileobj.read(segments)
@@ -152,14 +225,17 @@ class OggPage(object):
         data.extend(self.packets)
         data = b"".join(data)
 
-        # Python's CRC is swapped relative to Ogg's needs.
-        # crc32 returns uint prior to py2.6 on some platforms, so force uint
-        crc = (~zlib.crc32(data.translate(cdata.bitswap), -1)) & 0xffffffff
-        # Although we're using to_uint_be, this actually makes the CRC
-        # a proper le integer, since Python's CRC is byteswapped.
-        crc = cdata.to_uint_be(crc).translate(cdata.bitswap)
-        data = data[:22] + crc + data[26:]
-        return data
+        return data[:22] + _crc(data) + data[26:]
+
+    def verify(self):
+        """Whether the CRC of the page read from the file matches its
+        data. Raises ValueError for pages which weren't read from a
+        file.
+        """
+
+        if self.__crc is None:
+            raise ValueError("page wasn't read from a file")
+        return self.write()[22:26] == self.__crc
 
     @property
     def size(self):
@@ -199,7 +275,7 @@ class OggPage(object):
         doc="This is the last page of a logical bitstream.")
 
     @staticmethod
-    def renumber(fileobj, serial, start):
+    def renumber(fileobj, serial, start, BUFFER_SIZE=2**20):
         """Renumber pages belonging to a specified logical stream.
 
         fileobj must be opened with mode r+b or w+b.
@@ -220,22 +296,77 @@ class OggPage(object):
         """
 
         number = start
+        offset = fileobj.tell()
         while True:
+            # Read a window of pages and change the sequence numbers and
+            # CRCs of the ones in the stream in place, which can't
+            # change their sizes.
+            data = bytearray(fileobj.read(BUFFER_SIZE))
+            spans, end = _find_pages(data)
+            spans = [(pos, size) for (pos, size) in spans
+                     if struct.unpack_from("<I", data, pos + 14)[0] == serial]
+            for pos, size in spans:
+                struct.pack_into("<I", data, pos + 18, number)
+                number += 1
+            if spans:
+                for (pos, size), crc in zip(spans, _crc_pages(data, spans)):
+                    data[pos + 22:pos + 26] = crc
+                first = spans[0][0]
+                last = spans[-1][0] + spans[-1][1]
+                fileobj.seek(offset + first, 0)
+                fileobj.write(bytes(data[first:last]))
+            offset += end
+            fileobj.seek(offset, 0)
+            if end:
+                continue
+
+            # No complete page in the window, because it's at the end,
+            # the data is invalid, or the page is larger than the
+            # window. Read it on its own, raising the usual errors.
             try:
                 page = OggPage(fileobj)
             except EOFError:
                 break
-            else:
-                if page.serial != serial:
-                    # Wrong stream, skip this page.
-                    continue
-                # Changing the number can't change the page size,
-                # so seeking back based on the current size is safe.
-                fileobj.seek(-page.size, 1)
-            page.sequence = number
-            fileobj.write(page.write())
-            fileobj.seek(page.offset + page.size, 0)
-            number += 1
+            offset = page.offset + page.size
+            if page.serial == serial:
+                fileobj.seek(page.offset, 0)
+                page.sequence = number
+                fileobj.write(page.write())
+                number += 1
+            fileobj.seek(offset, 0)
+
+    @staticmethod
+    def verify_stream(fileobj, BUFFER_SIZE=2**20):
+        """Checks the CRCs of all pages from the current position of
+        fileobj up to its end, e.g. for checking files when adding them
+        to a collection.
+
+        Returns the number of pages checked. Raises error for the first
+        page which is invalid, truncated or has a wrong CRC.
+        """
+
+        count = 0
+        offset = fileobj.tell()
+        data = b""
+        while True:
+            chunk = fileobj.read(BUFFER_SIZE)
+            data += chunk
+
+            spans, pos = _find_pages(data)
+            if len(data) - pos >= 5 and data[pos:pos + 5] != b"OggS\x00":
+                raise error("invalid page at 0x%x" % (offset + pos))
+            for (start, size), crc in zip(spans, _crc_pages(data, spans)):
+                if data[start + 22:start + 26] != crc:
+                    raise error("CRC mismatch in page at 0x%x" % (
+                        offset + start))
+            count += len(spans)
+            offset += pos
+            data = data[pos:]
+
+            if not chunk:
+                if data:
+                    raise error("truncated page at 0x%x" % offset)
+                return count
 
     @staticmethod
     def to_packets(pages, strict=False):
@@ -300,20 +431,27 @@ class OggPage(object):
 
         page = OggPage()
         page.sequence = sequence
+        # The size of the page without the packet being added to it.
+        # Of that packet only the range start:pos is on the page so far.
+        page_size = 27
 
         for packet in packets:
             page.packets.append(b"")
-            while packet:
-                data, packet = packet[:chunk_size], packet[chunk_size:]
-                if page.size < default_size and len(page.packets) < 255:
-                    page.packets[-1] += data
+            start = pos = 0
+            length = len(packet)
+            while pos < length:
+                size = pos - start
+                if (page_size + size // 255 + 1 + size < default_size and
+                        len(page.packets) < 255):
+                    pos = min(pos + chunk_size, length)
                 else:
                     # If we've put any packet data into this page yet,
                     # we need to mark it incomplete. However, we can
                     # also have just started this packet on an already
                     # full page, in which case, just start the new
                     # page with this packet.
-                    if page.packets[-1]:
+                    if pos > start:
+                        page.packets[-1] = packet[start:pos]
                         page.complete = False
                         if len(page.packets) == 1:
                             page.position = -1
@@ -323,17 +461,50 @@ class OggPage(object):
                     page = OggPage()
                     page.continued = not pages[-1].complete
                     page.sequence = pages[-1].sequence + 1
-                    page.packets.append(data)
+                    page.packets.append(b"")
+                    page_size = 27
+                    start = pos
+                    pos = min(pos + chunk_size, length)
+
+                if length - pos < wiggle_room:
+                    pos = length
 
-                if len(packet) < wiggle_room:
-                    page.packets[-1] += packet
-                    packet = b""
+            data = packet[start:pos]
+            page.packets[-1] = data
+            page_size += len(data) // 255 + 1 + len(data)
 
         if page.packets:
             pages.append(page)
 
         return pages
 
+    @classmethod
+    def _from_packets_try_preserve(cls, packets, old_pages):
+        """Like from_packets(packets, old_pages[0].sequence), but if the
+        packets have the same sizes as the ones in old_pages, the new
+        pages get the same layout, so replacing them doesn't change the
+        number of pages.
+        """
+
+        old_packets = cls.to_packets(old_pages)
+        if [len(p) for p in packets] != [len(p) for p in old_packets]:
+            return cls.from_packets(packets, old_pages[0].sequence)
+
+        new_data = b"".join(packets)
+        offset = 0
+        new_pages = []
+        for old in old_pages:
+            new = OggPage()
+            new.sequence = old.sequence
+            new.complete = old.complete
+            new.continued = old.continued
+            new.position = old.position
+            for p in old.packets:
+                new.packets.append(new_data[offset:offset + len(p)])
+                offset += len(p)
+            new_pages.append(new)
+        return new_pages
+
     @classmethod
     def replace(cls, fileobj, old_pages, new_pages):
         """Replace old_pages with new_pages within fileobj.
@@ -363,24 +534,29 @@ class OggPage(object):
         if not new_pages[-1].complete and len(new_pages[-1].packets) == 1:
             new_pages[-1].position = -1
 
-        new_data = b''.join(cls.write(p) for p in new_pages)
-
-        # Make room in the file for the new data.
-        delta = len(new_data)
-        fileobj.seek(old_pages[0].offset, 0)
-        insert_bytes(fileobj, delta, old_pages[0].offset)
-        fileobj.seek(old_pages[0].offset, 0)
+        data = [cls.write(p) for p in new_pages]
+        new_data_end = old_pages[0].offset + sum(map(len, data))
+
+        # Pages of other streams between the old pages (in muxed files)
+        # stay, and end up after the new pages.
+        for prev, page in zip(old_pages, old_pages[1:]):
+            gap = prev.offset + prev.size
+            if gap != page.offset:
+                fileobj.seek(gap, 0)
+                data.append(fileobj.read(page.offset - gap))
+        new_data = b"".join(data)
+
+        # Resize the range of the old pages at its end, so the rest of
+        # the file moves (at most) once, and write over it.
+        start = old_pages[0].offset
+        end = old_pages[-1].offset + old_pages[-1].size
+        delta = len(new_data) - (end - start)
+        if delta > 0:
+            insert_bytes(fileobj, delta, end)
+        elif delta < 0:
+            delete_bytes(fileobj, -delta, end + delta)
+        fileobj.seek(start, 0)
         fileobj.write(new_data)
-        new_data_end = old_pages[0].offset + delta
-
-        # Go through the old pages and delete them. Since we shifted
-        # the data down the file, we need to adjust their offsets. We
-        # also need to go backwards, so we don't adjust the deltas of
-        # the other pages.
-        old_pages.reverse()
-        for old_page in old_pages:
-            adj_offset = old_page.offset + delta
-            delete_bytes(fileobj, old_page.size, adj_offset)
 
         # Finally, if there's any discrepency in length, we need to
         # renumber the pages for the logical stream.
@@ -451,22 +627,29 @@ class OggFileType(FileType):
     _Error = None
     _mimes = ["application/ogg", "application/x-ogg"]
 
-    def load(self, filename):
-        """Load file information from a filename."""
+    def load(self, filename, tags=True, info=True):
+        """Load file information from a filename.
+
+        If tags or info is False that part doesn't get parsed.
+        """
 
         self.filename = filename
-        fileobj = open(filename, "rb")
-        try:
+        self.tags = self.info = None
+        self._tags_skipped = not tags
+        with openfile(filename) as fileobj:
             try:
-                self.info = self._Info(fileobj)
-                self.tags = self._Tags(fileobj, self.info)
-                self.info._post_tags(fileobj)
+                # the tags need the stream serial from the info
+                stream_info = self._Info(fileobj)
+                if tags:
+                    self.tags = self._Tags(fileobj, stream_info)
+                if info:
+                    # finding the length can mean reading the whole file
+                    stream_info._post_tags(fileobj)
+                    self.info = stream_info
             except error as e:
                 reraise(self._Error, e, sys.exc_info()[2])
             except EOFError:
                 raise self._Error("no appropriate stream found")
-        finally:
-            fileobj.close()
 
     def delete(self, filename=None):
         """Remove tags from a file.
@@ -474,36 +657,42 @@ class OggFileType(FileType):
         If no filename is given, the one most recently loaded is used.
         """
 
+        self._check_tags_loaded()
         if filename is None:
             filename = self.filename
 
         self.tags.clear()
-        fileobj = open(filename, "rb+")
-        try:
+        with openfile(filename, writable=True) as fileobj:
             try:
-                self.tags._inject(fileobj)
+                self.tags._inject(fileobj, lambda *args: 0)
             except error as e:
                 reraise(self._Error, e, sys.exc_info()[2])
             except EOFError:
                 raise self._Error("no appropriate stream found")
-        finally:
-            fileobj.close()
 
-    def save(self, filename=None):
+    def save(self, filename=None, padding=None, strategy="inplace"):
         """Save a tag to a file.
 
         If no filename is given, the one most recently loaded is used.
+        padding is a padding function deciding how much padding to
+        write after the comment, see mutagen.padding. strategy is
+        "inplace" or "rewrite", see mutagen.FileType.save.
         """
 
+        self._check_tags_loaded()
         if filename is None:
             filename = self.filename
-        fileobj = open(filename, "rb+")
-        try:
+        with save_target(filename, strategy) as target, \
+                openfile(target, writable=True) as fileobj:
+            # the header pages are the only thing that changes, so the
+            # file data got moved if the file size changed
+            fileobj.seek(0, 2)
+            size = fileobj.tell()
             try:
-                self.tags._inject(fileobj)
+                self.tags._inject(fileobj, padding)
             except error as e:
                 reraise(self._Error, e, sys.exc_info()[2])
             except EOFError:
                 raise self._Error("no appropriate stream found")
-        finally:
-            fileobj.close()
+            fileobj.seek(0, 2)
+            _save_stats.record(fileobj.tell() != size)
@@ -20,10 +20,11 @@ __all__ = ["OggFLAC", "Open", "delete"]
 
 import struct
 
-from ._compat import cBytesIO
+from ._compat import cBytesIO, chr_, ord_
 
 from mutagen.flac import StreamInfo, VCFLACDict, StrictFileObject
 from mutagen.ogg import OggPage, OggFileType, error as OggError
+from mutagen.padding import _get_padding
 
 
 class error(OggError):
@@ -98,8 +99,15 @@ class OggFLACVComment(VCFLACDict):
         comment = cBytesIO(OggPage.to_packets(pages)[0][4:])
         super(OggFLACVComment, self).load(comment, errors=errors)
 
-    def _inject(self, fileobj):
-        """Write tag data into the FLAC Vorbis comment packet/page."""
+    def _inject(self, fileobj, padding_func):
+        """Write tag data into the FLAC Vorbis comment packet/page.
+
+        Padding goes into a FLAC PADDING block in its own packet
+        following the comment block.
+        """
+
+        fileobj.seek(0, 2)
+        filesize = fileobj.tell()
 
         # Ogg FLAC has no convenient data marker like Vorbis, but the
         # second packet - and second page - must be the comment data.
@@ -112,20 +120,77 @@ class OggFLACVComment(VCFLACDict):
         while not (page.sequence == 1 and page.serial == first_page.serial):
             page = OggPage(fileobj)
 
+        def next_page():
+            page = OggPage(fileobj)
+            while page.serial != first_page.serial:
+                page = OggPage(fileobj)
+            return page
+
         old_pages = [page]
         while not (old_pages[-1].complete or len(old_pages[-1].packets) > 1):
-            page = OggPage(fileobj)
-            if page.serial == first_page.serial:
-                old_pages.append(page)
+            old_pages.append(next_page())
 
         packets = OggPage.to_packets(old_pages, strict=False)
+        is_last = bool(ord_(packets[0][0]) & 0x80)
+
+        # Include a PADDING block following the comment block
+        if not is_last and len(packets) == 1:
+            page = next_page()
+            if not page.continued and ord_(page.packets[0][0]) & 0x7F == 1:
+                old_pages.append(page)
+                packets = OggPage.to_packets(old_pages, strict=False)
+        current = len(packets[0])
+        old_padding = len(packets) > 1 and ord_(packets[1][0]) & 0x7F == 1
+        if old_padding:
+            while len(packets) == 2 and not old_pages[-1].complete:
+                old_pages.append(next_page())
+                packets = OggPage.to_packets(old_pages, strict=False)
+            is_last = bool(ord_(packets[1][0]) & 0x80)
+            current += len(packets.pop(1))
 
         # Set the new comment block.
         data = self.write()
-        data = packets[0][:1] + struct.pack(">I", len(data))[-3:] + data
-        packets[0] = data
+        data = struct.pack(">I", len(data))[-3:] + data
+        padding = _get_padding(
+            padding_func, current, len(data) + 1, filesize)
+
+        def padding_block(length):
+            return (chr_(0x01 | is_last << 7) +
+                    struct.pack(">I", length)[-3:] + b"\x00" * length)
+
+        code = ord_(packets[0][0]) & 0x7F
+        if padding:
+            length = min(max(padding - 4, 0), 2 ** 24 - 1)
+            packets[0] = chr_(code) + data
+            packets.insert(1, padding_block(length))
+        else:
+            packets[0] = chr_(code | is_last << 7) + data
+        new_pages = OggPage._from_packets_try_preserve(packets, old_pages)
+
+        # If the comment and padding together still take up the same
+        # space, the lacing values can still differ by a byte, which
+        # the padding can make up for, so nothing needs to be moved
+        if old_padding and padding and len(data) + 1 + padding == current:
+            delta = (sum(p.size for p in old_pages) -
+                     sum(p.size for p in new_pages))
+            if delta and len(new_pages) == len(old_pages) and \
+                    0 <= length + delta < 2 ** 24:
+                packets[1] = padding_block(length + delta)
+                new_pages = OggPage._from_packets_try_preserve(
+                    packets, old_pages)
+
+        # Adding or removing the PADDING packet changes the number of
+        # header packets in the first packet, unless that's unknown (0)
+        if old_padding != bool(padding):
+            header = first_page.packets[0]
+            count = struct.unpack(">H", header[7:9])[0]
+            if count:
+                count += 1 if padding else -1
+                first_page.packets[0] = (
+                    header[:7] + struct.pack(">H", count) + header[9:])
+                fileobj.seek(first_page.offset)
+                fileobj.write(first_page.write())
 
-        new_pages = OggPage.from_packets(packets, old_pages[0].sequence)
         OggPage.replace(fileobj, old_pages, new_pages)
 
 
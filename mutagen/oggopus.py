@@ -19,8 +19,10 @@ __all__ = ["OggOpus", "Open", "delete"]
 import struct
 
 from mutagen import StreamInfo
+from mutagen._compat import BytesIO, ord_
 from mutagen._vorbis import VCommentDict
 from mutagen.ogg import OggPage, OggFileType, error as OggError
+from mutagen.padding import _get_padding
 
 
 class error(OggError):
@@ -74,6 +76,9 @@ class OggOpusInfo(StreamInfo):
 class OggOpusVComment(VCommentDict):
     """Opus comments embedded in an Ogg bitstream."""
 
+    # data following the comments which has to be kept
+    _pad_data = b""
+
     def __get_comment_pages(self, fileobj, info):
         # find the first tags page with the right serial
         page = OggPage(fileobj)
@@ -93,16 +98,32 @@ class OggOpusVComment(VCommentDict):
     def __init__(self, fileobj, info):
         pages = self.__get_comment_pages(fileobj, info)
         data = OggPage.to_packets(pages)[0][8:]  # Strip OpusTags
-        super(OggOpusVComment, self).__init__(data, framing=False)
-
-    def _inject(self, fileobj):
+        dataobj = BytesIO(data)
+        super(OggOpusVComment, self).__init__(dataobj, framing=False)
+
+        # Anything after the comments is binary data to keep if the
+        # lowest bit of its first byte is set, padding otherwise
+        rest = data[dataobj.tell():]
+        if rest and ord_(rest[0]) & 0x1:
+            self._pad_data = rest
+
+    def _inject(self, fileobj, padding_func):
+        fileobj.seek(0, 2)
+        filesize = fileobj.tell()
         fileobj.seek(0)
         info = OggOpusInfo(fileobj)
         old_pages = self.__get_comment_pages(fileobj, info)
 
         packets = OggPage.to_packets(old_pages)
-        packets[0] = b"OpusTags" + self.write(framing=False)
-        new_pages = OggPage.from_packets(packets, old_pages[0].sequence)
+        data = b"OpusTags" + self.write(framing=False)
+        if self._pad_data:
+            # padding would end up in the binary data
+            packets[0] = data + self._pad_data
+        else:
+            padding = _get_padding(
+                padding_func, len(packets[0]), len(data), filesize)
+            packets[0] = data + b"\x00" * padding
+        new_pages = OggPage._from_packets_try_preserve(packets, old_pages)
         OggPage.replace(fileobj, old_pages, new_pages)
 
 
@@ -22,6 +22,7 @@ __all__ = ["OggSpeex", "Open", "delete"]
 from mutagen import StreamInfo
 from mutagen._vorbis import VCommentDict
 from mutagen.ogg import OggPage, OggFileType, error as OggError
+from mutagen.padding import _get_padding
 from mutagen._util import cdata
 
 
@@ -82,9 +83,11 @@ class OggSpeexVComment(VCommentDict):
         data = OggPage.to_packets(pages)[0] + b"\x01"
         super(OggSpeexVComment, self).__init__(data, framing=False)
 
-    def _inject(self, fileobj):
+    def _inject(self, fileobj, padding_func):
         """Write tag data into the Speex comment packet/page."""
 
+        fileobj.seek(0, 2)
+        filesize = fileobj.tell()
         fileobj.seek(0)
 
         # Find the first header page, with the stream info.
@@ -109,10 +112,13 @@ class OggSpeexVComment(VCommentDict):
 
         packets = OggPage.to_packets(old_pages, strict=False)
 
-        # Set the new comment packet.
-        packets[0] = self.write(framing=False)
+        # Set the new comment packet, padded at the end
+        data = self.write(framing=False)
+        padding = _get_padding(
+            padding_func, len(packets[0]), len(data), filesize)
+        packets[0] = data + b"\x00" * padding
 
-        new_pages = OggPage.from_packets(packets, old_pages[0].sequence)
+        new_pages = OggPage._from_packets_try_preserve(packets, old_pages)
         OggPage.replace(fileobj, old_pages, new_pages)
 
 
@@ -22,6 +22,7 @@ from mutagen import StreamInfo
 from mutagen._vorbis import VCommentDict
 from mutagen._util import cdata
 from mutagen.ogg import OggPage, OggFileType, error as OggError
+from mutagen.padding import _get_padding
 
 
 class error(OggError):
@@ -84,11 +85,14 @@ class OggTheoraCommentDict(VCommentDict):
                 pages.append(page)
                 complete = page.complete or (len(page.packets) > 1)
         data = OggPage.to_packets(pages)[0][7:]
-        super(OggTheoraCommentDict, self).__init__(data + b"\x01")
+        # no framing bit, but there might be padding
+        super(OggTheoraCommentDict, self).__init__(data, framing=False)
 
-    def _inject(self, fileobj):
+    def _inject(self, fileobj, padding_func):
         """Write tag data into the Theora comment packet/page."""
 
+        fileobj.seek(0, 2)
+        filesize = fileobj.tell()
         fileobj.seek(0)
         page = OggPage(fileobj)
         while not page.packets[0].startswith(b"\x81theora"):
@@ -102,9 +106,12 @@ class OggTheoraCommentDict(VCommentDict):
 
         packets = OggPage.to_packets(old_pages, strict=False)
 
-        packets[0] = b"\x81theora" + self.write(framing=False)
+        data = b"\x81theora" + self.write(framing=False)
+        padding = _get_padding(
+            padding_func, len(packets[0]), len(data), filesize)
+        packets[0] = data + b"\x00" * padding
 
-        new_pages = OggPage.from_packets(packets, old_pages[0].sequence)
+        new_pages = OggPage._from_packets_try_preserve(packets, old_pages)
         OggPage.replace(fileobj, old_pages, new_pages)
 
 
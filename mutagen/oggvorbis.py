@@ -22,6 +22,7 @@ import struct
 from mutagen import StreamInfo
 from mutagen._vorbis import VCommentDict
 from mutagen.ogg import OggPage, OggFileType, error as OggError
+from mutagen.padding import _get_padding
 
 
 class error(OggError):
@@ -91,9 +92,12 @@ class OggVCommentDict(VCommentDict):
         data = OggPage.to_packets(pages)[0][7:]  # Strip off "\x03vorbis".
         super(OggVCommentDict, self).__init__(data)
 
-    def _inject(self, fileobj):
+    def _inject(self, fileobj, padding_func):
         """Write tag data into the Vorbis comment packet/page."""
 
+        fileobj.seek(0, 2)
+        filesize = fileobj.tell()
+
         # Find the old pages in the file; we'll need to remove them,
         # plus grab any stray setup packet data out of them.
         fileobj.seek(0)
@@ -109,10 +113,14 @@ class OggVCommentDict(VCommentDict):
 
         packets = OggPage.to_packets(old_pages, strict=False)
 
-        # Set the new comment packet.
-        packets[0] = b"\x03vorbis" + self.write()
+        # Set the new comment packet, decoders ignore anything after the
+        # framing bit so that's where the padding goes
+        data = b"\x03vorbis" + self.write()
+        padding = _get_padding(
+            padding_func, len(packets[0]), len(data), filesize)
+        packets[0] = data + b"\x00" * padding
 
-        new_pages = OggPage.from_packets(packets, old_pages[0].sequence)
+        new_pages = OggPage._from_packets_try_preserve(packets, old_pages)
         OggPage.replace(fileobj, old_pages, new_pages)
 
 
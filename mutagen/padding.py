@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Controlling the padding written after tags.
+
+ID3, FLAC, MP4, ASF and the Ogg formats keep their tags in front of
+the audio data. A tag which still fits into the space it had can be
+written in place, but if it grows beyond that everything following it
+has to be moved, which for a large file means rewriting most of it
+(and for Ogg also renumbering all following pages). Padding, unused
+space after the tag, leaves room for it to grow.
+
+How much padding gets written is decided by a padding function, which
+the save() methods of these formats take as ``padding``::
+
+    def padding(current, needed, filesize):
+        # keep whatever is there if the tag fits, else add 4 KiB
+        if needed <= current:
+            return current - needed
+        return 4096
+
+    f.save(padding=padding)
+
+It gets called with the size the tag takes up in the file right now
+including its padding (0 if there is no tag yet), the size the new tag
+needs without padding and the size of the file, and returns the amount
+of padding to write. If needed plus the returned padding differs from
+current, the data after the tag gets moved. Formats where padding
+needs a header of its own round small amounts up to the header size.
+For Ogg the sizes are the ones of the comment packet, for Ogg FLAC
+together with the PADDING block packet following it.
+Without a padding function :func:`default_padding` is used.
+
+:data:`stats` counts how many saves had to move file data, e.g. to
+check a padding function against a collection::
+
+    mutagen.padding.stats.reset()
+    for path in paths:
+        f = mutagen.File(path)
+        ...
+        f.save()
+    print(mutagen.padding.stats)
+
+Moving the data means shifting everything after the tag inside the
+file, and a crash while doing so leaves it damaged. See
+:meth:`mutagen.FileType.save` for saving to a copy of the file instead.
+"""
+
+
+def default_padding(current, needed, filesize):
+    """The padding function used if none is given.
+
+    Keeps the existing padding as long as the tag fits and it isn't
+    more than 10 KiB plus 1% of the file size. Otherwise writes 1 KiB
+    plus 0.1% of the file size, so that a number of small edits fit
+    before the file has to be rewritten again, and larger files, where
+    that costs more, get more room.
+    """
+
+    left = current - needed
+    if 0 <= left <= 10 * 1024 + filesize // 100:
+        return left
+    return 1024 + filesize // 1000
+
+
+class SaveStats(object):
+    """Counters for the saves of formats supporting padding.
+
+    * saves -- number of saves
+    * moves -- number of saves which had to move the file data after
+      the tag because it didn't fit or the padding was reduced
+
+    The counters are process wide and not synchronized between
+    threads.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Sets all counters to zero"""
+
+        self.saves = 0
+        self.moves = 0
+
+    def record(self, moved):
+        """Counts a save, moved tells if it moved file data"""
+
+        self.saves += 1
+        if moved:
+            self.moves += 1
+
+    def __repr__(self):
+        return "<%s saves=%d moves=%d>" % (
+            type(self).__name__, self.saves, self.moves)
+
+
+stats = SaveStats()
+"""The :class:`SaveStats` for all saves"""
+
+
+def _get_padding(padding, current, needed, filesize):
+    """Returns the padding to write according to the padding function,
+    or default_padding if it's None.
+    """
+
+    if padding is None:
+        padding = default_padding
+    result = padding(max(current, 0), needed, filesize)
+    if result < 0:
+        raise ValueError("padding function returned negative padding %r"
+                         % result)
+    return int(result)
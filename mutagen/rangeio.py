@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of version 2 of the GNU General Public License as
+# published by the Free Software Foundation.
+
+"""Reading files through byte range requests.
+
+Anything with a ``size()`` and a ``read_at(offset, length)`` method is a
+range reader and can be passed to :func:`mutagen.File` or the format
+classes instead of a filename, e.g. to read the tags of a file in an
+object store without downloading all of it::
+
+    reader = HTTPRangeReader("http://example.com/song.m4a")
+    f = mutagen.File(reader)
+
+The parsers then only fetch the parts of the file they look at. The
+reader gets wrapped in a :class:`RangeFile`, which caches and coalesces
+the reads, so parsing results in a few block sized requests. To tune the
+cache or look at the request counters pass a RangeFile instead::
+
+    fileobj = RangeFile(reader, block_size=16 * 1024)
+    f = mutagen.File(fileobj)
+    print(fileobj.requests, fileobj.bytes_fetched)
+
+Files read through range readers can't be saved.
+"""
+
+import errno
+from collections import OrderedDict
+
+from mutagen._compat import PY2
+
+
+class BytesRangeReader(object):
+    """A range reader serving from memory, counting the requests.
+
+    Mostly a stand-in for remote readers in tests.
+    """
+
+    def __init__(self, data, name=None):
+        self._data = bytes(data)
+        self.name = name
+        self.requests = []
+
+    def size(self):
+        return len(self._data)
+
+    def read_at(self, offset, length):
+        self.requests.append((offset, length))
+        return self._data[offset:offset + length]
+
+
+class HTTPRangeReader(object):
+    """A range reader using HTTP range requests.
+
+    Works with any server (or S3-compatible object store) which supports
+    the Range header. headers get sent with every request, for example
+    for authentication.
+    """
+
+    def __init__(self, url, headers=None, timeout=30):
+        self.url = self.name = url
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self._size = None
+
+    def _open(self, method, headers):
+        if PY2:
+            from urllib2 import Request, urlopen
+        else:
+            from urllib.request import Request, urlopen
+
+        request = Request(self.url, headers=dict(self.headers, **headers))
+        request.get_method = lambda: method
+        return urlopen(request, timeout=self.timeout)
+
+    def size(self):
+        if self._size is None:
+            response = self._open("HEAD", {})
+            try:
+                length = response.info().get("Content-Length")
+            finally:
+                response.close()
+            if length is None:
+                raise IOError("no Content-Length for %r" % self.url)
+            self._size = int(length)
+        return self._size
+
+    def read_at(self, offset, length):
+        if length <= 0:
+            return b""
+        response = self._open("GET", {
+            "Range": "bytes=%d-%d" % (offset, offset + length - 1)})
+        try:
+            if response.getcode() != 206:
+                raise IOError("server ignored the range request for %r" %
+                              self.url)
+            return response.read()
+        finally:
+            response.close()
+
+
+class RangeFile(object):
+    """A read-only file object on top of a range reader.
+
+    The file is split into blocks of block_size bytes; a read fetches all
+    blocks it touches which aren't cached yet, adjacent missing blocks in
+    a single request. So small reads close to each other, like a parser
+    walking headers, cost one request, and the rest of the block acts as
+    read-ahead. Up to max_blocks blocks are kept, reads too large for the
+    cache go to the reader directly.
+
+    Attributes:
+
+    * reader -- the range reader
+    * requests -- number of read_at() calls made
+    * bytes_fetched -- number of bytes returned by them
+    """
+
+    def __init__(self, reader, block_size=64 * 1024, max_blocks=32):
+        if block_size < 1 or max_blocks < 1:
+            raise ValueError("block_size and max_blocks have to be positive")
+
+        self.reader = reader
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.requests = 0
+        self.bytes_fetched = 0
+        self._size = reader.size()
+        self._pos = 0
+        self._blocks = OrderedDict()
+        name = getattr(reader, "name", None)
+        if name is not None:
+            self.name = name
+
+    def _read_at(self, offset, length):
+        data = self.reader.read_at(offset, length)
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        if len(data) != length:
+            raise IOError("short read at %d: expected %d bytes, got %d" % (
+                offset, length, len(data)))
+        return data
+
+    def _fetch(self, first, last):
+        """Fetches blocks first to last (inclusive) in one request"""
+
+        size = self.block_size
+        offset = first * size
+        data = self._read_at(
+            offset, min((last + 1) * size, self._size) - offset)
+        for index in range(first, last + 1):
+            start = (index - first) * size
+            self._blocks[index] = data[start:start + size]
+
+    def read(self, size=-1):
+        start = self._pos
+        if size is None or size < 0:
+            end = self._size
+        else:
+            end = min(start + size, self._size)
+        if end <= start:
+            return b""
+        self._pos = end
+
+        block_size = self.block_size
+        first = start // block_size
+        last = (end - 1) // block_size
+        if last - first >= self.max_blocks:
+            return self._read_at(start, end - start)
+
+        blocks = self._blocks
+        missing = None
+        for index in range(first, last + 1):
+            if index in blocks:
+                # mark as recently used
+                blocks[index] = blocks.pop(index)
+                if missing is not None:
+                    self._fetch(missing, index - 1)
+                    missing = None
+            elif missing is None:
+                missing = index
+        if missing is not None:
+            self._fetch(missing, last)
+
+        data = b"".join([blocks[i] for i in range(first, last + 1)])
+        while len(blocks) > self.max_blocks:
+            blocks.popitem(last=False)
+
+        offset = first * block_size
+        return data[start - offset:end - offset]
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._size
+        if offset < 0:
+            raise IOError(errno.EINVAL, "Invalid argument")
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
@@ -3,7 +3,7 @@ from tempfile import mkstemp
 import shutil
 
 from tests import TestCase, add
-from mutagen._compat import cBytesIO, text_type
+from mutagen._compat import cBytesIO, BytesIO, text_type
 from mutagen import File, Metadata, FileType
 from mutagen.oggvorbis import OggVorbis
 from mutagen.oggflac import OggFLAC
@@ -239,13 +239,376 @@ class TFileUpperExt(TestCase):
 add(TFileUpperExt)
 
 
+class TFileObj(TestCase):
+    """Loading and saving through file objects and in-memory buffers"""
+
+    FILES = [
+        ("empty.ogg", OggVorbis), ("empty.oggflac", OggFLAC),
+        ("empty.spx", OggSpeex), ("sample.oggtheora", OggTheora),
+        ("example.opus", OggOpus), ("silence-44-s.flac", FLAC),
+        ("silence-44-s.mp3", MP3), ("has-tags.m4a", MP4),
+        ("silence-1.wma", ASF), ("click.mpc", Musepack),
+        ("silence-44-s.wv", WavPack), ("empty.tta", TrueAudio),
+        ("with-id3.aif", AIFF), ("mac-399.ape", MonkeysAudio),
+        ("empty.ofr", OptimFROG),
+    ]
+
+    def setUp(self):
+        self.files = []
+        for name, Kind in self.FILES:
+            with open(os.path.join("tests", "data", name), "rb") as h:
+                self.files.append((name, Kind, h.read()))
+
+    def test_load(self):
+        for name, Kind, data in self.files:
+            path = os.path.join("tests", "data", name)
+            expected = Kind(path).pprint()
+            for target in [BytesIO(data), data, bytearray(data),
+                           memoryview(data)]:
+                f = Kind(target)
+                self.failUnlessEqual(f.pprint(), expected, name)
+
+    def test_file_guess(self):
+        for name, Kind, data in self.files:
+            self.failUnless(isinstance(File(BytesIO(data)), Kind), name)
+            self.failUnless(isinstance(File(bytearray(data)), Kind), name)
+
+    def test_file_guess_uses_name(self):
+        path = os.path.join("tests", "data", "empty.ofr")
+        with open(path, "rb") as h:
+            self.failUnless(isinstance(File(h), OptimFROG))
+            self.failIf(h.closed)
+
+    def test_save_same_as_filename(self):
+        for name, Kind, data in self.files:
+            fd, path = mkstemp(suffix=os.path.splitext(name)[1])
+            try:
+                os.write(fd, data)
+                os.close(fd)
+                f = Kind(path)
+                if f.tags is None:
+                    f.add_tags()
+                f.save()
+                with open(path, "rb") as h:
+                    expected = h.read()
+            finally:
+                os.unlink(path)
+
+            buf = bytearray(data)
+            f = Kind(buf)
+            if f.tags is None:
+                f.add_tags()
+            f.save()
+            self.failUnlessEqual(bytes(buf), expected, name)
+
+            fileobj = BytesIO(data)
+            f = Kind(fileobj)
+            if f.tags is None:
+                f.add_tags()
+            f.save()
+            self.failIf(fileobj.closed)
+            self.failUnlessEqual(fileobj.getvalue(), expected, name)
+
+    def test_save_changes(self):
+        buf = bytearray(self.files[0][2])
+        f = OggVorbis(buf)
+        f["title"] = u"foo" * 1000
+        f.save()
+        self.failUnlessEqual(OggVorbis(buf)["title"], [u"foo" * 1000])
+
+    def test_delete_bytearray(self):
+        buf = bytearray(self.files[5][2])
+        FLAC(buf).delete()
+        self.failIf(FLAC(buf).tags)
+
+    def test_save_readonly_buffer(self):
+        for name, Kind, data in self.files:
+            f = Kind(data)
+            if f.tags is None:
+                f.add_tags()
+            self.failUnlessRaises(TypeError, f.save)
+
+add(TFileObj)
+
+
+class TMmap(TestCase):
+    """Loading through a memory map gives the same result"""
+
+    FILES = TFileObj.FILES
+
+    def test_load(self):
+        for name, Kind in self.FILES:
+            path = os.path.join("tests", "data", name)
+            expected = Kind(path).pprint()
+            f = Kind(path, mmap=True)
+            self.failUnlessEqual(f.pprint(), expected, name)
+            self.failUnlessEqual(f.filename, path)
+
+    def test_file_guess(self):
+        for name, Kind in self.FILES:
+            path = os.path.join("tests", "data", name)
+            f = File(path, mmap=True)
+            self.failUnless(isinstance(f, Kind), name)
+            self.failUnlessEqual(f.pprint(), Kind(path).pprint(), name)
+
+    def test_fallback(self):
+        for name, Kind in self.FILES:
+            with open(os.path.join("tests", "data", name), "rb") as h:
+                data = h.read()
+            expected = Kind(data).pprint()
+            self.failUnlessEqual(
+                Kind(BytesIO(data), mmap=True).pprint(), expected)
+            self.failUnlessEqual(
+                File(bytearray(data), mmap=True).pprint(), expected)
+
+    def test_empty_file(self):
+        from mutagen.mp3 import HeaderNotFoundError
+        path = os.path.join("tests", "data", "emptyfile.mp3")
+        self.failUnlessRaises(
+            HeaderNotFoundError, File, path, mmap=True)
+
+    def test_save(self):
+        fd, path = mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            shutil.copy(os.path.join("tests", "data", "silence-44-s.mp3"),
+                        path)
+            f = MP3(path, mmap=True)
+            f["TIT2"].text = [u"foo" * 1000]
+            f.save()
+            self.failUnlessEqual(MP3(path)["TIT2"], [u"foo" * 1000])
+        finally:
+            os.unlink(path)
+
+add(TMmap)
+
+
+class TLoadParts(TestCase):
+    """Loading only the tags or only the stream information"""
+
+    FILES = TFileObj.FILES + [("apev2-lyricsv2.mp3", MP3)]
+
+    def test_tags_only(self):
+        for name, Kind in self.FILES:
+            path = os.path.join("tests", "data", name)
+            full = Kind(path)
+            for f in [Kind(path, info=False), File(path, info=False)]:
+                self.failUnless(isinstance(f, Kind), name)
+                self.failUnless(f.info is None, name)
+                if full.tags is None:
+                    self.failUnless(f.tags is None, name)
+                else:
+                    self.failUnlessEqual(
+                        f.tags.pprint(), full.tags.pprint(), name)
+                f.pprint()
+
+    def test_info_only(self):
+        for name, Kind in self.FILES:
+            path = os.path.join("tests", "data", name)
+            full = Kind(path)
+            for f in [Kind(path, tags=False), File(path, tags=False)]:
+                self.failUnless(isinstance(f, Kind), name)
+                self.failUnless(f.tags is None, name)
+                self.failUnlessEqual(
+                    f.info.pprint(), full.info.pprint(), name)
+                self.failUnlessEqual(f.pprint().splitlines()[0],
+                                     full.pprint().splitlines()[0], name)
+
+    def test_nothing(self):
+        for name, Kind in self.FILES:
+            path = os.path.join("tests", "data", name)
+            f = Kind(path, tags=False, info=False)
+            self.failUnless(f.tags is None and f.info is None, name)
+
+    def test_no_save_without_tags(self):
+        for name, Kind in self.FILES:
+            with open(os.path.join("tests", "data", name), "rb") as h:
+                data = bytearray(h.read())
+            f = Kind(data, tags=False)
+            try:
+                f.add_tags()
+            except NotImplementedError:
+                pass
+            self.failUnlessRaises(ValueError, f.save)
+            self.failUnlessRaises(ValueError, f.delete)
+            with open(os.path.join("tests", "data", name), "rb") as h:
+                self.failUnlessEqual(bytes(data), h.read())
+
+    def test_save_without_info(self):
+        fd, path = mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            shutil.copy(os.path.join("tests", "data", "silence-44-s.mp3"),
+                        path)
+            f = MP3(path, info=False)
+            f["TIT2"].text = [u"foo"]
+            f.save()
+            self.failUnlessEqual(MP3(path)["TIT2"], [u"foo"])
+        finally:
+            os.unlink(path)
+
+add(TLoadParts)
+
+
+class TFileOpenOnce(TestCase):
+    """File() and the loaders should share a single open file"""
+
+    def setUp(self):
+        import mutagen._util
+        self.util = mutagen._util
+        self.opened = []
+
+        def counting_open(*args, **kwargs):
+            self.opened.append(args[0])
+            return open(*args, **kwargs)
+        self.util.open = counting_open
+
+    def tearDown(self):
+        del self.util.open
+
+    def test_file(self):
+        for name, Kind in TFileObj.FILES:
+            del self.opened[:]
+            path = os.path.join("tests", "data", name)
+            f = File(path)
+            self.failUnless(isinstance(f, Kind), name)
+            self.failUnlessEqual(self.opened, [path])
+            self.failUnlessEqual(f.filename, path)
+            if f.tags is not None and hasattr(f.tags, "filename"):
+                self.failUnlessEqual(f.tags.filename, path)
+
+    def test_easy(self):
+        path = os.path.join("tests", "data", "silence-44-s.mp3")
+        f = File(path, easy=True)
+        self.failUnless(isinstance(f, EasyMP3))
+        self.failUnlessEqual(self.opened, [path])
+        self.failUnlessEqual(f.tags.filename, path)
+
+    def test_loaders(self):
+        for name, Kind in TFileObj.FILES:
+            del self.opened[:]
+            path = os.path.join("tests", "data", name)
+            Kind(path)
+            self.failUnlessEqual(self.opened, [path])
+
+    def test_save_after_file(self):
+        fd, path = mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            shutil.copy(
+                os.path.join("tests", "data", "silence-44-s.mp3"), path)
+            f = File(path, easy=True)
+            f["title"] = u"foo"
+            f.save()
+            self.failUnlessEqual(File(path, easy=True)["title"], [u"foo"])
+        finally:
+            os.unlink(path)
+
+add(TFileOpenOnce)
+
+
+class TFileGuess(TestCase):
+    """The magic/extension dispatch must pick what full scoring picks"""
+
+    EXTENSIONS = ["", ".mp3", ".flac", ".tta", ".ape", ".mpc", ".aiff",
+                  ".ofr", ".ogg", ".m4a", ".txt"]
+
+    def test_same_as_full_scoring(self):
+        from mutagen import _default_options, _best_kind, _KINDS
+
+        data_dir = os.path.join("tests", "data")
+        for easy in [False, True]:
+            options = _default_options(easy)
+            kinds = dict(zip(_KINDS, options))
+            for name in sorted(os.listdir(data_dir)):
+                path = os.path.join(data_dir, name)
+                with open(path, "rb") as fileobj:
+                    header = fileobj.read(128)
+                    for ext in self.EXTENSIONS:
+                        fake = os.path.splitext(path)[0] + ext
+                        full = _best_kind(fake, fileobj, header, options)
+                        fast = _best_kind(
+                            fake, fileobj, header, options, kinds)
+                        if full[0][0] > 0:
+                            self.failUnlessEqual(full, fast, fake)
+                        else:
+                            self.failIf(fast[0][0] > 0, fake)
+
+    def test_ogg_codec_id(self):
+        from mutagen import _candidates
+
+        for name, Kind in [("empty.ogg", OggVorbis),
+                           ("empty.oggflac", OggFLAC),
+                           ("empty.spx", OggSpeex),
+                           ("sample.oggtheora", OggTheora),
+                           ("example.opus", OggOpus)]:
+            with open(os.path.join("tests", "data", name), "rb") as h:
+                header = h.read(128)
+            self.failUnlessEqual(_candidates("", header), [Kind.__name__])
+
+    def test_ogg_muxed(self):
+        from mutagen import _candidates, _default_options, _best_kind, _KINDS
+        from mutagen.ogg import OggPage
+
+        # a Theora stream muxed with Vorbis, both start pages in the header
+        pages = [OggPage(), OggPage()]
+        pages[0].packets = [b"\x80theora" + b"\x00" * 35]
+        pages[1].packets = [b"\x01vorbis" + b"\x00" * 23]
+        pages[1].serial = 1
+        for page in pages:
+            page.first = True
+        header = b"".join(page.write() for page in pages)[:128]
+        self.failUnlessEqual(
+            sorted(_candidates("", header)), ["OggTheora", "OggVorbis"])
+        options = _default_options(False)
+        kinds = dict(zip(_KINDS, options))
+        fileobj = cBytesIO(header)
+        self.failUnlessEqual(
+            _best_kind("", fileobj, header, options, kinds),
+            _best_kind("", fileobj, header, options))
+
+    def test_apev2_footer(self):
+        path = os.path.join("tests", "data", "oldtag.apev2")
+        self.failUnless(isinstance(File(path), APEv2File))
+
+    def test_imports_only_needed(self):
+        import subprocess
+        import sys
+
+        code = ("import sys, mutagen; mutagen.File(sys.argv[1]); "
+                "print(' '.join(m for m in sorted(sys.modules) "
+                "if m.startswith('mutagen.') and sys.modules[m]))")
+        for name, expected in [
+                ("empty.ogg", ["mutagen.ogg", "mutagen.oggvorbis"]),
+                ("silence-44-s.flac", ["mutagen.flac"]),
+                ("has-tags.m4a", ["mutagen.mp4"]),
+                ("silence-1.wma", ["mutagen.asf"])]:
+            path = os.path.join("tests", "data", name)
+            out = subprocess.Popen(
+                [sys.executable, "-c", code, path],
+                stdout=subprocess.PIPE).communicate()[0]
+            modules = out.decode("ascii").split()
+            for module in ["mutagen.id3", "mutagen.mp3", "mutagen.apev2",
+                           "mutagen.easyid3"]:
+                self.failIf(module in modules, (name, modules))
+            for module in expected:
+                self.failUnless(module in modules, (name, modules))
+
+add(TFileGuess)
+
+
 class TModuleImportAll(TestCase):
 
     def test_all(self):
         import mutagen
         files = os.listdir(mutagen.__path__[0])
-        modules = [os.path.splitext(f)[0] for f in files]
+        modules = set(os.path.splitext(f)[0] for f in files
+                      if f.endswith(".py"))
         modules = [f for f in modules if not f.startswith("_")]
+        try:
+            import asyncio
+        except ImportError:
+            modules.remove("aio")
 
         for module in modules:
             mod = getattr(__import__("mutagen." + module), module)
@@ -371,3 +371,44 @@ class TRVA2(TestCase):
         self.assertNotEqual(r, 42)
 
 add(TRVA2)
+
+
+class TFrameSlots(TestCase):
+
+    def test_no_dict(self):
+        from mutagen.id3 import APIC
+        data = APIC(encoding=0, mime="image/png", type=3, desc=u"d",
+                    data=b"\x00" * 100)._writeData()
+        frame = APIC.fromData(_24, 0, data)
+        self.failIf(hasattr(frame, "_rawdata"))
+        self.failIf(frame.__dict__)
+
+    def test_all_frames(self):
+        for kind in list(Frames.values()) + list(Frames_2_2.values()):
+            frame = kind()
+            self.failIf(frame.__dict__, kind)
+
+    def test_other_attributes(self):
+        from mutagen.id3 import Frame
+        frame = Frame()
+        frame.foo = 42
+        self.assertEqual(frame.foo, 42)
+
+    def test_pickle(self):
+        import pickle
+        from mutagen.id3 import TXXX, COMR
+
+        frames = [TXXX(encoding=3, desc=u"d", text=[u"a", u"b"]),
+                  TXXX.fromData(_24, 0, b"\x00d\x00a")]
+        frame = COMR(encoding=0, price="1", valid_until="19700101",
+                     contact="x", format=0, seller=u"s", desc=u"d")
+        frame.foo = 42
+        frames.append(frame)
+        for frame in frames:
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                other = pickle.loads(pickle.dumps(frame, protocol))
+                self.assertEqual(type(other), type(frame))
+                self.assertEqual(repr(other), repr(frame))
+                self.assertEqual(other.__dict__, frame.__dict__)
+
+add(TFrameSlots)
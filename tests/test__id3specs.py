@@ -228,6 +228,33 @@ class BitPaddedIntTest(TestCase):
         self.failIf(BitPaddedInt.has_valid_padding(0x9f << 32, bits=6))
         self.failUnless(BitPaddedInt.has_valid_padding(0x3f << 16, bits=6))
 
+    def test_to_int(self):
+        self.assertTrue(type(BitPaddedInt.to_int(b"\x00\x00\x01\x7f")) is int)
+        self.assertEquals(BitPaddedInt.to_int(b"\x00\x00\x01\x7f"), 0xff)
+        self.assertEquals(
+            BitPaddedInt.to_int(b"\x7f\x01\x00\x00", bigendian=False),
+            0xff)
+        self.assertEquals(BitPaddedInt.to_int(b"\x01\x02\x03\x04", bits=8),
+                          0x01020304)
+        self.assertEquals(BitPaddedInt.to_int(0x017f), 0xff)
+        self.assertEquals(BitPaddedInt.to_int(0x1ff, bits=8), 0x1ff)
+        self.assertEquals(BitPaddedInt.to_int(b"\x01\x7f"),
+                          BitPaddedInt(b"\x01\x7f"))
+
+    def test_to_int_negative(self):
+        self.assertRaises(ValueError, BitPaddedInt.to_int, -1)
+        self.assertRaises(ValueError, BitPaddedInt, -1)
+
+    def test_to_str_matches_generic(self):
+        for value in [0, 1, 0x7f, 0x80, 0xfffffff]:
+            self.assertEquals(
+                BitPaddedInt.to_str(value),
+                BitPaddedInt.to_str(value, width=-1, minwidth=4))
+            self.assertEquals(
+                BitPaddedInt.to_str(value, bits=8, bigendian=False),
+                BitPaddedInt.to_str(value, bits=8, bigendian=False,
+                                    width=-1, minwidth=4))
+
 add(BitPaddedIntTest)
 
 
@@ -249,4 +276,19 @@ class TestUnsynch(TestCase):
         self.assertRaises(ValueError, un.decode, b'\xff')
         self.assertEquals(b'\xff\x44', un.decode(b'\xff\x44'))
 
+    def test_unsync_roundtrip(self):
+        from mutagen.id3 import unsynch as un
+        for d in (b'\x00', b'\xe0\xff', b'a\xff\x00\xff', b'\xff\xe0a',
+                  b'\xfe\xff\xff\x00', bytearray(b'\xff\xff')):
+            self.assertEquals(d, un.decode(un.encode(d)))
+
+    def test_unsync_first_byte(self):
+        # the first byte gets handled like one following a 0xFF
+        from mutagen.id3 import unsynch as un
+        self.assertEquals(b'\x00\x00a', un.encode(b'\x00a'))
+        self.assertEquals(b'\x00\xe0', un.encode(b'\xe0'))
+        self.assertEquals(b'a', un.decode(b'\x00a'))
+        self.assertRaises(ValueError, un.decode, b'\xe0a')
+        self.assertRaises(ValueError, un.decode, b'')
+
 add(TestUnsynch)
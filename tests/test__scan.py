@@ -0,0 +1,87 @@
+import os
+import pickle
+
+from tests import TestCase, add
+from mutagen import scan, ScanResult, File
+from mutagen._scan import load_plain
+
+
+DATA = os.path.join("tests", "data")
+
+
+def load_fail(path):
+    raise ValueError("nope: %s" % path)
+
+
+class Tscan(TestCase):
+
+    FILES = [os.path.join(DATA, name) for name in
+             ["silence-44-s.mp3", "silence-44-s.flac", "has-tags.m4a",
+              "empty.ogg", "silence-1.wma", "emptyfile.mp3"]]
+
+    def test_in_process(self):
+        results = list(scan(self.FILES, workers=1))
+        self.failUnlessEqual([r.path for r in results], self.FILES)
+        mp3 = results[0]
+        self.failUnlessEqual(mp3.kind, "MP3")
+        self.failUnlessEqual(mp3.info["sample_rate"], 44100)
+        self.failUnlessEqual(mp3.tags["TIT2"], [u"Silence"])
+        self.failIf(mp3.error)
+
+    def test_error_captured(self):
+        result = list(scan(self.FILES, workers=1))[-1]
+        self.failUnless(result.kind is None)
+        self.failUnlessEqual(result.error[0], "HeaderNotFoundError")
+        self.failUnless("HeaderNotFoundError" in result.error[2])
+
+    def test_missing_file(self):
+        path = os.path.join(DATA, "doesnotexist")
+        result, = scan([path], workers=1)
+        self.failUnless(result.error)
+
+    def test_processes(self):
+        expected = [(r.path, r.kind, r.info, r.tags)
+                    for r in scan(self.FILES, workers=1)]
+        results = [(r.path, r.kind, r.info, r.tags)
+                   for r in scan(self.FILES, workers=2, chunksize=2)]
+        self.failUnlessEqual(results, expected)
+
+    def test_threads_unordered(self):
+        results = scan(self.FILES, workers=3, threads=True, ordered=False)
+        self.failUnlessEqual(
+            sorted(r.path for r in results), sorted(self.FILES))
+
+    def test_directory(self):
+        paths = [r.path for r in scan(DATA, workers=1, loader=load_fail)]
+        self.failUnlessEqual(len(paths), len(os.listdir(DATA)))
+        self.failUnless(os.path.join(DATA, "empty.ogg") in paths)
+
+    def test_loader(self):
+        for result in scan(self.FILES, workers=2, loader=load_fail):
+            self.failUnlessEqual(result.error[0], "ValueError")
+            self.failUnless(result.path in result.error[1])
+
+    def test_file_kwargs(self):
+        result, = scan(self.FILES[:1], workers=1, easy=True)
+        self.failUnlessEqual(result.kind, "EasyMP3")
+        self.failUnlessEqual(result.tags["title"], [u"Silence"])
+
+    def test_plain_types(self):
+        kind, info, tags = load_plain(os.path.join(DATA, "has-tags.m4a"))
+        self.failUnlessEqual(kind, "MP4")
+        f = File(os.path.join(DATA, "has-tags.m4a"))
+        self.failUnlessEqual(info["length"], f.info.length)
+        self.failUnlessEqual(
+            tags[b"covr"], [bytes(c) for c in f.tags[b"covr"]])
+        self.failUnless(type(tags[b"covr"][0]) is bytes)
+
+    def test_pickle(self):
+        result = ScanResult("foo", "MP3", {"length": 1.0}, {"a": [u"b"]})
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            other = pickle.loads(pickle.dumps(result, protocol))
+            self.failUnlessEqual(other.path, "foo")
+            self.failUnlessEqual(other.info, {"length": 1.0})
+            self.failUnlessEqual(other.tags, {"a": [u"b"]})
+            self.failUnless(other.error is None)
+
+add(Tscan)
@@ -1,8 +1,22 @@
 from mutagen._util import cdata, utf8, insert_bytes, delete_bytes
-from mutagen._util import decode_terminated
+from mutagen._util import write_changed, _insert_range, _collapse_range
+from mutagen._util import _move_range, _block_size
+from mutagen._util import decode_terminated, openfile, mmapfile
+from mutagen._util import save_target, _clone_file, FileThing
 from mutagen._compat import text_type, itervalues, iterkeys, iteritems, PY2
+from mutagen._compat import BytesIO
+from mutagen.id3 import ID3, TIT2
+from mutagen.flac import FLAC
+from mutagen.mp4 import MP4
+from mutagen.asf import ASF
+from mutagen.aiff import AIFF
+from mutagen.oggvorbis import OggVorbis
+from mutagen.wavpack import WavPack
 from tests import TestCase, add
 import random
+import os
+import shutil
+import tempfile
 
 class Tutf8(TestCase):
 
@@ -245,9 +259,397 @@ class FileHandling(TestCase):
             fobj.seek(0)
             self.failUnless(fobj.read() == data)
 
+    def check_insert(self, data, size, offset, insert=insert_bytes):
+        o = self.file(data)
+        insert(o, size, offset)
+        new = self.read(o)
+        self.assertEquals(len(new), len(data) + size)
+        self.assertEquals(new[:offset], data[:offset])
+        self.assertEquals(new[offset + size:], data[offset:])
+
+    def check_delete(self, data, size, offset, delete=delete_bytes):
+        o = self.file(data)
+        delete(o, size, offset)
+        self.assertEquals(data[:offset] + data[offset + size:], self.read(o))
+
+    def test_insert_delete_large(self):
+        # large enough for in-kernel copies where available
+        data = os.urandom(300000)
+        for size, offset in [(70001, 10), (70001, 0), (200000, 99999)]:
+            self.check_insert(data, size, offset)
+            self.check_delete(data, size, offset)
+
+    def test_insert_delete_aligned(self):
+        data = os.urandom(5 * 8192 + 123)
+        o = self.file(b"")
+        block = _block_size(o)
+        if not block or block > 8192:
+            return
+        for size, offset in [(block, 0), (2 * block, 1000),
+                             (block, 3 * block), (block, 3 * block + 1)]:
+            self.check_insert(data, size, offset)
+            self.check_delete(data, size, offset)
+
+    def test_insert_range(self):
+        data = os.urandom(4 * 8192 + 10)
+        o = self.file(data)
+        block = _block_size(o)
+        if not block or block > 8192 or not _insert_range(o, block, 0):
+            # not supported here
+            return
+        for offset in [0, 100, block, 2 * block - 1]:
+            self.check_insert(data, block, offset, _insert_range)
+            self.check_delete(data, block, offset, _collapse_range)
+        # only full blocks, and collapsing can't reach the end
+        self.failIf(_insert_range(self.file(data), block + 1, 0))
+        self.check_delete(data, block, len(data) - block, _collapse_range)
+        o = self.file(data[:4 * block])
+        self.failIf(_collapse_range(o, block, 3 * block))
+
+    def test_move_range(self):
+        data = os.urandom(1000)
+        o = self.file(data)
+        if not _move_range(o, 10, 0, 500, CHUNK_SIZE=7):
+            return
+        self.assertEquals(data[:10] + data[:500] + data[510:], self.read(o))
+        o = self.file(data)
+        _move_range(o, 0, 300, 700)
+        self.assertEquals(data[300:] + data[700:], self.read(o))
+
+    def test_write_changed(self):
+        o = self.file(b'abcdefghij')
+        self.assertEquals(write_changed(o, b'cdXfY', 2), 3)
+        self.assertEquals(b'abcdXfYhij', self.read(o))
+        self.assertEquals(write_changed(o, b'cdXfY', 2), 0)
+        self.assertEquals(write_changed(o, b'', 2), 0)
+
+    def test_write_changed_past_end(self):
+        o = self.file(b'abc')
+        self.assertEquals(write_changed(o, b'bcde', 1), 2)
+        self.assertEquals(b'abcde', self.read(o))
+
+    def test_write_changed_blocks(self):
+        data = b'x' * 100
+        o = self.file(data)
+        new = b'x' * 10 + b'y' + b'x' * 50 + b'yy' + b'x' * 37
+        self.assertEquals(write_changed(o, new, 0, BUFFER_SIZE=16), 3)
+        self.assertEquals(new, self.read(o))
+
 add(FileHandling)
 
 
+class Topenfile(TestCase):
+
+    def setUp(self):
+        import tempfile
+        fd, self.filename = tempfile.mkstemp()
+        os.write(fd, b"foobar")
+        os.close(fd)
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.unlink(self.filename)
+
+    def test_filename(self):
+        with openfile(self.filename) as fileobj:
+            self.failUnlessEqual(fileobj.read(), b"foobar")
+        self.failUnless(fileobj.closed)
+
+    def test_filename_write(self):
+        with openfile(self.filename, writable=True) as fileobj:
+            fileobj.write(b"quux")
+        with open(self.filename, "rb") as h:
+            self.failUnlessEqual(h.read(), b"quuxar")
+
+    def test_create(self):
+        os.unlink(self.filename)
+        self.failUnlessRaises(
+            IOError, openfile(self.filename, writable=True).__enter__)
+        with openfile(self.filename, writable=True, create=True) as fileobj:
+            fileobj.write(b"quux")
+        with open(self.filename, "rb") as h:
+            self.failUnlessEqual(h.read(), b"quux")
+
+    def test_fileobj(self):
+        with open(self.filename, "rb") as h:
+            h.read(3)
+            with openfile(h) as fileobj:
+                self.failUnless(fileobj is h)
+                self.failUnlessEqual(fileobj.read(), b"foobar")
+            self.failIf(h.closed)
+
+    def test_bytesio(self):
+        bio = BytesIO(b"foobar")
+        with openfile(bio, writable=True) as fileobj:
+            fileobj.seek(3)
+            fileobj.write(b"baz")
+        self.failIf(bio.closed)
+        self.failUnlessEqual(bio.getvalue(), b"foobaz")
+
+    def test_seek_before_start(self):
+        for target in [BytesIO(b"foobar"), bytearray(b"foobar")]:
+            with openfile(target) as fileobj:
+                self.failUnlessRaises(IOError, fileobj.seek, -7, 2)
+                fileobj.seek(-6, 2)
+                self.failUnlessEqual(fileobj.tell(), 0)
+                fileobj.seek(3)
+                self.failUnlessRaises(IOError, fileobj.seek, -4, 1)
+                self.failUnlessEqual(fileobj.tell(), 3)
+
+    def test_buffers(self):
+        for target in [b"foo\x00bar", bytearray(b"foo\x00bar"),
+                       memoryview(b"foo\x00bar")]:
+            with openfile(target) as fileobj:
+                self.failUnlessEqual(fileobj.read(), b"foo\x00bar")
+
+    def test_bytes_without_null_is_filename(self):
+        self.failUnlessRaises(
+            IOError, openfile(b"/dev/doesnotexist").__enter__)
+
+    def test_bytearray_write(self):
+        buf = bytearray(b"foobar")
+        with openfile(buf, writable=True) as fileobj:
+            fileobj.seek(0, 2)
+            fileobj.write(b"baz")
+        self.failUnlessEqual(buf, bytearray(b"foobarbaz"))
+
+    def test_bytearray_unchanged_on_error(self):
+        buf = bytearray(b"foobar")
+        try:
+            with openfile(buf, writable=True) as fileobj:
+                fileobj.truncate(0)
+                raise ValueError
+        except ValueError:
+            pass
+        self.failUnlessEqual(buf, bytearray(b"foobar"))
+
+    def test_readonly_buffers(self):
+        for target in [b"foo\x00bar", memoryview(b"foo\x00bar")]:
+            self.failUnlessRaises(
+                TypeError, openfile(target, writable=True).__enter__)
+
+add(Topenfile)
+
+
+class Tmmapfile(TestCase):
+
+    def setUp(self):
+        import tempfile
+        fd, self.filename = tempfile.mkstemp()
+        os.write(fd, b"foobar")
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.filename)
+
+    def test_read(self):
+        with open(self.filename, "rb") as h:
+            # the file itself if mapping fails, which has to read the same
+            with mmapfile(h) as fileobj:
+                self.failUnlessEqual(fileobj.name, self.filename)
+                self.failUnlessEqual(fileobj.read(2), b"fo")
+                self.failUnlessEqual(fileobj.tell(), 2)
+                self.failUnlessEqual(fileobj.read(), b"obar")
+                self.failUnlessEqual(fileobj.read(1), b"")
+                self.failUnlessEqual(fileobj.tell(), 6)
+
+    def test_seek(self):
+        with open(self.filename, "rb") as h:
+            with mmapfile(h) as fileobj:
+                fileobj.seek(-2, 2)
+                self.failUnlessEqual(fileobj.read(), b"ar")
+                fileobj.seek(-3, 1)
+                self.failUnlessEqual(fileobj.read(1), b"b")
+                fileobj.seek(10)
+                self.failUnlessEqual(fileobj.read(), b"")
+                self.failUnlessEqual(fileobj.tell(), 10)
+                self.failUnlessRaises(IOError, fileobj.seek, -7, 2)
+                self.failUnlessRaises(IOError, fileobj.seek, -11, 1)
+
+    def test_fallback(self):
+        fileobj = BytesIO(b"foo")
+        with mmapfile(fileobj) as result:
+            self.failUnless(result is fileobj)
+
+        with open(self.filename, "wb"):
+            pass
+        with open(self.filename, "rb") as h:
+            with mmapfile(h) as result:
+                self.failUnless(result is h)
+
+add(Tmmapfile)
+
+
+class Tsave_target(TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.dirname = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dirname, "file")
+        with open(self.filename, "wb") as h:
+            h.write(b"foobar")
+        os.chmod(self.filename, 0o640)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.dirname)
+
+    def read(self):
+        with open(self.filename, "rb") as h:
+            return h.read()
+
+    def test_inplace(self):
+        with save_target(self.filename) as target:
+            self.failUnless(target is self.filename)
+        fileobj = BytesIO()
+        with save_target(fileobj, "inplace") as target:
+            self.failUnless(target is fileobj)
+
+    def test_rewrite(self):
+        with save_target(self.filename, "rewrite") as target:
+            self.failIfEqual(target, self.filename)
+            self.failUnlessEqual(
+                os.path.dirname(target), os.path.dirname(self.filename))
+            with openfile(target, writable=True) as fileobj:
+                self.failUnlessEqual(fileobj.read(), b"foobar")
+                fileobj.seek(0)
+                fileobj.write(b"quux")
+            self.failUnlessEqual(self.read(), b"foobar")
+        self.failUnlessEqual(self.read(), b"quuxar")
+        self.failUnlessEqual(os.stat(self.filename).st_mode & 0o777, 0o640)
+        self.failUnlessEqual(os.listdir(self.dirname), ["file"])
+
+    def test_rewrite_error(self):
+        try:
+            with save_target(self.filename, "rewrite") as target:
+                with open(target, "wb") as h:
+                    h.write(b"quux")
+                raise IOError
+        except IOError:
+            pass
+        self.failUnlessEqual(self.read(), b"foobar")
+        self.failUnlessEqual(os.listdir(self.dirname), ["file"])
+
+    def test_rewrite_filething(self):
+        with open(self.filename, "rb") as h:
+            thing = FileThing(h, self.filename)
+            with save_target(thing, "rewrite") as target:
+                with open(target, "wb") as h:
+                    h.write(b"quux")
+        self.failUnlessEqual(self.read(), b"quux")
+
+    def test_rewrite_symlink(self):
+        if not hasattr(os, "symlink"):
+            return
+        link = os.path.join(self.dirname, "link")
+        os.symlink(self.filename, link)
+        with save_target(link, "rewrite") as target:
+            with open(target, "wb") as h:
+                h.write(b"quux")
+        self.failUnless(os.path.islink(link))
+        self.failUnlessEqual(self.read(), b"quux")
+
+    def test_invalid(self):
+        for target in [BytesIO(b"foo"), bytearray(b"foo"), None]:
+            self.failUnlessRaises(
+                ValueError, save_target(target, "rewrite").__enter__)
+        self.failUnlessRaises(
+            ValueError, save_target(self.filename, "foo").__enter__)
+        self.failUnlessRaises(
+            EnvironmentError,
+            save_target(self.filename + "x", "rewrite").__enter__)
+        self.failUnlessEqual(os.listdir(self.dirname), ["file"])
+
+    def test_clone_file(self):
+        data = os.urandom(100000)
+        src = BytesIO(data)
+        dest = BytesIO()
+        _clone_file(src, dest, BUFFER_SIZE=1000)
+        self.failUnlessEqual(dest.getvalue(), data)
+
+        with open(self.filename, "wb") as h:
+            h.write(data)
+        copy = os.path.join(self.dirname, "copy")
+        with open(self.filename, "rb") as src:
+            with open(copy, "wb") as dest:
+                _clone_file(src, dest)
+                dest.write(b"end")
+        with open(copy, "rb") as h:
+            self.failUnlessEqual(h.read(), data + b"end")
+
+add(Tsave_target)
+
+
+class TSaveStrategy(TestCase):
+    """Saves each format in place and with strategy="rewrite" and
+    compares the results.
+    """
+
+    FILES = [
+        ("silence-44-s.mp3", ID3, "TIT2", TIT2(encoding=3, text=[u"a"])),
+        ("with-id3.aif", AIFF, "TIT2", TIT2(encoding=3, text=[u"a"])),
+        ("silence-44-s.flac", FLAC, "title", [u"a" * 5000]),
+        ("has-tags.m4a", MP4, b"\xa9nam", [u"a" * 5000]),
+        ("silence-1.wma", ASF, "Title", [u"a" * 5000]),
+        ("empty.ogg", OggVorbis, "title", [u"a" * 5000]),
+        ("silence-44-s.wv", WavPack, "Title", u"a"),
+    ]
+
+    def setUp(self):
+        self.files = []
+
+    def tearDown(self):
+        for filename in self.files:
+            os.unlink(filename)
+
+    def copy(self, name):
+        fd, filename = tempfile.mkstemp(suffix=os.path.splitext(name)[-1])
+        os.close(fd)
+        shutil.copy(os.path.join("tests", "data", name), filename)
+        self.files.append(filename)
+        return filename
+
+    def read(self, filename):
+        with open(filename, "rb") as h:
+            return h.read()
+
+    def test_rewrite(self):
+        for name, kind, key, value in self.FILES:
+            inplace = self.copy(name)
+            rewrite = self.copy(name)
+            for filename, strategy in [(inplace, "inplace"),
+                                       (rewrite, "rewrite")]:
+                f = kind(filename)
+                f[key] = value
+                f.save(strategy=strategy)
+                # saving again from the same object keeps working
+                f.save(strategy=strategy)
+            self.failUnlessEqual(self.read(inplace), self.read(rewrite))
+            self.failIfEqual(self.read(rewrite),
+                             self.read(os.path.join("tests", "data", name)))
+
+    def test_replaces_file(self):
+        filename = self.copy("silence-44-s.flac")
+        f = FLAC(filename)
+        inode = os.stat(filename).st_ino
+        f.save(strategy="rewrite")
+        self.failIfEqual(os.stat(filename).st_ino, inode)
+        dirname, basename = os.path.split(filename)
+        temp = [n for n in os.listdir(dirname)
+                if n.startswith("." + basename)]
+        self.failIf(temp)
+
+    def test_invalid(self):
+        filename = self.copy("silence-44-s.flac")
+        f = FLAC(filename)
+        self.failUnlessRaises(ValueError, f.save, strategy="foo")
+        with open(filename, "rb+") as h:
+            self.failUnlessRaises(
+                ValueError, FLAC(h).save, strategy="rewrite")
+
+add(TSaveStrategy)
+
+
 class Tdecode_terminated(TestCase):
 
     def test_all(self):
@@ -263,6 +665,15 @@ class Tdecode_terminated(TestCase):
                 self.assertEqual(dec, v)
             self.assertEqual(data, b"")
 
+    def test_utf16_unaligned_null(self):
+        # b"\x00\x00" at an odd offset isn't a terminator
+        data = u"a\u0100".encode("utf-16-le") + b"\x00\x00rest"
+        self.assertEqual(decode_terminated(data, "utf-16-le"),
+                         (u"a\u0100", b"rest"))
+        data = u"\u0100\x01".encode("utf-16-be") + b"\x00\x00"
+        self.assertEqual(decode_terminated(data, "utf-16-be"),
+                         (u"\u0100\x01", b""))
+
     def test_invalid(self):
         # invalid
         self.assertRaises(
@@ -270,6 +681,10 @@ class Tdecode_terminated(TestCase):
         # truncated
         self.assertRaises(
             UnicodeDecodeError, decode_terminated, b"\xff\xfe\x00", "utf-16")
+        # utf-16 without BOM
+        self.assertRaises(
+            UnicodeError, decode_terminated, b"a\x00b\x00\x00\x00x",
+            "utf-16")
         # not null terminated
         self.assertRaises(ValueError, decode_terminated, b"abc", "utf-8")
         # invalid encoding
@@ -0,0 +1,145 @@
+import os
+import shutil
+from tempfile import mkstemp
+from tests import TestCase, add
+from mutagen.mp3 import MP3
+
+try:
+    import asyncio
+    from concurrent import futures
+    from mutagen import aio
+except ImportError:
+    aio = None
+
+
+DATA = os.path.join("tests", "data")
+
+
+class TAio(TestCase):
+
+    FILES = [os.path.join(DATA, name) for name in
+             ["silence-44-s.mp3", "silence-44-s.flac", "has-tags.m4a",
+              "empty.ogg", "silence-1.wma", "emptyfile.mp3"]]
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.executor = futures.ThreadPoolExecutor(2)
+
+    def tearDown(self):
+        # let jobs still running finish before the loop goes away
+        self.executor.shutdown()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def run_future(self, func, *args, **kwargs):
+        return self.loop.run_until_complete(func(*args, **kwargs))
+
+    def collect(self, it):
+        results = []
+        while True:
+            try:
+                results.append(self.run_future(it.__anext__))
+            except StopAsyncIteration:
+                return results
+
+    def test_load(self):
+        f = self.run_future(aio.load, self.FILES[0])
+        self.failUnless(isinstance(f, MP3))
+        self.failUnlessEqual(f["TIT2"], [u"Silence"])
+
+    def test_load_kind(self):
+        f = self.run_future(aio.load, self.FILES[0], MP3)
+        self.failUnless(isinstance(f, MP3))
+        self.failUnless(self.run_future(aio.load, self.FILES[2]))
+
+    def test_load_kwargs(self):
+        f = self.run_future(aio.load, self.FILES[0], easy=True)
+        self.failUnlessEqual(f["title"], [u"Silence"])
+
+    def test_load_error(self):
+        self.failUnlessRaises(
+            Exception, self.run_future, aio.load, self.FILES[-1], MP3)
+
+    def test_save_delete(self):
+        fd, filename = mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            shutil.copy(self.FILES[0], filename)
+            f = self.run_future(aio.load, filename)
+            f["TIT2"].text = [u"Foo"]
+            self.run_future(aio.save, f)
+            self.failUnlessEqual(MP3(filename)["TIT2"], [u"Foo"])
+            self.run_future(aio.delete, f)
+            self.failUnless(MP3(filename).tags is None)
+        finally:
+            os.unlink(filename)
+
+    def test_executor(self):
+        f = self.run_future(aio.load, self.FILES[0], executor=self.executor)
+        self.failUnless(isinstance(f, MP3))
+
+    def test_scan(self):
+        results = self.collect(aio.scan(self.FILES, limit=2))
+        self.failUnlessEqual([r.path for r in results], self.FILES)
+        self.failUnlessEqual(results[0].kind, "MP3")
+        self.failUnlessEqual(results[-1].error[0], "HeaderNotFoundError")
+
+    def test_scan_unordered(self):
+        results = self.collect(aio.scan(self.FILES, limit=3, ordered=False))
+        self.failUnlessEqual(
+            sorted(r.path for r in results), sorted(self.FILES))
+
+    def test_scan_window(self):
+        it = aio.scan(self.FILES, limit=2, executor=self.executor)
+        for i in range(3):
+            self.run_future(it.__anext__)
+            # at most limit files queued, and less than another limit of
+            # paths taken ahead
+            self.failUnless(len(it._pending) <= 2)
+            self.failUnless(len(it._next_paths) < 4)
+
+    def test_scan_walk_in_executor(self):
+        import threading
+        threads = []
+
+        def paths():
+            for path in self.FILES:
+                threads.append(threading.current_thread())
+                yield path
+
+        results = self.collect(aio.scan(paths(), limit=2))
+        self.failUnlessEqual([r.path for r in results], self.FILES)
+        self.failIf(threading.current_thread() in threads)
+
+    def test_scan_dir(self):
+        results = self.collect(aio.scan([DATA], limit=3))
+        self.failUnlessEqual(
+            [r.path for r in results],
+            [os.path.join(DATA, name) for name in sorted(os.listdir(DATA))])
+
+    def test_scan_paths_error(self):
+        def paths():
+            yield self.FILES[0]
+            raise ValueError
+
+        it = aio.scan(paths(), limit=1)
+        self.failUnlessEqual(self.run_future(it.__anext__).path, self.FILES[0])
+        self.failUnlessRaises(ValueError, self.run_future, it.__anext__)
+        self.failUnlessRaises(
+            StopAsyncIteration, self.run_future, it.__anext__)
+
+    def test_scan_close(self):
+        it = aio.scan(self.FILES, limit=4, executor=self.executor)
+        self.run_future(it.__anext__)
+        pending = list(it._pending)
+        self.run_future(it.aclose)
+        self.failUnless(all(f.done() for f in pending))
+        self.failUnlessRaises(
+            StopAsyncIteration, self.run_future, it.__anext__)
+
+    def test_scan_limit(self):
+        self.failUnlessRaises(ValueError, aio.scan, self.FILES, limit=0)
+
+if aio is not None:
+    add(TAio)
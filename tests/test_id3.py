@@ -5,6 +5,7 @@ from tests import add
 from mutagen import id3
 from mutagen.id3 import ID3, COMR, Frames, Frames_2_2, ID3Warning, ID3JunkFrameError
 from mutagen._compat import cBytesIO, PY2, iteritems, integer_types, ord_, chr_
+from mutagen._compat import BytesIO
 import warnings
 warnings.simplefilter('error', ID3Warning)
 
@@ -966,6 +967,11 @@ class BrokenDiscarded(TestCase):
         from mutagen.id3 import TPE1, ID3JunkFrameError
         self.assertRaises(ID3JunkFrameError, TPE1.fromData, _24, 0x00, b'')
 
+    def test_utf16_without_bom(self):
+        from mutagen.id3 import TIT2, ID3JunkFrameError
+        data = b'\x01a\x00b\x00'
+        self.assertRaises(ID3JunkFrameError, TIT2.fromData, _24, 0x00, data)
+
     def test_wacky_truncated_RVA2(self):
         from mutagen.id3 import RVA2, ID3JunkFrameError
         data = b'\x01{\xf0\x10\xff\xff\x00'
@@ -1221,6 +1227,14 @@ class WriteRoundtrip(TestCase):
         ID3(self.newsilence).delete()
         self.assertEquals(open(self.newsilence, "rb").read(10), b'abc')
 
+    def test_delete_short_file(self):
+        f = open(self.newsilence, 'wb')
+        f.write(b'ID3')
+        f.close()
+        id3 = ID3()
+        id3.delete(self.newsilence)
+        self.assertEquals(open(self.newsilence, "rb").read(), b'ID3')
+
     def test_frame_order(self):
         from mutagen.id3 import TIT2, APIC, TALB, COMM
         f = ID3(self.newsilence)
@@ -1504,6 +1518,335 @@ class WriteTo23(TestCase):
         self.assertEqual(id3["TIPL"].encoding, 1)
 
 
+class TFrameFilter(TestCase):
+
+    def setUp(self):
+        from tempfile import mkstemp
+        fd, self.filename = mkstemp(suffix='.mp3')
+        os.close(fd)
+        shutil.copy(join('tests', 'data', 'silence-44-s.mp3'), self.filename)
+        tags = ID3(self.filename)
+        tags.add(id3.APIC(encoding=0, mime="image/png", type=3, desc=u"",
+                          data=b"\x00" * 10000))
+        tags.add(id3.PRIV(owner="foo", data=b"bar"))
+        tags.unknown_frames.append(b"XXXX\x00\x00\x00\x01\x00\x00Z")
+        tags.save()
+
+    def tearDown(self):
+        os.unlink(self.filename)
+
+    def test_only(self):
+        tags = ID3(self.filename, only={"TIT2", "TPE1"})
+        self.failUnlessEqual(sorted(tags.keys()), ["TIT2", "TPE1"])
+        self.failUnlessEqual(tags["TIT2"], ID3(self.filename)["TIT2"])
+        self.failIf(tags.unknown_frames)
+        tags = ID3(self.filename, only={"XXXX"})
+        self.failIf(tags.keys())
+        self.failUnlessEqual(len(tags.unknown_frames), 1)
+
+    def test_skip(self):
+        full = ID3(self.filename)
+        self.failUnlessEqual(len(full.unknown_frames), 1)
+        tags = ID3(self.filename, skip={"APIC", "PRIV", "XXXX"})
+        self.failUnlessEqual(
+            sorted(tags.keys()),
+            sorted(k for k in full.keys() if k[:4] not in ("APIC", "PRIV")))
+        self.failIf(tags.unknown_frames)
+
+    def test_skipped_not_parsed(self):
+        def fail(*args, **kwargs):
+            raise AssertionError("APIC got parsed")
+        id3.APIC.fromData = classmethod(fail)
+        try:
+            ID3(self.filename, skip={"APIC"})
+            ID3(self.filename, only={"TIT2"})
+            self.failUnlessRaises(AssertionError, ID3, self.filename)
+        finally:
+            del id3.APIC.fromData
+
+    def test_only_and_skip(self):
+        tags = ID3(self.filename, only={"TIT2", "TPE1"}, skip={"TPE1"})
+        self.failUnlessEqual(list(tags.keys()), ["TIT2"])
+
+    def test_empty_skip(self):
+        tags = ID3(self.filename, skip=set())
+        self.failUnlessEqual(len(tags.keys()), len(ID3(self.filename).keys()))
+        tags.save()
+
+    def test_no_save(self):
+        tags = ID3(self.filename, skip={"APIC"})
+        self.failUnlessRaises(ValueError, tags.save)
+        self.failUnless("APIC:" in ID3(self.filename))
+
+    def test_no_save_aiff(self):
+        from mutagen.aiff import AIFF
+        from tempfile import mkstemp
+        fd, filename = mkstemp(suffix='.aif')
+        os.close(fd)
+        try:
+            shutil.copy(join('tests', 'data', 'with-id3.aif'), filename)
+            f = AIFF(filename)
+            f.tags.add(id3.TPE1(encoding=3, text=[u"artist"]))
+            f.tags.add(id3.TALB(encoding=3, text=[u"album"]))
+            f.save()
+            keys = sorted(AIFF(filename).tags.keys())
+            f = AIFF(filename, only={"TIT2"})
+            self.failUnlessRaises(ValueError, f.save)
+            f = AIFF(filename, skip={"TALB"})
+            self.failUnlessRaises(ValueError, f.save)
+            self.failUnlessEqual(sorted(AIFF(filename).tags.keys()), keys)
+        finally:
+            os.unlink(filename)
+
+    def test_v22(self):
+        path = join('tests', 'data', 'id3v22-test.mp3')
+        tags = ID3(path, only={"TIT2"})
+        self.failUnlessEqual(list(tags.keys()), ["TIT2"])
+        tags = ID3(path, only={"TT2"})
+        self.failUnlessEqual(list(tags.keys()), ["TIT2"])
+        tags = ID3(path, skip={"COMM"})
+        self.failIf([k for k in tags.keys() if k.startswith("COMM")])
+
+    def test_v1(self):
+        path = join('tests', 'data', 'silence-44-s-v1.mp3')
+        tags = ID3(path, only={"TIT2"})
+        self.failUnlessEqual(list(tags.keys()), ["TIT2"])
+
+    def test_file_type(self):
+        from mutagen.mp3 import MP3, EasyMP3
+        f = MP3(self.filename, only={"TIT2"})
+        self.failUnlessEqual(list(f.keys()), ["TIT2"])
+        self.failUnlessRaises(ValueError, f.save)
+        f = EasyMP3(self.filename, skip={"TPE1"})
+        self.failUnless("title" in f)
+        self.failIf("artist" in f)
+
+class TLazyFrames(TestCase):
+
+    def setUp(self):
+        from tempfile import mkstemp
+        fd, self.filename = mkstemp(suffix='.mp3')
+        os.close(fd)
+        shutil.copy(join('tests', 'data', 'silence-44-s.mp3'), self.filename)
+        tags = ID3(self.filename)
+        tags.add(id3.APIC(encoding=3, mime="image/png", type=3, desc=u"cover",
+                          data=b"\x00" * 10000))
+        tags.add(id3.TXXX(encoding=3, desc=u"foo", text=[u"bar"]))
+        tags.add(id3.TXXX(encoding=3, desc=u"quux", text=[u"baz"]))
+        tags.add(id3.PRIV(owner="foo", data=b"bar"))
+        tags.save()
+        self.decoded = []
+
+    def tearDown(self):
+        os.unlink(self.filename)
+
+    def count_decodes(self, cls):
+        decoded = self.decoded
+        orig = cls.__dict__.get("fromData")
+
+        def fromData(kind, id3, tflags, data):
+            decoded.append(kind.__name__)
+            return super(cls, kind).fromData(id3, tflags, data)
+        cls.fromData = classmethod(fromData)
+        self.addCleanup(delattr, cls, "fromData")
+        self.failIf(orig)
+
+    def read(self):
+        with open(self.filename, "rb") as h:
+            return h.read()
+
+    def test_same_content(self):
+        full = ID3(self.filename)
+        tags = ID3(self.filename, lazy=True)
+        self.failUnlessEqual(list(tags.keys()), list(full.keys()))
+        self.failUnlessEqual(tags.pprint(), full.pprint())
+        self.failUnlessEqual(tags["APIC:cover"], full["APIC:cover"])
+
+    def test_decode_on_access(self):
+        self.count_decodes(id3.APIC)
+        self.count_decodes(id3.TXXX)
+        tags = ID3(self.filename, lazy=True)
+        self.failUnless("APIC:cover" in list(tags.keys()))
+        self.failIf(self.decoded)
+        self.failUnlessEqual(tags["TXXX:foo"], [u"bar"])
+        self.failUnlessEqual(self.decoded, ["TXXX"])
+        tags["TXXX:foo"]
+        self.failUnlessEqual(self.decoded, ["TXXX"])
+        self.failUnlessEqual(len(tags.getall("TXXX")), 2)
+        self.failUnlessEqual(self.decoded, ["TXXX", "TXXX"])
+
+    def test_untouched_roundtrip(self):
+        self.count_decodes(id3.APIC)
+        before = self.read()
+        tags = ID3(self.filename, lazy=True)
+        tags.save()
+        self.failIf(self.decoded)
+        self.failUnlessEqual(self.read(), before)
+
+    def test_changed_roundtrip(self):
+        tags = ID3(self.filename, lazy=True)
+        tags["TXXX:foo"].text = [u"changed"]
+        del tags["PRIV:foo:bar"]
+        tags.save()
+        full = ID3(self.filename)
+        self.failUnlessEqual(full["TXXX:foo"], [u"changed"])
+        self.failIf("PRIV:foo:bar" in full)
+        self.failUnlessEqual(full["APIC:cover"].data, b"\x00" * 10000)
+
+    def test_save_v23(self):
+        tags = ID3(self.filename, lazy=True)
+        tags.update_to_v23()
+        tags.save(v2_version=3)
+        tags = ID3(self.filename, lazy=True)
+        self.failUnlessEqual(tags.version, (2, 3, 0))
+        self.failUnlessEqual(tags["TXXX:quux"], [u"baz"])
+        # v2.3 payloads are valid in v2.4, written without decoding
+        self.count_decodes(id3.APIC)
+        tags = ID3(self.filename, lazy=True)
+        tags.save()
+        self.failIf(self.decoded)
+        self.failUnlessEqual(ID3(self.filename).pprint(), tags.pprint())
+
+    def test_v22(self):
+        path = join('tests', 'data', 'id3v22-test.mp3')
+        tags = ID3(path, lazy=True)
+        self.failUnlessEqual(tags.pprint(), ID3(path).pprint())
+
+    def test_empty_frames(self):
+        # has frames with just the encoding byte, which get dropped
+        path = join('tests', 'data', 'vbri.mp3')
+        tags = ID3(path, lazy=True)
+        self.failUnlessEqual(tags.pprint(), ID3(path).pprint())
+
+    def test_junk(self):
+        tags = ID3(self.filename)
+        tags.add(id3.TXXX(encoding=3, desc=u"junk", text=[u"x"]))
+        tags.save()
+        # make the text invalid utf-8
+        data = self.read().replace(b"\x03junk\x00x", b"\x03junk\x00\xff")
+        with open(self.filename, "wb") as h:
+            h.write(data)
+        full = ID3(self.filename)
+        self.failIf("TXXX:junk" in full)
+        # dropped on access, like when loading without lazy
+        tags = ID3(self.filename, lazy=True)
+        self.failUnless("TXXX:junk" in list(tags.keys()))
+        self.failIf("TXXX:junk" in tags)
+        self.failIf("TXXX:junk" in list(tags.keys()))
+        self.failUnlessRaises(KeyError, tags.__getitem__, "TXXX:junk")
+        tags = ID3(self.filename, lazy=True)
+        self.failUnlessEqual(len(tags.getall("TXXX")), 2)
+        tags = ID3(self.filename, lazy=True)
+        self.failUnlessEqual(tags.pprint(), full.pprint())
+        self.failUnlessEqual(len(tags.values()), len(full.values()))
+        self.failUnlessEqual(sorted(tags.keys()), sorted(full.keys()))
+
+    def test_junk_save_v23(self):
+        shutil.copy(join('tests', 'data', 'bad-POPM-frame.mp3'),
+                    self.filename)
+        ID3(self.filename, lazy=True).save(v2_version=3)
+        lazy = ID3(self.filename).pprint()
+        shutil.copy(join('tests', 'data', 'bad-POPM-frame.mp3'),
+                    self.filename)
+        ID3(self.filename).save(v2_version=3)
+        self.failUnlessEqual(lazy, ID3(self.filename).pprint())
+
+    def test_junk_same_key(self):
+        from mutagen.id3 import BitPaddedInt
+
+        def frame(name, data):
+            return name + BitPaddedInt.to_str(len(data)) + b"\x00\x00" + data
+
+        frames = [frame(b"TXXX", b"\x03foo\x00bar"),
+                  frame(b"TXXX", b"\x03foo\x00\xff"),
+                  frame(b"TXXX", b"\x03quux\x00\xff"),
+                  frame(b"TXXX", b"\x03quux\x00baz")]
+        data = b"".join(frames)
+        data = b"ID3\x04\x00\x00" + BitPaddedInt.to_str(len(data)) + data
+        full = ID3(BytesIO(data))
+        tags = ID3(BytesIO(data), lazy=True)
+        self.failUnlessEqual(tags["TXXX:foo"], [u"bar"])
+        self.failUnlessEqual(tags["TXXX:quux"], [u"baz"])
+        self.failUnlessEqual(tags.pprint(), full.pprint())
+
+    def record_writes(self):
+        writes = []
+        fileobj = BytesIO(self.read())
+        write = fileobj.write
+
+        def record(data):
+            writes.append((fileobj.tell(), len(data)))
+            return write(data)
+        fileobj.write = record
+        return fileobj, writes
+
+    def test_save_in_place(self):
+        fileobj, writes = self.record_writes()
+        tags = ID3(fileobj, lazy=True)
+        tags["TXXX:foo"].text = [u"baz"]
+        tags.save()
+        self.failUnlessEqual(len(writes), 1)
+        self.failUnlessEqual(writes[0][1], 1)
+        tags = ID3(fileobj)
+        self.failUnlessEqual(tags["TXXX:foo"], [u"baz"])
+        self.failUnlessEqual(tags["APIC:cover"].data, b"\x00" * 10000)
+
+    def test_save_in_place_unchanged(self):
+        fileobj, writes = self.record_writes()
+        before = fileobj.getvalue()
+        self.count_decodes(id3.APIC)
+        ID3(fileobj, lazy=True).save()
+        ID3(fileobj).save()
+        self.failIf(writes)
+        self.failUnlessEqual(fileobj.getvalue(), before)
+
+    def test_save_in_place_moved(self):
+        fileobj, writes = self.record_writes()
+        tags = ID3(fileobj, lazy=True)
+        tags["TIT2"].text = [u"A longer title"]
+        tags.save()
+        # the frames after TIT2 moved, the second save only writes the
+        # changed byte of TXXX
+        tags["TXXX:foo"].text = [u"baz"]
+        del writes[:]
+        tags.save()
+        self.failUnlessEqual(writes[0][1], 1)
+        full = ID3(fileobj)
+        self.failUnlessEqual(full["TIT2"], [u"A longer title"])
+        self.failUnlessEqual(full["TXXX:foo"], [u"baz"])
+        self.failUnlessEqual(full["APIC:cover"].data, b"\x00" * 10000)
+
+    def test_save_in_place_stale(self):
+        fileobj, writes = self.record_writes()
+        tags = ID3(fileobj, lazy=True)
+        other = ID3(fileobj)
+        other.delall("TIT2")
+        other.save()
+        # tags has the old layout, nothing may be skipped
+        tags.save()
+        full = ID3(fileobj)
+        self.failUnlessEqual(full.pprint(), tags.pprint())
+        self.failUnlessEqual(full["APIC:cover"].data, b"\x00" * 10000)
+
+    def test_save_in_place_overwritten(self):
+        fileobj, writes = self.record_writes()
+        tags = ID3(fileobj, lazy=True)
+        other = ID3(fileobj)
+        other["TIT2"].text = [u"X" + other["TIT2"].text[0][1:]]
+        other.save()
+        # same layout, but the payload on disk isn't the one loaded
+        tags.save()
+        self.failUnlessEqual(ID3(fileobj)["TIT2"], [u"Silence"])
+
+    def test_file_type(self):
+        from mutagen.mp3 import MP3
+        self.count_decodes(id3.APIC)
+        f = MP3(self.filename, lazy=True)
+        self.failUnlessEqual(f["TXXX:foo"], [u"bar"])
+        self.failIf(self.decoded)
+
+add(TLazyFrames)
+add(TFrameFilter)
 add(ID3Loading)
 add(ID3GetSetDel)
 add(ID3Tags)
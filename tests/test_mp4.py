@@ -664,7 +664,7 @@ class TMP4UpdateParents64Bit(TestCase):
             self.assertEqual(61, atoms.atoms[0].children[0].length)
             tags = MP4Tags(atoms, fileobj)
             tags[b'pgap'] = True
-            tags.save(self.filename)
+            tags.save(self.filename, padding=lambda *args: 974)
 
         with open(self.filename, "rb") as fileobj:
             atoms = Atoms(fileobj)
@@ -4,8 +4,11 @@ import shutil
 
 from mutagen._compat import BytesIO
 from tests import TestCase, add
+from mutagen import ogg
 from mutagen.ogg import OggPage, OggFileType, error as OggError
+from mutagen.ogg import _crc_pages
 from mutagen._util import cdata
+from mutagen.padding import stats
 from tempfile import mkstemp
 from os import devnull
 
@@ -150,6 +153,142 @@ class TOggPage(TestCase):
         self.failUnlessEqual(
             [page.sequence for page in pages], list(range(20, 29)))
 
+    def test_renumber_windows(self):
+        pages = []
+        for i in range(20):
+            page = OggPage()
+            page.serial = i % 3 and 1 or 2
+            page.sequence = 100 + i
+            page.packets = [b"x" * (i * 37)]
+            pages.append(page)
+        orig = b"".join(page.write() for page in pages)
+        for page, seq in zip([p for p in pages if p.serial == 1],
+                             range(5, 100)):
+            page.sequence = seq
+        expected = b"".join(page.write() for page in pages)
+        for size in [1, 50, 300, 1000, 2 ** 20]:
+            fileobj = BytesIO(orig)
+            OggPage.renumber(fileobj, 1, 5, BUFFER_SIZE=size)
+            self.failUnlessEqual(fileobj.getvalue(), expected)
+            fileobj.seek(0)
+            self.failUnlessEqual(OggPage.verify_stream(fileobj), 20)
+
+    def test_renumber_windows_extradata(self):
+        data = b"".join(page.write() for page in self.pages)
+        for size in [1, 50, 2 ** 20]:
+            fileobj = BytesIO(data + b"left over data" + data)
+            self.failUnlessRaises(
+                OggError, OggPage.renumber, fileobj, 1, 10, BUFFER_SIZE=size)
+            fileobj.seek(0)
+            pages = [OggPage(fileobj) for i in range(3)]
+            self.failUnlessEqual(
+                [page.sequence for page in pages], [10, 11, 12])
+            self.failUnlessEqual(fileobj.read(), b"left over data" + data)
+
+    def __replace_setup(self, muxed):
+        pages = [OggPage() for i in range(8)]
+        for seq, page in enumerate(pages):
+            page.sequence = seq
+            page.packets = [b"%d" % seq * 100]
+        if muxed:
+            pages[2].serial = 2
+            pages[2].packets = [b"other"]
+            for seq, page in enumerate(pages[:2] + pages[3:]):
+                page.sequence = seq
+        fileobj = BytesIO(b"".join(page.write() for page in pages))
+        pages = [OggPage(fileobj) for i in range(8)]
+        return fileobj, [p for p in pages if p.serial == 0]
+
+    def __reread(self, fileobj):
+        fileobj.seek(0)
+        pages = []
+        try:
+            while True:
+                pages.append(OggPage(fileobj))
+        except EOFError:
+            pass
+        return pages
+
+    def test_replace_single_move(self):
+        calls = []
+        orig = ogg.insert_bytes, ogg.delete_bytes
+        ogg.insert_bytes = lambda *args: calls.append(args) or orig[0](*args)
+        ogg.delete_bytes = lambda *args: calls.append(args) or orig[1](*args)
+        try:
+            # three pages of 128 bytes, the same size as one with 355
+            for size, moves in [(1000, 1), (355, 0), (50, 1)]:
+                fileobj, pages = self.__replace_setup(False)
+                del calls[:]
+                new = OggPage.from_packets([b"x" * size], 0)
+                OggPage.replace(fileobj, pages[:3], new)
+                self.failUnlessEqual(len(calls), moves)
+                pages = self.__reread(fileobj)
+                self.failUnlessEqual(pages[0].packets, [b"x" * size])
+                self.failUnlessEqual(
+                    [p.sequence for p in pages], list(range(len(pages))))
+                self.failUnlessEqual(pages[-1].packets, [b"7" * 100])
+        finally:
+            ogg.insert_bytes, ogg.delete_bytes = orig
+
+    def test_replace_muxed(self):
+        fileobj, pages = self.__replace_setup(True)
+        new = OggPage.from_packets([b"x" * 1000, b"y"], 0)
+        OggPage.replace(fileobj, pages[:3], new)
+        pages = self.__reread(fileobj)
+        self.failUnlessEqual(
+            [(p.serial, p.packets) for p in pages[:3]],
+            [(0, [b"x" * 1000, b"y"]), (2, [b"other"]), (0, [b"4" * 100])])
+        self.failUnlessEqual(
+            [p.sequence for p in pages if p.serial == 0], list(range(5)))
+
+    def test_crc_pages(self):
+        pages = OggPage.from_packets([b"a" * 5000, b"", b"b" * 10])
+        data = [p.write() for p in pages]
+        spans = []
+        offset = 0
+        for d in data:
+            spans.append((offset, len(d)))
+            offset += len(d)
+        joined = b"".join(data)
+        self.failUnlessEqual(
+            _crc_pages(joined, spans), [d[22:26] for d in data])
+        self.failUnlessEqual(
+            _crc_pages(bytearray(joined), spans), [d[22:26] for d in data])
+
+    def test_verify(self):
+        self.failUnless(self.page.verify())
+        data = bytearray(self.page.write())
+        data[-1] ^= 1
+        self.failIf(OggPage(BytesIO(bytes(data))).verify())
+        self.failUnlessRaises(ValueError, OggPage().verify)
+
+    def test_verify_stream(self):
+        self.fileobj.seek(0)
+        data = self.fileobj.read()
+        for size in [1, 100, 2**20]:
+            self.failUnlessEqual(
+                OggPage.verify_stream(BytesIO(data), BUFFER_SIZE=size), 3)
+        fileobj = BytesIO(data)
+        OggPage(fileobj)
+        self.failUnlessEqual(OggPage.verify_stream(fileobj), 2)
+        self.failUnlessEqual(OggPage.verify_stream(BytesIO()), 0)
+
+    def test_verify_stream_invalid(self):
+        self.fileobj.seek(0)
+        data = bytearray(self.fileobj.read())
+        self.failUnlessRaises(
+            OggError, OggPage.verify_stream, BytesIO(bytes(data[:-1])))
+        self.failUnlessRaises(
+            OggError, OggPage.verify_stream, BytesIO(bytes(data + b"x")))
+        second = self.page.size
+        data[second + 100] ^= 1
+        try:
+            OggPage.verify_stream(BytesIO(bytes(data)))
+        except OggError as e:
+            self.failUnless("0x%x" % second in str(e))
+        else:
+            self.fail("no error raised")
+
     def test_to_packets(self):
         self.failUnlessEqual(
             [b"foo", b"bar", b"baz"], OggPage.to_packets(self.pages))
@@ -202,6 +341,43 @@ class TOggPage(TestCase):
         self.failUnless(pages[1].continued)
         self.failUnlessEqual(OggPage.to_packets(pages), packets)
 
+    def test_from_packets_layout(self):
+        packets = [b"a" * 5000, b"", b"b" * 10, b"c" * 9000, b"d" * 300]
+        pages = OggPage.from_packets(packets, 0, 1000, 500)
+        self.failUnlessEqual(
+            [[len(p) for p in page.packets] for page in pages],
+            [[1530], [1530], [1940, 0], [10, 1530], [1530], [1530],
+             [1530], [1530], [1350], [300]])
+        self.failUnlessEqual(
+            [page.complete for page in pages],
+            [False, False, True, False, False, False, False, False, True,
+             True])
+        self.failUnlessEqual(
+            [page.position for page in pages],
+            [-1, -1, 0, 0, -1, -1, -1, -1, 0, 0])
+        self.failUnlessEqual(
+            [page.sequence for page in pages], list(range(10)))
+        self.failUnlessEqual(OggPage.to_packets(pages), packets)
+
+    def test_from_packets_try_preserve(self):
+        old_pages = OggPage.from_packets(
+            [b"a" * 300, b"b" * 10, b"c" * 5000], 3, 255, 0)
+        packets = [b"d" * 300, b"e" * 10, b"f" * 5000]
+        new_pages = OggPage._from_packets_try_preserve(packets, old_pages)
+        self.failUnlessEqual(
+            [len(p.packets) for p in new_pages],
+            [len(p.packets) for p in old_pages])
+        self.failUnlessEqual([p.sequence for p in new_pages],
+                             [p.sequence for p in old_pages])
+        self.failUnlessEqual(OggPage.to_packets(new_pages), packets)
+
+        # different sizes, new layout
+        packets = [b"d" * 301, b"e" * 10, b"f" * 5000]
+        new_pages = OggPage._from_packets_try_preserve(packets, old_pages)
+        self.failUnlessEqual(
+            [p.packets for p in new_pages],
+            [p.packets for p in OggPage.from_packets(packets, 3)])
+
     def test_random_data_roundtrip(self):
         try: random_file = open("/dev/urandom", "rb")
         except (IOError, OSError):
@@ -458,6 +634,48 @@ class TOggFileType(TestCase):
         self.failIf(audio.tags)
         self.scan_file()
 
+    def test_padding(self):
+        calls = []
+
+        def padding(current, needed, filesize):
+            calls.append((current, needed, filesize))
+            return 1000 if len(calls) == 1 else current - needed
+
+        self.audio["foo"] = ["a" * 1000]
+        self.audio.save(padding=padding)
+        size = os.path.getsize(self.filename)
+        moves = stats.moves
+        self.audio["foo"] = ["b" * 1500]
+        self.audio.save(padding=padding)
+        self.failUnlessEqual(calls[1][0], calls[0][1] + 1000)
+        self.failUnlessEqual(calls[1][1], calls[0][1] + 500)
+        self.failUnlessEqual(os.path.getsize(self.filename), size)
+        self.failUnlessEqual(stats.moves, moves)
+        self.failUnlessEqual(self.Kind(self.filename)["foo"], ["b" * 1500])
+        self.scan_file()
+
+    def test_padding_default_in_place(self):
+        self.audio["foo"] = ["a" * 10]
+        self.audio.save()
+        with open(self.filename, "rb") as h:
+            last = OggPage.find_last(h, self.audio.info.serial)
+        moves = stats.moves
+        self.audio["foo"] = ["b" * 100]
+        self.audio.save()
+        self.failUnlessEqual(stats.moves, moves)
+        with open(self.filename, "rb") as h:
+            new_last = OggPage.find_last(h, self.audio.info.serial)
+        self.failUnlessEqual(new_last.sequence, last.sequence)
+        self.failUnlessEqual(self.Kind(self.filename)["foo"], ["b" * 100])
+
+    def test_delete_removes_padding(self):
+        self.audio.save(padding=lambda *args: 5000)
+        size = os.path.getsize(self.filename)
+        self.audio.delete()
+        self.failUnless(os.path.getsize(self.filename) < size - 4000)
+        self.failIf(self.Kind(self.filename).tags)
+        self.scan_file()
+
     def test_invalid_open(self):
         self.failUnlessRaises(IOError, self.Kind,
                               os.path.join('tests', 'data', 'xing.mp3'))
@@ -1,9 +1,10 @@
 import os
 import shutil
+import struct
 
 from tempfile import mkstemp
 
-from mutagen._compat import cBytesIO
+from mutagen._compat import cBytesIO, ord_
 from mutagen.oggflac import OggFLAC, OggFLACStreamInfo, delete
 from mutagen.ogg import OggPage, error as OggError
 from tests import add
@@ -54,6 +55,31 @@ class TOggFLAC(TOggFileType):
         value = os.system("flac --ogg -t %s 2> %s" % (self.filename, devnull))
         self.failIf(value and value != NOTFOUND)
 
+    def __header_packets(self):
+        with open(self.filename, "rb") as h:
+            first = OggPage(h)
+            count = struct.unpack(">H", first.packets[0][7:9])[0]
+            pages = [OggPage(h)]
+            while not pages[-1].complete:
+                pages.append(OggPage(h))
+            return count, OggPage.to_packets(pages)
+
+    def test_padding_block(self):
+        self.audio.save(padding=lambda *args: 0)
+        count, packets = self.__header_packets()
+        self.failUnlessEqual(count, 1)
+        self.failUnlessEqual(len(packets), 1)
+        # the comment block is the last one now
+        self.failUnlessEqual(ord_(packets[0][0]), 0x84)
+
+        self.audio.save(padding=lambda *args: 100)
+        count, packets = self.__header_packets()
+        self.failUnlessEqual(count, 2)
+        self.failUnlessEqual(ord_(packets[0][0]), 0x04)
+        self.failUnlessEqual(packets[1], b"\x81\x00\x00\x60" + b"\x00" * 96)
+        self.failUnlessEqual(OggFLAC(self.filename).tags, self.audio.tags)
+        self.scan_file()
+
     def test_module_delete(self):
         delete(self.filename)
         self.scan_file()
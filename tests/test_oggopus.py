@@ -51,4 +51,34 @@ class TOggOpus(TOggFileType):
         page.packets[0] = bytes(data)
         self.failUnlessRaises(IOError, OggOpusInfo, BytesIO(page.write()))
 
+    def __comment_packet(self):
+        with open(self.filename, "rb") as h:
+            OggPage(h)
+            pages = [OggPage(h)]
+            while not pages[-1].complete:
+                pages.append(OggPage(h))
+        return pages, OggPage.to_packets(pages)[0]
+
+    def test_binary_data_kept(self):
+        pages = self.__comment_packet()[0]
+        packet = b"OpusTags" + self.audio.tags.write(framing=False)
+        new_pages = OggPage.from_packets(
+            [packet + b"\x01binary"], pages[0].sequence)
+        with open(self.filename, "rb+") as h:
+            OggPage.replace(h, pages, new_pages)
+
+        audio = self.Kind(self.filename)
+        audio["foo"] = ["bar"]
+        audio.save(padding=lambda *args: 100)
+        self.failUnless(self.__comment_packet()[1].endswith(b"\x01binary"))
+        self.failUnlessEqual(self.Kind(self.filename)["foo"], ["bar"])
+
+    def test_padding_discarded(self):
+        self.audio.save(padding=lambda *args: 100)
+        self.failUnless(self.__comment_packet()[1].endswith(b"\x00" * 100))
+        self.audio.save(padding=lambda *args: 0)
+        self.failUnlessEqual(
+            self.__comment_packet()[1],
+            b"OpusTags" + self.audio.tags.write(framing=False))
+
 add(TOggOpus)
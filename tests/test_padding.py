@@ -0,0 +1,201 @@
+import os
+import shutil
+from tempfile import mkstemp
+
+from tests import TestCase, add
+from mutagen import padding
+from mutagen.padding import default_padding, stats
+from mutagen.id3 import ID3, TIT2
+from mutagen.flac import FLAC, Padding
+from mutagen.mp4 import MP4, Atoms
+from mutagen.asf import ASF, PaddingObject
+from mutagen.aiff import AIFF
+
+
+DATA = os.path.join("tests", "data")
+
+
+class Tdefault_padding(TestCase):
+
+    def test_keep(self):
+        self.failUnlessEqual(default_padding(2000, 1000, 0), 1000)
+        self.failUnlessEqual(default_padding(1000, 1000, 0), 0)
+
+    def test_grow(self):
+        self.failUnlessEqual(default_padding(1000, 1001, 0), 1024)
+        self.failUnlessEqual(
+            default_padding(0, 100, 10 ** 7), 1024 + 10 ** 4)
+
+    def test_too_much(self):
+        self.failUnlessEqual(default_padding(20000, 1000, 0), 1024)
+        # larger files may keep more
+        self.failUnlessEqual(
+            default_padding(20000, 1000, 10 ** 6), 19000)
+
+add(Tdefault_padding)
+
+
+class TSaveStats(TestCase):
+
+    def test_record(self):
+        s = padding.SaveStats()
+        s.record(False)
+        s.record(True)
+        self.failUnlessEqual((s.saves, s.moves), (2, 1))
+        self.failUnless("moves=1" in repr(s))
+        s.reset()
+        self.failUnlessEqual((s.saves, s.moves), (0, 0))
+
+    def test_negative(self):
+        self.failUnlessRaises(
+            ValueError, padding._get_padding, lambda *args: -1, 0, 0, 0)
+
+add(TSaveStats)
+
+
+class TPadding(TestCase):
+    """Saves each format with padding functions and checks the calls,
+    the padding in the file and the stats.
+    """
+
+    def setUp(self):
+        self.files = []
+        self.calls = []
+
+    def tearDown(self):
+        for filename in self.files:
+            os.unlink(filename)
+
+    def copy(self, name):
+        fd, filename = mkstemp(suffix=os.path.splitext(name)[-1])
+        os.close(fd)
+        shutil.copy(os.path.join(DATA, name), filename)
+        self.files.append(filename)
+        return filename
+
+    def fixed(self, amount):
+        def func(current, needed, filesize):
+            self.calls.append((current, needed, filesize))
+            return amount
+        return func
+
+    def keep(self, current, needed, filesize):
+        self.calls.append((current, needed, filesize))
+        return current - needed
+
+    def save_twice(self, save):
+        """Saves with 100 bytes of padding, then keeping what's there.
+        Returns the size the tag needed.
+        """
+
+        save(self.fixed(100))
+        moves = stats.moves
+        saves = stats.saves
+        save(self.keep)
+        self.failUnlessEqual(stats.moves, moves)
+        self.failUnlessEqual(stats.saves, saves + 1)
+        (cur1, need1, size1), (cur2, need2, size2) = self.calls
+        self.failUnlessEqual(cur2, need1 + 100)
+        self.failUnlessEqual(need1, need2)
+        self.failUnlessEqual(size2, os.path.getsize(self.files[0]))
+        return need1
+
+    def test_id3(self):
+        filename = self.copy("silence-44-s.mp3")
+        tags = ID3(filename)
+        needed = self.save_twice(lambda p: tags.save(padding=p))
+        self.failUnlessEqual(ID3(filename).size, needed + 100)
+        self.failUnlessEqual(ID3(filename).pprint(), tags.pprint())
+
+    def test_id3_new(self):
+        filename = self.copy("emptyfile.mp3")
+        tags = ID3()
+        tags.add(TIT2(encoding=3, text=[u"title"]))
+        tags.save(filename, padding=self.fixed(0))
+        self.failUnlessEqual(self.calls, [(0, 27, 0)])
+        self.failUnlessEqual(ID3(filename).size, 27)
+
+    def test_aiff(self):
+        filename = self.copy("with-id3.aif")
+        f = AIFF(filename)
+        f.save(padding=self.fixed(3000))
+        new = AIFF(filename)
+        self.failUnlessEqual(new.tags.size, self.calls[0][1] + 3000)
+        self.failUnlessEqual(new.pprint(), f.pprint())
+
+    def test_aiff_shrink(self):
+        from mutagen.aiff import IFFFile
+        filename = self.copy("with-id3.aif")
+        f = AIFF(filename)
+        f.save(padding=self.fixed(5000))
+        for amount in [0, 1, 0, 5001]:
+            moves = stats.moves
+            f.save(padding=self.fixed(amount))
+            self.failUnlessEqual(stats.moves, moves + 1)
+            new = AIFF(filename)
+            self.failUnlessEqual(new.tags.size, self.calls[-1][1] + amount)
+            self.failUnlessEqual(new.pprint(), f.pprint())
+            with open(filename, "rb") as h:
+                iff = IFFFile(h)
+                self.failUnlessEqual(
+                    iff[u"ID3"].data_size, new.tags.size)
+                h.seek(0, 2)
+                self.failUnlessEqual(iff[u"FORM"].size, h.tell())
+
+    def test_flac(self):
+        filename = self.copy("silence-44-s.flac")
+        f = FLAC(filename)
+        self.save_twice(lambda p: f.save(padding=p))
+        blocks = FLAC(filename).metadata_blocks
+        self.failUnless(isinstance(blocks[-1], Padding))
+        self.failUnlessEqual(blocks[-1].length, 96)
+        self.failIf(any(isinstance(b, Padding) for b in blocks[:-1]))
+        self.failUnlessEqual(FLAC(filename).pprint(), f.pprint())
+
+    def test_flac_no_padding(self):
+        filename = self.copy("silence-44-s.flac")
+        f = FLAC(filename)
+        f.save(padding=self.fixed(0))
+        blocks = FLAC(filename).metadata_blocks
+        self.failIf(any(isinstance(b, Padding) for b in blocks))
+        self.failUnlessEqual(FLAC(filename).pprint(), f.pprint())
+
+    def test_mp4(self):
+        filename = self.copy("has-tags.m4a")
+        f = MP4(filename)
+        self.save_twice(lambda p: f.save(padding=p))
+        with open(filename, "rb") as fileobj:
+            meta = Atoms(fileobj).path(b"moov", b"udta", b"meta")[-1]
+        names = [atom.name for atom in meta.children]
+        free = meta.children[names.index(b"ilst") + 1]
+        self.failUnlessEqual((free.name, free.length), (b"free", 100))
+        self.failUnlessEqual(dict(MP4(filename).tags), dict(f.tags))
+
+    def test_mp4_new(self):
+        filename = self.copy("no-tags.m4a")
+        f = MP4(filename)
+        f.add_tags()
+        f[b"\xa9nam"] = [u"title"]
+        f.save(padding=self.fixed(0))
+        self.failUnlessEqual(self.calls[0][0], 0)
+        self.failUnlessEqual(MP4(filename)[b"\xa9nam"], [u"title"])
+
+    def test_asf(self):
+        filename = self.copy("silence-1.wma")
+        f = ASF(filename)
+        needed = self.save_twice(lambda p: f.save(padding=p))
+        f = ASF(filename)
+        self.failUnlessEqual(f.size, needed + 100)
+        paddings = [o for o in f.objects if isinstance(o, PaddingObject)]
+        self.failUnlessEqual(len(paddings), 1)
+        self.failUnlessEqual(len(paddings[0].data), 76)
+        orig = ASF(os.path.join(DATA, "silence-1.wma"))
+        self.failUnlessEqual(f.pprint(), orig.pprint())
+
+    def test_stats_move(self):
+        filename = self.copy("silence-44-s.mp3")
+        moves = stats.moves
+        ID3(filename).save(padding=self.fixed(10))
+        self.failUnlessEqual(stats.moves, moves + 1)
+
+add(TPadding)
@@ -0,0 +1,223 @@
+import os
+import threading
+
+from tests import TestCase, add
+from mutagen import File
+from mutagen._compat import PY2
+from mutagen.rangeio import BytesRangeReader, HTTPRangeReader, RangeFile
+from mutagen.flac import FLAC
+from mutagen.mp4 import MP4
+
+if PY2:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+else:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+
+
+DATA = os.path.join("tests", "data")
+
+
+def read_data(name):
+    with open(os.path.join(DATA, name), "rb") as h:
+        return h.read()
+
+
+class TRangeFile(TestCase):
+
+    def setUp(self):
+        self.reader = BytesRangeReader(b"0123456789" * 10)
+        self.fileobj = RangeFile(self.reader, block_size=8, max_blocks=4)
+
+    def test_read(self):
+        f = self.fileobj
+        self.failUnlessEqual(f.read(3), b"012")
+        self.failUnlessEqual(f.read(10), b"3456789012")
+        self.failUnlessEqual(f.tell(), 13)
+        f.seek(-2, 2)
+        self.failUnlessEqual(f.read(), b"89")
+        self.failUnlessEqual(f.read(), b"")
+        f.seek(200)
+        self.failUnlessEqual(f.read(1), b"")
+
+    def test_seek_before_start(self):
+        self.failUnlessRaises(IOError, self.fileobj.seek, -1)
+        self.failUnlessRaises(IOError, self.fileobj.seek, -101, 2)
+        self.failUnlessRaises(IOError, self.fileobj.seek, -1, 1)
+
+    def test_block_reuse(self):
+        f = self.fileobj
+        f.read(2)
+        f.read(2)
+        f.seek(7)
+        f.read(1)
+        self.failUnlessEqual(self.reader.requests, [(0, 8)])
+        self.failUnlessEqual(f.requests, 1)
+        self.failUnlessEqual(f.bytes_fetched, 8)
+
+    def test_coalesce(self):
+        f = self.fileobj
+        f.seek(10)
+        f.read(1)
+        f.seek(0)
+        self.failUnlessEqual(f.read(30), (b"0123456789" * 3))
+        # blocks 0 and 2-3 missing, 1 cached
+        self.failUnlessEqual(
+            self.reader.requests, [(8, 8), (0, 8), (16, 16)])
+
+    def test_last_block(self):
+        f = self.fileobj
+        f.seek(-3, 2)
+        self.failUnlessEqual(f.read(10), b"789")
+        self.failUnlessEqual(self.reader.requests, [(96, 4)])
+
+    def test_eviction(self):
+        f = self.fileobj
+        for i in range(6):
+            f.seek(i * 8)
+            f.read(1)
+        self.failUnlessEqual(len(f._blocks), 4)
+        f.seek(0)
+        f.read(1)
+        self.failUnlessEqual(f.requests, 7)
+
+    def test_large_read(self):
+        f = self.fileobj
+        self.failUnlessEqual(f.read(), b"0123456789" * 10)
+        self.failUnlessEqual(self.reader.requests, [(0, 100)])
+        self.failIf(f._blocks)
+
+    def test_short_read(self):
+        class Short(BytesRangeReader):
+            def read_at(self, offset, length):
+                return b"x"
+
+        f = RangeFile(Short(b"abc" * 10), block_size=8)
+        self.failUnlessRaises(IOError, f.read, 2)
+
+    def test_invalid_args(self):
+        self.failUnlessRaises(ValueError, RangeFile, self.reader, 0)
+        self.failUnlessRaises(ValueError, RangeFile, self.reader, 8, 0)
+
+    def test_name(self):
+        self.failIf(hasattr(self.fileobj, "name"))
+        reader = BytesRangeReader(b"", name="foo.mp3")
+        self.failUnlessEqual(RangeFile(reader).name, "foo.mp3")
+
+add(TRangeFile)
+
+
+class TRangeLoad(TestCase):
+
+    FILES = [
+        "empty.ogg", "empty.oggflac", "empty.spx", "sample.oggtheora",
+        "example.opus", "silence-44-s.flac", "silence-44-s.mp3",
+        "has-tags.m4a", "silence-1.wma", "click.mpc", "silence-44-s.wv",
+        "empty.tta", "with-id3.aif", "mac-399.ape", "empty.ofr",
+        "oldtag.apev2",
+    ]
+
+    def test_file(self):
+        for name in self.FILES:
+            expected = File(os.path.join(DATA, name)).pprint()
+            reader = BytesRangeReader(read_data(name), name=name)
+            self.failUnlessEqual(File(reader).pprint(), expected, name)
+
+    def test_counters(self):
+        for name in self.FILES:
+            data = read_data(name)
+            fileobj = RangeFile(BytesRangeReader(data, name=name),
+                                block_size=1024)
+            File(fileobj)
+            self.failUnless(fileobj.requests > 0)
+            self.failUnless(fileobj.bytes_fetched <= len(data) + 1024)
+
+    def test_padding_not_fetched(self):
+        data = read_data("silence-44-s.flac")
+        reader = BytesRangeReader(data)
+        fileobj = RangeFile(reader, block_size=1024)
+        f = FLAC(fileobj)
+        self.failUnlessEqual(f.pprint(),
+                             FLAC(os.path.join(DATA, "silence-44-s.flac")).pprint())
+        self.failUnless(fileobj.bytes_fetched < len(data) // 4)
+
+    def test_mdat_not_fetched(self):
+        data = read_data("no-tags.3g2")
+        fileobj = RangeFile(BytesRangeReader(data), block_size=1024)
+        MP4(fileobj)
+        self.failUnless(fileobj.bytes_fetched < len(data) // 4)
+
+    def test_save(self):
+        reader = BytesRangeReader(read_data("silence-44-s.flac"))
+        f = FLAC(reader)
+        self.failUnlessRaises(TypeError, f.save)
+        self.failUnlessRaises(TypeError, f.delete)
+
+add(TRangeLoad)
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+
+    data = read_data("has-tags.m4a")
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.data)))
+        self.end_headers()
+
+    def do_GET(self):
+        header = self.headers.get("Range")
+        if header is None:
+            self.do_HEAD()
+            self.wfile.write(self.data)
+            return
+        start, end = map(int, header.split("=")[1].split("-"))
+        body = self.data[start:end + 1]
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Range", "bytes %d-%d/%d" % (
+            start, end, len(self.data)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class THTTPRangeReader(TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), RangeHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = "http://127.0.0.1:%d/has-tags.m4a" % \
+            self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_read_at(self):
+        reader = HTTPRangeReader(self.url)
+        self.failUnlessEqual(reader.size(), len(RangeHandler.data))
+        self.failUnlessEqual(reader.read_at(4, 4), b"ftyp")
+        self.failUnlessEqual(reader.read_at(4, 0), b"")
+
+    def test_load(self):
+        reader = HTTPRangeReader(self.url)
+        f = File(reader)
+        self.failUnless(isinstance(f, MP4))
+        self.failUnlessEqual(
+            f.pprint(), MP4(os.path.join(DATA, "has-tags.m4a")).pprint())
+
+    def test_no_range_support(self):
+        class NoRange(RangeHandler):
+            def do_GET(self):
+                self.do_HEAD()
+                self.wfile.write(self.data)
+
+        self.server.RequestHandlerClass = NoRange
+        reader = HTTPRangeReader(self.url)
+        self.failUnlessRaises(IOError, reader.read_at, 0, 10)
+
+add(THTTPRangeReader)